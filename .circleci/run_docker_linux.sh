@@ -6,4 +6,5 @@ export PATH="$HOME/miniconda/bin:$PATH"
 source $HOME/miniconda/bin/activate
 #
 cd Usecases/test && sh run-all.sh && cd -
+cd Datasets/test && sh run-all.sh && cd -
 
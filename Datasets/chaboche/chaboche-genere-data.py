@@ -1,61 +1,54 @@
+"""
+Generate noisy observations of the stress, given the strain.
+
+The options set the size of the sample, the master seed, the number of
+processes and the output file (.csv or .npy), e.g. 10^7 rows:
+
+    python chaboche-genere-data.py --size 10000000 --workers 4 --no-plot
+"""
 from openturns.viewer import View
-import numpy as np
 import openturns as ot
-
-# 1. The function G
-def modeleChaboche(X):
-    strain,R,C,gamma = X
-    stress = R + C*(1-np.exp(-gamma*strain))
-    return [stress]
-
-# Creation of the problem function
-f = ot.PythonFunction(4, 1, modeleChaboche) 
-
-# 2. Random vector definition
-Strain = ot.Uniform(0,0.07)
-unknownR = 750e6
-unknownC = 2750e6
-unknownGamma = 10
-R = ot.Dirac(unknownR)
-C = ot.Dirac(unknownC)
-Gamma = ot.Dirac(unknownGamma)
-
-# 3. View the PDF
-Strain.setDescription(["Strain"])
-R.setDescription(["R"])
-C.setDescription(["C"])
-Gamma.setDescription(["Gamma"])
-
-# 4. Create the joint distribution function
-inputRandomVector = ot.ComposedDistribution([Strain, R, C, Gamma])
-
-# 5. Create the Monte-Carlo algorithm
-sampleSize = 100
-inputSample = inputRandomVector.getSample(sampleSize)
-#print(inputSample)
-outputSigma = f(inputSample)
-#print(outputSigma)
-
-# 7. Plot the histogram
-from openturns import VisualTest
-histoGraph = VisualTest.DrawHistogram(outputSigma/1.e6,20)
-histoGraph.setTitle("Histogramme de la contrainte")
-histoGraph.setXTitle("Stress (MPa)")
-histoGraph.setYTitle("Frequence")
-#histoGraph.setBoundingBox([-1,7,0,0.60])
-histoGraph.setLegends([""])
-View(histoGraph).show()
-
-# Generate observation noise
-sigmaObservationNoiseSigma = 40.e6 # (Pa)
-noiseSigma = ot.Normal(0.,sigmaObservationNoiseSigma)
-sampleNoiseH = noiseSigma.getSample(sampleSize)
-observedSigma = outputSigma + sampleNoiseH
-
-# Create and save sample
-observedSample = ot.Sample(sampleSize,2)
-observedSample.setDescription(["Strain","Stress"])
-observedSample[:,0] = inputSample[:,0]
-observedSample[:,1] = observedSigma[:]
-
-observedSample.exportToCSVFile("chaboche-observations.csv")
+import sys
+sys.path.append("../common")
+from syntheticgeneratorlib import (ObservationGenerator, writeSyntheticDataset, 
+                                   generateSample, parseGeneratorArguments)
+
+def createGenerator():
+    # 1. The function G, vectorized
+    f = ot.SymbolicFunction(["strain", "R", "C", "Gamma"], ["R + C*(1-exp(-Gamma*strain))"])
+
+    # 2. Random vector definition
+    Strain = ot.Uniform(0,0.07)
+    unknownR = 750e6
+    unknownC = 2750e6
+    unknownGamma = 10
+    R = ot.Dirac(unknownR)
+    C = ot.Dirac(unknownC)
+    Gamma = ot.Dirac(unknownGamma)
+
+    # 3. Create the joint distribution function
+    inputRandomVector = ot.ComposedDistribution([Strain, R, C, Gamma])
+
+    # 4. Observation noise
+    sigmaObservationNoiseSigma = 40.e6 # (Pa)
+    noiseSigma = ot.Normal(0.,sigmaObservationNoiseSigma)
+    return ObservationGenerator(inputRandomVector, f, noiseSigma, [0], ["Strain","Stress"])
+
+if __name__=="__main__":
+    arguments = parseGeneratorArguments(__doc__, "chaboche-observations.csv", 100)
+    generator = createGenerator()
+
+    # 5. Create and save sample, by chunks
+    writeSyntheticDataset(arguments.output, generator, arguments.size, 
+                          arguments.chunk_size, arguments.seed, arguments.workers)
+
+    # 6. Plot the histogram of the first rows
+    if arguments.plot:
+        sampleSize = min(arguments.size, 10000)
+        observedSample = generateSample(generator, sampleSize, arguments.chunk_size, arguments.seed)
+        histoGraph = ot.HistogramFactory().build(observedSample[:, 1] / 1.e6).drawPDF()
+        histoGraph.setTitle("Histogramme de la contrainte")
+        histoGraph.setXTitle("Stress (MPa)")
+        histoGraph.setYTitle("Frequence")
+        histoGraph.setLegends([""])
+        View(histoGraph).show()
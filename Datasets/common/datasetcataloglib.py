@@ -0,0 +1,160 @@
+#
+# Catalog of the Datasets.
+#
+# The catalog is an index of the CSV files of the Datasets directory:
+# for each file, the name, the path, the columns and their units, the
+# number of rows, the separator and the source file (e.g. the
+# *-source.txt or *-source.pdf file). The columns, the number of rows
+# and the separator of an entry are read by readLayout, with the line
+# and header rules of loadDataset, so that the index and the loaded data
+# always agree. Building an entry reads the lines and the header only:
+# the values are not converted and no cached copy is created. The index
+# is saved in .datasetcache/catalog.json and an entry is updated only if
+# the size or the modification time of its file has changed, or if the
+# rules of loadDataset have changed. Hence listing and searching the
+# datasets is instantaneous. The data is converted and mapped in memory
+# on the first access, with loadDataset.
+#
+
+import json
+import os
+import re
+import sys
+sys.path.append("../common")
+from datasetloaderlib import loadDataset, readLayout, cacheVersion
+
+catalogVersion = 2
+
+# The unit is at the end of the column name, e.g. "Q (m3/s)"
+unitPattern = re.compile(r"\(([^()]*)\)\s*$")
+
+def findSourceFile(filename):
+    '''
+    Returns the name of the source file of the dataset, i.e. the file
+    "prefix-source.*" of the same directory with the longest prefix of
+    the name of the dataset, or None.
+    '''
+    directory, basename = os.path.split(filename)
+    stem = os.path.splitext(basename)[0]
+    best = None
+    for candidate in sorted(os.listdir(directory)):
+        name = os.path.splitext(candidate)[0]
+        if not name.endswith("-source"):
+            continue
+        prefix = name[:-len("-source")]
+        if stem.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, candidate)
+    if best is None:
+        return None
+    return best[1]
+
+def buildEntry(root, path):
+    '''
+    Returns the entry of the catalog of the CSV file, with the path
+    relative to the root directory.
+    '''
+    filename = os.path.join(root, path)
+    separator, columns, rowNumber = readLayout(filename)
+    units = []
+    for column in columns:
+        match = unitPattern.search(column)
+        units.append(match.group(1) if match else "")
+    status = os.stat(filename)
+    return {"name": os.path.splitext(path)[0].replace(os.sep, "/"), "path": path, 
+            "columns": columns, "units": units, "rows": rowNumber, 
+            "separator": separator, 
+            "source": findSourceFile(filename), "size": status.st_size, "mtime": status.st_mtime}
+
+class DatasetCatalog:
+    '''
+    The catalog of the CSV files under the root directory.
+    '''
+    def __init__(self, root=".."):
+        self.root = os.path.abspath(root)
+        self.indexFile = os.path.join(self.root, ".datasetcache", "catalog.json")
+        self.entries = self.updateIndex()
+        self.datasets = {}
+
+    def readIndex(self):
+        if not os.path.exists(self.indexFile):
+            return {}
+        with open(self.indexFile) as f:
+            index = json.load(f)
+        if index.get("version") != catalogVersion or index.get("loaderVersion") != cacheVersion:
+            return {}
+        return {entry["path"]: entry for entry in index["entries"]}
+
+    def updateIndex(self):
+        '''
+        Returns the list of the entries, updating the index file if a CSV
+        file has been added, removed or modified.
+        '''
+        previous = self.readIndex()
+        entries = []
+        isModified = False
+        for directory, directoryNames, fileNames in os.walk(self.root):
+            directoryNames[:] = sorted([name for name in directoryNames if not name.startswith(".")])
+            for fileName in sorted(fileNames):
+                if not fileName.endswith(".csv"):
+                    continue
+                path = os.path.relpath(os.path.join(directory, fileName), self.root)
+                status = os.stat(os.path.join(self.root, path))
+                entry = previous.get(path)
+                if entry is None or entry["size"] != status.st_size or entry["mtime"] != status.st_mtime:
+                    entry = buildEntry(self.root, path)
+                    isModified = True
+                entries.append(entry)
+        if isModified or len(entries) != len(previous):
+            os.makedirs(os.path.dirname(self.indexFile), exist_ok=True)
+            temporary = self.indexFile + ".tmp"
+            with open(temporary, "w") as f:
+                json.dump({"version": catalogVersion, "loaderVersion": cacheVersion, "entries": entries}, f, indent=1, ensure_ascii=False)
+            os.replace(temporary, self.indexFile)
+        return entries
+
+    def getNames(self):
+        return [entry["name"] for entry in self.entries]
+
+    def getEntry(self, name):
+        for entry in self.entries:
+            if entry["name"] == name:
+                return entry
+        raise ValueError("Unknown dataset %s" % (name))
+
+    def search(self, text):
+        '''
+        Returns the names of the datasets whose name or one of the
+        columns contains the text, ignoring the case.
+        '''
+        text = text.lower()
+        return [entry["name"] for entry in self.entries 
+                if text in entry["name"].lower() or any([text in column.lower() for column in entry["columns"]])]
+
+    def load(self, name):
+        '''
+        Returns the Dataset, loaded on the first access.
+        '''
+        if name not in self.datasets:
+            entry = self.getEntry(name)
+            self.datasets[name] = loadDataset(os.path.join(self.root, entry["path"]))
+        return self.datasets[name]
+
+if __name__=="__main__":
+    import time
+    t = time.time()
+    catalog = DatasetCatalog("..")
+    print("Catalog of %d datasets: %.1f (ms)" % (len(catalog.getNames()), 1000. * (time.time() - t)))
+    for name in catalog.search("HR"):
+        entry = catalog.getEntry(name)
+        print("%s: %d rows, columns %s, units %s, source %s" % (name, entry["rows"], entry["columns"], entry["units"], entry["source"]))
+    # The index agrees with loadDataset, including the blank lines
+    for name in ["climate-weather/Humidite-relative-Bordeaux-2018", "ishigami/ishigami-sample"]:
+        entry = catalog.getEntry(name)
+        dataset = catalog.load(name)
+        isEqual = entry["rows"] == dataset.getSize() and entry["columns"] == dataset.getDescription()
+        print("%s: index %d rows %s, loader %d rows %s, equal: %s" % (name, entry["rows"], entry["columns"],
+              dataset.getSize(), dataset.getDescription(), isEqual))
+        if not isEqual:
+            raise ValueError("The index of %s does not agree with loadDataset" % (name))
+    dataset = catalog.load("earthquakes/earthquakes-1965-2016-clean")
+    print("Magnitude mean = %.3f" % (dataset.getSample(["Magnitude"]).computeMean()[0]))
@@ -0,0 +1,394 @@
+#
+# Load the CSV files of the Datasets, with a cached binary copy.
+#
+# The text file is parsed once. The separator is detected from the
+# header: semicolon, comma or spaces. A blank line is a missing
+# observation, i.e. a row of missing values, except at the end of the
+# file. Each column is typed: floating point numbers, timestamps (e.g.
+# "25/02/99 03h00") or strings. A timestamp made of several timestamps,
+# e.g. "02/03/99 06h0002/03/99 09h00" when several lines are merged into
+# one, is the last one, as in timeseriesstreamlib. A value which cannot
+# be converted is a missing value: by default, loadDataset raises an
+# exception if there is such a value. Then each column is saved as a
+# NumPy .npy file, in the directory .datasetcache next to the CSV file, with
+# a metadata.json file which contains the size, the modification time
+# and the SHA-256 hash of the source. The next loads map the .npy files
+# in memory, without parsing. The copy is rebuilt if the source has
+# changed: if the size or the modification time differ, the hash is
+# computed and compared.
+#
+
+import openturns as ot
+import numpy as np
+import csv
+import datetime
+import hashlib
+import json
+import os
+import warnings
+
+cacheDirectoryName = ".datasetcache"
+
+# Increase when the format of the cache changes
+cacheVersion = 3
+
+# The formats of the timestamps, as in datetime.strptime
+timestampFormats = ["%d/%m/%y %Hh%M", "%d/%m/%Y %Hh%M", "%Y-%m-%d %H:%M", 
+                    "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S.%fZ"]
+
+def computeFileHash(filename):
+    sha = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+def readLines(filename):
+    '''
+    Returns the lines of the file. The blank lines at the end are
+    removed, the other ones are kept: they are missing observations.
+    '''
+    with open(filename, "rb") as f:
+        content = f.read()
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = content.decode("latin-1")
+    lines = text.splitlines()
+    while len(lines) > 0 and lines[-1].strip() == "":
+        lines.pop()
+    return lines
+
+def detectSeparator(header):
+    '''
+    Returns ";", "," or None (i.e. spaces) from the first line.
+    '''
+    if ";" in header:
+        return ";"
+    if "," in header:
+        return ","
+    return None
+
+def splitLines(lines, separator):
+    if separator is None:
+        return [line.split() for line in lines]
+    return [[value.strip() for value in row] for row in csv.reader(lines, delimiter=separator)]
+
+# Maximum fraction of invalid values in a column of numbers or timestamps
+invalidFraction = 0.01
+
+def parseNumber(value):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def isNumber(value):
+    return parseNumber(value) is not None
+
+def parseTimestamp(value, timestampFormat):
+    try:
+        return np.datetime64(datetime.datetime.strptime(value, timestampFormat), "s")
+    except ValueError:
+        return None
+
+def repairMergedTimestamps(values, timestampFormat):
+    '''
+    Returns the values where the values made of several timestamps of the
+    same length as the first value are replaced by the last timestamp,
+    and the number of replaced values.
+    '''
+    present = [value for value in values if value != ""]
+    if len(present) == 0 or parseTimestamp(present[0], timestampFormat) is None:
+        return values, 0
+    length = len(present[0])
+    repaired = list(values)
+    mergedNumber = 0
+    for i in range(len(values)):
+        value = values[i]
+        if len(value) > length and len(value) % length == 0:
+            pieces = [value[k:k + length] for k in range(0, len(value), length)]
+            if all([parseTimestamp(piece, timestampFormat) is not None for piece in pieces]):
+                repaired[i] = pieces[-1]
+                mergedNumber += 1
+    return repaired, mergedNumber
+
+def convertValues(values, parse, missing, maximumInvalid):
+    '''
+    Returns the list of the parsed values and the number of invalid
+    values, or None as soon as there are more than maximumInvalid.
+    '''
+    column = []
+    invalid = 0
+    for value in values:
+        x = parse(value) if value != "" else missing
+        if x is None:
+            invalid += 1
+            if invalid > maximumInvalid:
+                return None
+            x = missing
+        column.append(x)
+    return column, invalid
+
+def convertColumn(values):
+    '''
+    Returns the typed array of the values, the kind of the column
+    ("float", "timestamp" or "string"), the number of invalid values and
+    the number of merged timestamps.
+    A few invalid values are allowed in a column of numbers or
+    timestamps: they are missing values, i.e. NaN or NaT, as the empty
+    values.
+    '''
+    presentNumber = len([value for value in values if value != ""])
+    maximumInvalid = int(invalidFraction * presentNumber)
+    numbers = convertValues(values, parseNumber, np.nan, maximumInvalid)
+    if numbers is not None:
+        column, invalid = numbers
+        return np.array(column), "float", invalid, 0
+    for timestampFormat in timestampFormats:
+        repaired, mergedNumber = repairMergedTimestamps(values, timestampFormat)
+        parse = lambda value: parseTimestamp(value, timestampFormat)
+        timestamps = convertValues(repaired, parse, np.datetime64("NaT"), maximumInvalid)
+        if timestamps is not None:
+            column, invalid = timestamps
+            return np.array(column, dtype="datetime64[s]"), "timestamp", invalid, mergedNumber
+    return np.array(values, dtype=str), "string", 0, 0
+
+def readHeader(lines, separator):
+    '''
+    Returns the list of the column names and True if the first line is
+    the header, False if it is a row of numbers (the columns are then
+    named X0, X1, ...). Only the first line is split by the separator.
+    '''
+    header = splitLines(lines[:1], separator)[0]
+    if all([isNumber(value) for value in header]):
+        return ["X%d" % (j) for j in range(len(header))], False
+    # A single column whose name contains spaces, e.g. "HR (%)"
+    if separator is None and max([len(line.split()) for line in lines[1:]] + [0]) == 1:
+        return [lines[0].strip()], True
+    return header, True
+
+def readLayout(filename):
+    '''
+    Returns the separator, the list of the column names and the number
+    of rows of the text file, without converting the values.
+    '''
+    lines = readLines(filename)
+    separator = detectSeparator(lines[0])
+    header, hasHeader = readHeader(lines, separator)
+    return separator, header, len(lines) - hasHeader
+
+def parseCSVFile(filename):
+    '''
+    Parse the text file. Returns the separator, the list of the column
+    names, the list of the typed columns, of their kinds, of their
+    numbers of invalid values and of their numbers of merged timestamps.
+    '''
+    lines = readLines(filename)
+    separator = detectSeparator(lines[0])
+    header, hasHeader = readHeader(lines, separator)
+    rows = splitLines(lines[hasHeader:], separator)
+    columnNumber = len(header)
+    # Pad or cut the rows to the number of columns
+    rows = [(row + [""] * columnNumber)[:columnNumber] for row in rows]
+    columns = []
+    kinds = []
+    invalids = []
+    mergeds = []
+    for j in range(columnNumber):
+        column, kind, invalid, merged = convertColumn([row[j] for row in rows])
+        columns.append(column)
+        kinds.append(kind)
+        invalids.append(invalid)
+        mergeds.append(merged)
+    return separator, header, columns, kinds, invalids, mergeds
+
+class Dataset:
+    '''
+    A dataset, i.e. named and typed columns, mapped in memory.
+    '''
+    def __init__(self, filename, metadata, columns):
+        self.filename = filename
+        self.metadata = metadata
+        self.columns = columns
+
+    def getDescription(self):
+        return list(self.metadata["columns"])
+
+    def getKinds(self):
+        return list(self.metadata["kinds"])
+
+    def getInvalidNumbers(self):
+        '''
+        Returns the number of invalid values of each column, which are
+        replaced by missing values.
+        '''
+        return list(self.metadata["invalid"])
+
+    def getMergedNumbers(self):
+        '''
+        Returns the number of merged timestamps of each column, which are
+        replaced by their last timestamp.
+        '''
+        return list(self.metadata["merged"])
+
+    def getSize(self):
+        return self.metadata["rows"]
+
+    def getColumn(self, name):
+        '''
+        Returns the column, as a read only NumPy array mapped in memory.
+        '''
+        return self.columns[self.getDescription().index(name)]
+
+    def getSample(self, names=None):
+        '''
+        Returns the numerical columns as an ot.Sample. The timestamps
+        are converted to seconds since 1970-01-01.
+        By default, all the columns which are not strings are returned.
+        '''
+        description = self.getDescription()
+        if names is None:
+            names = [description[j] for j in range(len(description)) if self.metadata["kinds"][j] != "string"]
+        data = np.zeros((self.getSize(), len(names)))
+        for k in range(len(names)):
+            j = description.index(names[k])
+            if self.metadata["kinds"][j] == "string":
+                raise ValueError("The column %s is not numerical" % (names[k]))
+            if self.metadata["kinds"][j] == "timestamp":
+                data[:, k] = self.columns[j].astype("datetime64[s]").astype(np.int64)
+                data[np.isnat(self.columns[j]), k] = np.nan
+            else:
+                data[:, k] = self.columns[j]
+        sample = ot.Sample(data)
+        sample.setDescription(names)
+        return sample
+
+def getCacheDirectory(filename):
+    directory, basename = os.path.split(os.path.abspath(filename))
+    return os.path.join(directory, cacheDirectoryName, basename)
+
+def readMetadata(cacheDirectory):
+    metadataFile = os.path.join(cacheDirectory, "metadata.json")
+    if not os.path.exists(metadataFile):
+        return None
+    with open(metadataFile) as f:
+        metadata = json.load(f)
+    if metadata.get("version") != cacheVersion:
+        return None
+    return metadata
+
+def writeMetadata(cacheDirectory, metadata):
+    metadataFile = os.path.join(cacheDirectory, "metadata.json")
+    temporary = metadataFile + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump(metadata, f, indent=1)
+    os.replace(temporary, metadataFile)
+
+def isCacheValid(filename, cacheDirectory, metadata):
+    '''
+    Returns True if the cached copy corresponds to the source file.
+    The metadata is updated if only the modification time has changed.
+    '''
+    if metadata is None:
+        return False
+    status = os.stat(filename)
+    if status.st_size != metadata["size"]:
+        return False
+    if status.st_mtime == metadata["mtime"]:
+        return True
+    if computeFileHash(filename) != metadata["sha256"]:
+        return False
+    metadata["mtime"] = status.st_mtime
+    writeMetadata(cacheDirectory, metadata)
+    return True
+
+def buildCache(filename, cacheDirectory):
+    separator, header, columns, kinds, invalids, mergeds = parseCSVFile(filename)
+    os.makedirs(cacheDirectory, exist_ok=True)
+    for j in range(len(columns)):
+        # A previous Dataset may map the file in memory: it is replaced,
+        # not rewritten
+        columnFile = os.path.join(cacheDirectory, "column-%d.npy" % (j))
+        temporary = columnFile + ".tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, columns[j])
+        os.replace(temporary, columnFile)
+    status = os.stat(filename)
+    metadata = {"version": cacheVersion, "source": os.path.basename(filename), 
+                "size": status.st_size, "mtime": status.st_mtime, "sha256": computeFileHash(filename), 
+                "separator": separator, "columns": header, "kinds": kinds, "invalid": invalids, "merged": mergeds, 
+                "rows": int(columns[0].size)}
+    # The metadata is written last: the cache is valid only when complete
+    writeMetadata(cacheDirectory, metadata)
+    return metadata
+
+def loadDataset(filename, allowInvalid=False):
+    '''
+    Returns the Dataset of the CSV file. The file is parsed only if
+    there is no valid cached copy.
+    If a value cannot be converted, raises a ValueError, or, if
+    allowInvalid is True, warns with the number of invalid values of
+    each column, which are missing values.
+    '''
+    cacheDirectory = getCacheDirectory(filename)
+    metadata = readMetadata(cacheDirectory)
+    if not isCacheValid(filename, cacheDirectory, metadata):
+        metadata = buildCache(filename, cacheDirectory)
+    invalids = ["%s: %d" % (name, number) for name, number in zip(metadata["columns"], metadata["invalid"]) if number > 0]
+    if len(invalids) > 0:
+        message = "%s: invalid values (%s)" % (filename, ", ".join(invalids))
+        if not allowInvalid:
+            raise ValueError(message)
+        warnings.warn(message)
+    columns = [np.load(os.path.join(cacheDirectory, "column-%d.npy" % (j)), mmap_mode="r")
+               for j in range(len(metadata["columns"]))]
+    return Dataset(filename, metadata, columns)
+
+if __name__=="__main__":
+    import time
+    for filename in ["../earthquakes/earthquakes-1965-2016-clean.csv", 
+                     "../earthquakes/earthquakes-1965-2016.csv",
+                     "../climate-weather/Humidite-relative-Bordeaux-1999-2019.csv",
+                     "../climate-weather/climat-Bordeaux-data-clean.csv"]:
+        t = time.time()
+        parseCSVFile(filename)
+        textTime = time.time() - t
+        loadDataset(filename)
+        t = time.time()
+        dataset = loadDataset(filename)
+        sample = dataset.getSample()
+        print("%s: %d rows, columns %s" % (os.path.basename(filename), dataset.getSize(), 
+              dict(zip(dataset.getDescription(), dataset.getKinds()))))
+        print("    Parse = %.1f (ms), cached = %.1f (ms)" % (1000. * textTime, 1000. * (time.time() - t)))
+    dataset = loadDataset("../climate-weather/Humidite-relative-Bordeaux-1999-2019.csv")
+    dates = dataset.getColumn("Date UTC")
+    print("First date = %s, merged timestamps = %s, missing dates = %d" % (dates[0], 
+          dataset.getMergedNumbers(), np.isnat(dates).sum()))
+    # The merged timestamps are those of timeseriesstreamlib
+    from timeseriesstreamlib import StreamingTimeSeriesReader
+    reader = StreamingTimeSeriesReader("../climate-weather/Humidite-relative-Bordeaux-1999-2019.csv")
+    streamDates = np.concatenate([times for times, values in reader])
+    if reader.getRejectedNumber() > 0 or not np.array_equal(dates, streamDates):
+        raise ValueError("The timestamps do not agree with timeseriesstreamlib")
+    # An invalid value raises an exception, unless it is allowed
+    import shutil
+    import tempfile
+    filename = os.path.join(tempfile.mkdtemp(), "invalid.csv")
+    with open(filename, "w") as f:
+        f.write("X;Y\n" + "".join(["%d;%d\n" % (i, i) for i in range(200)]) + "200;2O0\n")
+    try:
+        loadDataset(filename)
+        raise AssertionError("The invalid value is accepted")
+    except ValueError as error:
+        print("Error: %s" % (error))
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        dataset = loadDataset(filename, allowInvalid=True)
+    print("Allowed: %d missing, %d warning" % (np.isnan(dataset.getColumn("Y")).sum(), len(caught)))
+    shutil.rmtree(os.path.dirname(filename))
+    # A single column with a blank line for each missing observation
+    dataset = loadDataset("../climate-weather/Humidite-relative-Bordeaux-2018.csv")
+    sample = dataset.getSample()
+    print("Humidite-relative-Bordeaux-2018.csv: %d rows, columns %s, %d missing" % (sample.getSize(),
+          sample.getDescription(), np.isnan(np.array(sample)).sum()))
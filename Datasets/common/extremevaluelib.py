@@ -0,0 +1,195 @@
+#
+# Extreme value analysis of a series of events, e.g. the earthquakes.
+#
+# Block maxima: the maximum of the values in each block (e.g. year or
+# month) is computed for all the blocks at once from the block indices,
+# then a GEV distribution is fitted on the maxima.
+# Peaks over threshold: the excesses over a threshold are fitted by a
+# GPD distribution with the probability weighted moments (PWM). For a
+# sweep over many thresholds, the PWM estimators of all the thresholds
+# are computed at once with cumulative sums of the sorted values.
+# The confidence intervals of the return levels are computed by
+# bootstrap: the replicates are made by chunks, by a pool of processes,
+# each chunk with its own seed.
+#
+# Reference
+# J. R. M. Hosking, J. R. Wallis, "Parameter and quantile estimation for
+# the generalized Pareto distribution", Technometrics, 1987
+# S. Coles, "An Introduction to Statistical Modeling of Extreme Values",
+# Springer, 2001
+#
+
+import openturns as ot
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+def computeBlockMaxima(blocks, values):
+    '''
+    Returns the sorted keys of the blocks and the maximum of the values
+    in each block. The blocks without value are not in the result.
+    '''
+    keys, indices = np.unique(blocks, return_inverse=True)
+    maxima = np.full(keys.size, -np.inf)
+    np.maximum.at(maxima, indices, values)
+    return keys, maxima
+
+def computeExcesses(values, threshold):
+    '''
+    Returns the excesses over the threshold.
+    '''
+    return values[values > threshold] - threshold
+
+def computePWMSweep(values, thresholds):
+    '''
+    Estimate the GPD of the excesses over each threshold with the
+    probability weighted moments, with the plotting positions
+    (i - 0.35) / n. Returns the arrays of the number of excesses, of
+    sigma and of xi (xi > 0 is a heavy tail, as in ot.GeneralizedPareto).
+    The cost is O(N log(N) + T), where N is the number of values and T
+    the number of thresholds.
+    '''
+    v = np.sort(values)
+    size = v.size
+    thresholds = np.asarray(thresholds, dtype=float)
+    j = np.arange(size, dtype=float)
+    # Sums over the suffixes v[s:], with a zero at the end
+    suffix = lambda x: np.concatenate([np.cumsum(x[::-1])[::-1], [0.]])
+    sumV = suffix(v)
+    sumJ = suffix(j)
+    sumJV = suffix(j * v)
+    s = np.searchsorted(v, thresholds, side="right")
+    n = (size - s).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sumExcess = sumV[s] - thresholds * n
+        # Sum of (rank - 0.35) * excess, where rank = j - s + 1
+        sumRankExcess = sumJV[s] - thresholds * sumJ[s] - (s - 0.65) * sumExcess
+        a0 = sumExcess / n
+        a1 = (sumExcess - sumRankExcess / n) / n
+        xi = 2. - a0 / (a0 - 2. * a1)
+        sigma = 2. * a0 * a1 / (a0 - 2. * a1)
+    return n, sigma, xi
+
+def fitGPD(excesses):
+    '''
+    Returns the ot.GeneralizedPareto of the excesses, with the PWM.
+    '''
+    n, sigma, xi = computePWMSweep(excesses, [0.])
+    return ot.GeneralizedPareto(sigma[0], xi[0])
+
+def computeMeanExcess(values, thresholds):
+    '''
+    Returns the mean excess over each threshold (mean residual life plot).
+    '''
+    v = np.sort(values)
+    sumV = np.concatenate([np.cumsum(v[::-1])[::-1], [0.]])
+    s = np.searchsorted(v, thresholds, side="right")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sumV[s] / (v.size - s) - np.asarray(thresholds)
+
+def computeGEVReturnLevels(maxima, returnPeriods):
+    '''
+    Fit the GEV of the block maxima and returns the return levels, i.e.
+    the level exceeded once every T blocks on average.
+    '''
+    distribution = ot.GeneralizedExtremeValueFactory().build(ot.Sample(np.reshape(maxima, (-1, 1))))
+    return np.array([distribution.computeQuantile(1. - 1. / T)[0] for T in returnPeriods])
+
+class GPDReturnLevels:
+    '''
+    Fit the GPD of the excesses over the threshold and returns the
+    return levels. The rate is the mean number of excesses per unit of
+    time (e.g. year): the return level of period T is exceeded once
+    every T units of time on average.
+    '''
+    def __init__(self, threshold, rate):
+        self.threshold = threshold
+        self.rate = rate
+
+    def __call__(self, excesses, returnPeriods):
+        distribution = fitGPD(excesses)
+        return np.array([self.threshold + distribution.computeQuantile(1. - 1. / (self.rate * T))[0]
+                         for T in returnPeriods])
+
+def bootstrapChunk(computeReturnLevels, data, returnPeriods, seed, replicateNumber):
+    rng = np.random.default_rng(seed)
+    levels = np.empty((replicateNumber, len(returnPeriods)))
+    for r in range(replicateNumber):
+        levels[r] = computeReturnLevels(data[rng.integers(data.size, size=data.size)], returnPeriods)
+    return levels
+
+def bootstrapReturnLevels(computeReturnLevels, data, returnPeriods, replicateNumber=1000, level=0.95,
+                          seed=0, workerNumber=1, chunkSize=100):
+    '''
+    Returns the return levels and their bootstrap percentile intervals,
+    as a list of ot.Interval. computeReturnLevels is
+    computeGEVReturnLevels (data are the block maxima) or a
+    GPDReturnLevels (data are the excesses). The result does not depend
+    on the number of processes.
+    '''
+    data = np.asarray(data, dtype=float)
+    estimate = computeReturnLevels(data, returnPeriods)
+    chunkNumber = (replicateNumber + chunkSize - 1) // chunkSize
+    arguments = [[computeReturnLevels] * chunkNumber, [data] * chunkNumber, [returnPeriods] * chunkNumber,
+                 [np.random.SeedSequence([seed, k]) for k in range(chunkNumber)],
+                 [min(chunkSize, replicateNumber - k * chunkSize) for k in range(chunkNumber)]]
+    if workerNumber == 1:
+        chunks = list(map(bootstrapChunk, *arguments))
+    else:
+        with ProcessPoolExecutor(workerNumber) as executor:
+            chunks = list(executor.map(bootstrapChunk, *arguments))
+    levels = np.vstack(chunks)
+    lower = np.percentile(levels, 100. * (1. - level) / 2., axis=0)
+    upper = np.percentile(levels, 100. * (1. + level) / 2., axis=0)
+    return estimate, [ot.Interval(lower[i], upper[i]) for i in range(len(returnPeriods))]
+
+if __name__=="__main__":
+    import sys
+    import time
+    sys.path.append("../common")
+    from datasetloaderlib import loadDataset
+    dataset = loadDataset("../earthquakes/earthquakes-1965-2016-clean.csv")
+    year = np.array(dataset.getColumn("Year")).astype(int)
+    month = np.array(dataset.getColumn("Month")).astype(int)
+    magnitude = np.array(dataset.getColumn("Magnitude"))
+    yearNumber = year.max() - year.min() + 1
+    returnPeriods = [10., 50., 100.]
+    # Yearly and monthly block maxima
+    years, yearlyMaxima = computeBlockMaxima(year, magnitude)
+    months, monthlyMaxima = computeBlockMaxima(12 * year + month - 1, magnitude)
+    print("Blocks: %d years, %d months with an event" % (years.size, months.size))
+    t = time.time()
+    estimate, intervals = bootstrapReturnLevels(computeGEVReturnLevels, yearlyMaxima, returnPeriods,
+                                                replicateNumber=200, workerNumber=2, chunkSize=50)
+    print("GEV of the yearly maxima, bootstrap: %.2f (s)" % (time.time() - t))
+    for i in range(len(returnPeriods)):
+        print("    T = %3d years: %.2f %s" % (returnPeriods[i], estimate[i], intervals[i]))
+    # Peaks over threshold: the magnitudes are rounded to 0.1
+    threshold = 7.05
+    excesses = computeExcesses(magnitude, threshold)
+    returnLevels = GPDReturnLevels(threshold, excesses.size / yearNumber)
+    t = time.time()
+    estimate, intervals = bootstrapReturnLevels(returnLevels, excesses, returnPeriods, replicateNumber=1000)
+    print("GPD over %.2f, %d excesses, bootstrap: %.2f (s)" % (threshold, excesses.size, time.time() - t))
+    for i in range(len(returnPeriods)):
+        print("    T = %3d years: %.2f %s" % (returnPeriods[i], estimate[i], intervals[i]))
+    # Threshold sensitivity, compared with the PWM of each threshold
+    thresholds = np.linspace(6., 8., 500)
+    t = time.time()
+    n, sigma, xi = computePWMSweep(magnitude, thresholds)
+    meanExcess = computeMeanExcess(magnitude, thresholds)
+    print("Sweep over %d thresholds: %.1f (ms)" % (thresholds.size, 1000. * (time.time() - t)))
+    t = time.time()
+    error = 0.
+    for k in range(thresholds.size):
+        y = np.sort(computeExcesses(magnitude, thresholds[k]))
+        if y.size < 10:
+            continue
+        p = (np.arange(1, y.size + 1) - 0.35) / y.size
+        a0 = np.mean(y)
+        a1 = np.mean((1. - p) * y)
+        error = max(error, abs(xi[k] - (2. - a0 / (a0 - 2. * a1))), abs(sigma[k] - 2. * a0 * a1 / (a0 - 2. * a1)))
+    print("Loop over the thresholds: %.1f (ms), maximum difference = %.2e" % (1000. * (time.time() - t), error))
+    for u in [6.55, 7.05, 7.55]:
+        k = np.argmin(np.abs(thresholds - u))
+        print("    u = %.3f: n = %d, sigma = %.4f, xi = %.4f, mean excess = %.4f" % (thresholds[k],
+              n[k], sigma[k], xi[k], meanExcess[k]))
@@ -0,0 +1,195 @@
+#
+# Fit a mixture of gaussian distributions with the EM algorithm.
+#
+# Each iteration is made of array operations on the whole sample:
+# - E step: the log-density of each point for each component, with the
+#   Cholesky factor of the covariance, then the log-probability that
+#   the point belongs to the component, normalized with the log-sum-exp
+#   trick so that far away points do not underflow,
+# - M step: the weights, the means and the covariances, weighted by the
+#   probabilities, as matrix products.
+# The algorithm is run from several random initializations (restarts),
+# by a pool of processes if required, and the restart with the largest
+# log-likelihood is kept. The result is an ot.Mixture of ot.Normal.
+#
+# Reference
+# A. P. Dempster, N. M. Laird, D. B. Rubin, "Maximum Likelihood from
+# Incomplete Data via the EM Algorithm", Journal of the Royal
+# Statistical Society, Series B, 1977
+#
+
+import openturns as ot
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+def computeLogDensities(X, weights, means, covariances):
+    '''
+    Returns the (K, n) array of log(w_k) + log(pdf_k(x_i)). The
+    components are the rows, so that the sums over the components are
+    sums of contiguous rows.
+    '''
+    sampleSize, dimension = X.shape
+    componentNumber = weights.size
+    logDensities = np.empty((componentNumber, sampleSize))
+    for k in range(componentNumber):
+        L = np.linalg.cholesky(covariances[k])
+        # z = L^-1 (x - mu), for all the points at once
+        A = np.linalg.inv(L).T
+        Z = X @ A
+        Z -= means[k] @ A
+        logDeterminant = 2. * np.sum(np.log(np.diag(L)))
+        logDensities[k] = np.log(weights[k]) - 0.5 * (np.einsum("ij,ij->i", Z, Z) + logDeterminant
+                                                        + dimension * np.log(2. * np.pi))
+    return logDensities
+
+def computeLogSumExp(logDensities):
+    maximum = logDensities.max(axis=0)
+    return maximum + np.log(np.sum(np.exp(logDensities - maximum), axis=0))
+
+def initializeComponents(X, componentNumber, rng):
+    '''
+    The means are points of the sample chosen as in k-means++: each new
+    mean is drawn with a probability proportional to the squared distance
+    to the nearest mean. The covariances are the covariance of the sample.
+    '''
+    sampleSize, dimension = X.shape
+    means = [X[rng.integers(sampleSize)]]
+    distances = np.sum((X - means[0])**2, axis=1)
+    for k in range(1, componentNumber):
+        index = rng.choice(sampleSize, p=distances / distances.sum())
+        means.append(X[index])
+        distances = np.minimum(distances, np.sum((X - means[k])**2, axis=1))
+    covariance = np.atleast_2d(np.cov(X.T))
+    weights = np.full(componentNumber, 1. / componentNumber)
+    return weights, np.array(means), np.array([covariance] * componentNumber)
+
+def runEM(X, componentNumber, seed, maximumIteration, tolerance, regularization):
+    '''
+    Run the EM algorithm from the initialization of the seed.
+    Returns the log-likelihood, the weights, the means, the covariances
+    and the number of iterations.
+    '''
+    sampleSize, dimension = X.shape
+    # Center the sample, so that the covariances are computed accurately
+    # from the second moments
+    center = X.mean(axis=0)
+    X = X - center
+    rng = np.random.default_rng(seed)
+    weights, means, covariances = initializeComponents(X, componentNumber, rng)
+    logLikelihood = -np.inf
+    for iteration in range(maximumIteration):
+        # E step
+        logDensities = computeLogDensities(X, weights, means, covariances)
+        logSum = computeLogSumExp(logDensities)
+        R = np.exp(logDensities - logSum, out=logDensities)
+        previous = logLikelihood
+        logLikelihood = np.sum(logSum)
+        if logLikelihood - previous < tolerance * abs(logLikelihood):
+            break
+        # M step
+        counts = R.sum(axis=1) + 10. * np.finfo(float).eps
+        weights = counts / sampleSize
+        means = (R @ X) / counts[:, None]
+        for k in range(componentNumber):
+            # The second moment, then the covariance: X is centered
+            covariances[k] = (R[k, :, None] * X).T @ X / counts[k] - np.outer(means[k], means[k])
+            covariances[k] += regularization * np.eye(dimension)
+    return logLikelihood, weights, means + center, covariances, iteration + 1
+
+class GaussianMixtureEM:
+    '''
+    Estimate a mixture of componentNumber gaussian distributions, with
+    full covariance matrices.
+    The restarts are reproducible: the restart r is initialized from the
+    seed [seed, r], whatever the number of processes.
+    '''
+    def __init__(self, componentNumber, restartNumber=4, seed=0, workerNumber=1):
+        self.componentNumber = componentNumber
+        self.restartNumber = restartNumber
+        self.seed = seed
+        self.workerNumber = workerNumber
+        self.maximumIteration = 500
+        self.tolerance = 1.e-10
+        self.regularization = 1.e-6
+        self.logLikelihood = None
+        self.iterationNumber = None
+
+    def setMaximumIteration(self, maximumIteration):
+        self.maximumIteration = maximumIteration
+
+    def setTolerance(self, tolerance):
+        '''
+        Set the relative tolerance on the increase of the log-likelihood.
+        '''
+        self.tolerance = tolerance
+
+    def getLogLikelihood(self):
+        return self.logLikelihood
+
+    def getIterationNumber(self):
+        return self.iterationNumber
+
+    def build(self, sample):
+        '''
+        Returns the fitted ot.Mixture.
+        '''
+        X = np.array(sample, dtype=float)
+        seeds = [np.random.SeedSequence([self.seed, r]) for r in range(self.restartNumber)]
+        arguments = [[X] * self.restartNumber, [self.componentNumber] * self.restartNumber, seeds,
+                     [self.maximumIteration] * self.restartNumber, [self.tolerance] * self.restartNumber,
+                     [self.regularization] * self.restartNumber]
+        if self.workerNumber == 1:
+            results = list(map(runEM, *arguments))
+        else:
+            with ProcessPoolExecutor(self.workerNumber) as executor:
+                results = list(executor.map(runEM, *arguments))
+        logLikelihood, weights, means, covariances, iterationNumber = max(results, key=lambda result: result[0])
+        self.logLikelihood = logLikelihood
+        self.iterationNumber = iterationNumber
+        atoms = []
+        for k in range(self.componentNumber):
+            covariance = ot.CovarianceMatrix(covariances[k].tolist())
+            atoms.append(ot.Normal(ot.Point(means[k]), covariance))
+        mixture = ot.Mixture(atoms, weights.tolist())
+        mixture.setDescription(sample.getDescription())
+        return mixture
+
+def computeParameterError(mixture, reference):
+    '''
+    Returns the maximum absolute difference between the weights, the
+    means and the covariances of two mixtures of gaussian distributions,
+    with the components of the mixture matched to the nearest mean of
+    the reference.
+    '''
+    error = 0.
+    atoms = mixture.getDistributionCollection()
+    for referenceAtom, referenceWeight in zip(reference.getDistributionCollection(), reference.getWeights()):
+        referenceMean = np.array(referenceAtom.getMean())
+        distances = [np.linalg.norm(np.array(atom.getMean()) - referenceMean) for atom in atoms]
+        k = int(np.argmin(distances))
+        error = max(error, abs(mixture.getWeights()[k] - referenceWeight), distances[k],
+                    np.max(np.abs(np.array(atoms[k].getCovariance()) - np.array(referenceAtom.getCovariance()))))
+    return error
+
+if __name__=="__main__":
+    import importlib
+    import sys
+    import time
+    sys.path.append("../gaussian")
+    # The distributions of the generators of the datasets
+    for dimension in [2, 3]:
+        generatorModule = importlib.import_module("gauss-mixture-%dD-generate" % (dimension))
+        reference = generatorModule.createMixture()
+        sample = ot.Sample.ImportFromCSVFile("../gaussian/gauss-mixture-%dD.csv" % (dimension), ";")
+        mixture = GaussianMixtureEM(2).build(sample)
+        print("gauss-mixture-%dD.csv: size = %d, parameter error = %.3f" % (dimension,
+              sample.getSize(), computeParameterError(mixture, reference)))
+    # A large sample of the 3D mixture
+    ot.RandomGenerator.SetSeed(0)
+    sample = reference.getSample(10**6)
+    algo = GaussianMixtureEM(2, restartNumber=2, workerNumber=2)
+    t = time.time()
+    mixture = algo.build(sample)
+    print("Size = %d, iterations = %d: %.1f (s)" % (sample.getSize(), algo.getIterationNumber(), time.time() - t))
+    print("Parameter error = %.4f" % (computeParameterError(mixture, reference)))
+    print("Weights = %s" % (mixture.getWeights()))
@@ -0,0 +1,207 @@
+#
+# Fit and select the marginal distributions of the columns of the datasets.
+#
+# Each candidate factory (e.g. ot.NormalFactory, ot.GammaFactory) is
+# fitted on each numerical column. The candidates are ranked by the BIC
+# criterion, and the p-value of the Kolmogorov-Smirnov test is given
+# for information. The p-value is optimistic, because the parameters
+# are estimated on the same sample.
+# The columns are fitted by a pool of processes. The results are kept
+# in the file .datasetcache/marginal-fitting.json, with a key which is
+# the SHA-256 hash of the values of the column and the name of the
+# factory: a column is fitted again only if its values have changed.
+#
+
+import openturns as ot
+import numpy as np
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append("../common")
+from datasetcataloglib import DatasetCatalog
+
+# The names of the default candidate factories
+defaultFactoryNames = ["NormalFactory", "LogNormalFactory", "GammaFactory", "WeibullMinFactory",
+                       "GumbelFactory", "LogisticFactory", "UniformFactory", "ExponentialFactory"]
+
+# The columns with fewer distinct values are not fitted, e.g. a year or a class
+minimumDistinctNumber = 10
+
+# Increase when the format of the results changes
+fittingVersion = 1
+
+def computeColumnHash(values):
+    return hashlib.sha256(np.ascontiguousarray(values, dtype=float).tobytes()).hexdigest()
+
+def fitCandidate(values, factoryName):
+    '''
+    Fit the factory on the values. Returns the dictionary of the result,
+    or the error message if the fit fails (e.g. ot.LogNormalFactory on
+    negative values).
+    '''
+    sample = ot.Sample(values.reshape(-1, 1))
+    try:
+        distribution = getattr(ot, factoryName)().build(sample)
+        parameterNumber = distribution.getParameterDimension()
+        bic = ot.FittingTest.BIC(sample, distribution, parameterNumber)
+        pValue = ot.FittingTest.Kolmogorov(sample, distribution).getPValue()
+    except Exception as exception:
+        return {"factory": factoryName, "error": str(exception).split("\n")[0]}
+    if not np.isfinite(bic):
+        return {"factory": factoryName, "error": "The BIC is not finite"}
+    return {"factory": factoryName, "distribution": distribution.getImplementation().getClassName(),
+            "parameter": list(distribution.getParameter()), "bic": bic, "pValue": pValue}
+
+def fitColumn(values, factoryNames):
+    return [fitCandidate(values, factoryName) for factoryName in factoryNames]
+
+def rebuildDistribution(result):
+    '''
+    Returns the ot.Distribution of the result of a fit.
+    '''
+    distribution = getattr(ot, result["distribution"])()
+    distribution.setParameter(result["parameter"])
+    return ot.Distribution(distribution)
+
+def rankResults(results):
+    '''
+    Returns the successful fits, sorted by increasing BIC.
+    '''
+    return sorted([result for result in results if "error" not in result], key=lambda result: result["bic"])
+
+class MarginalFittingPipeline:
+    '''
+    Fit the candidate factories on the numerical columns of the datasets
+    of the catalog.
+    '''
+    def __init__(self, catalog, factoryNames=defaultFactoryNames, workerNumber=1):
+        self.catalog = catalog
+        self.factoryNames = factoryNames
+        self.workerNumber = workerNumber
+        self.cacheFile = os.path.join(catalog.root, ".datasetcache", "marginal-fitting.json")
+        self.cache = self.readCache()
+        self.hitNumber = 0
+        self.fitNumber = 0
+        self.rows = []
+
+    def readCache(self):
+        if not os.path.exists(self.cacheFile):
+            return {}
+        with open(self.cacheFile) as f:
+            cache = json.load(f)
+        if cache.get("version") != fittingVersion:
+            return {}
+        return cache["results"]
+
+    def writeCache(self):
+        os.makedirs(os.path.dirname(self.cacheFile), exist_ok=True)
+        temporary = self.cacheFile + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump({"version": fittingVersion, "results": self.cache}, f)
+        os.replace(temporary, self.cacheFile)
+
+    def getColumns(self, names):
+        '''
+        Returns the list of (dataset, column, values) to fit: the
+        finite values of the columns of floats with enough distinct values.
+        '''
+        columns = []
+        for name in names:
+            dataset = self.catalog.load(name)
+            for column, kind in zip(dataset.getDescription(), dataset.getKinds()):
+                if kind != "float":
+                    continue
+                values = np.array(dataset.getColumn(column))
+                values = values[np.isfinite(values)]
+                if np.unique(values).size < minimumDistinctNumber:
+                    continue
+                columns.append((name, column, values))
+        return columns
+
+    def run(self, names=None):
+        '''
+        Fit the columns of the datasets, all the datasets of the catalog
+        by default. The missing fits are computed in parallel.
+        '''
+        if names is None:
+            names = self.catalog.getNames()
+        columns = self.getColumns(names)
+        self.hitNumber = 0
+        self.fitNumber = 0
+        tasks = []
+        for name, column, values in columns:
+            columnHash = computeColumnHash(values)
+            missing = [factoryName for factoryName in self.factoryNames
+                       if factoryName not in self.cache.get(columnHash, {})]
+            self.hitNumber += len(self.factoryNames) - len(missing)
+            if len(missing) > 0:
+                tasks.append((columnHash, values, missing))
+        if self.workerNumber == 1:
+            fits = [fitColumn(values, missing) for columnHash, values, missing in tasks]
+        else:
+            with ProcessPoolExecutor(self.workerNumber) as executor:
+                fits = list(executor.map(fitColumn, [task[1] for task in tasks], [task[2] for task in tasks]))
+        for (columnHash, values, missing), results in zip(tasks, fits):
+            for result in results:
+                self.cache.setdefault(columnHash, {})[result["factory"]] = result
+            self.fitNumber += len(results)
+        if len(tasks) > 0:
+            self.writeCache()
+        self.rows = []
+        for name, column, values in columns:
+            results = self.cache[computeColumnHash(values)]
+            ranked = rankResults([results[factoryName] for factoryName in self.factoryNames])
+            self.rows.append((name, column, values.size, ranked))
+        return None
+
+    def getHitNumber(self):
+        return self.hitNumber
+
+    def getFitNumber(self):
+        return self.fitNumber
+
+    def getBestDistribution(self, name, column):
+        '''
+        Returns the distribution with the lowest BIC for the column.
+        '''
+        for rowName, rowColumn, size, ranked in self.rows:
+            if rowName == name and rowColumn == column:
+                return rebuildDistribution(ranked[0])
+        raise ValueError("The column %s of %s has not been fitted" % (column, name))
+
+    def getSummaryTable(self):
+        '''
+        Returns the table of the best and second best candidates of each
+        column, as a string.
+        '''
+        lines = ["%-48s %-28s %6s %-18s %11s %8s %-18s" % ("Dataset", "Column", "Size",
+                 "Best", "BIC", "KS p", "Second")]
+        for name, column, size, ranked in self.rows:
+            if len(ranked) == 0:
+                lines.append("%-48s %-28s %6d %s" % (name, column[:28], size, "No candidate"))
+                continue
+            best = ranked[0]
+            second = ranked[1]["distribution"] if len(ranked) > 1 else ""
+            lines.append("%-48s %-28s %6d %-18s %11.4g %8.3f %-18s" % (name, column[:28], size,
+                         best["distribution"], best["bic"], best["pValue"], second))
+        return "\n".join(lines)
+
+if __name__=="__main__":
+    import time
+    catalog = DatasetCatalog("..")
+    names = ["climate-weather/wind_speed_laurel_nebraska-clean", "earthquakes/earthquakes-1965-2016-clean",
+             "sklearn/Iris_dataset", "sklearn/Wine_dataset"]
+    # Start without cached results
+    pipeline = MarginalFittingPipeline(catalog, workerNumber=2)
+    pipeline.cache = {}
+    t = time.time()
+    pipeline.run(names)
+    print("Fits = %d, cached = %d: %.2f (s)" % (pipeline.getFitNumber(), pipeline.getHitNumber(), time.time() - t))
+    pipeline = MarginalFittingPipeline(catalog, workerNumber=2)
+    t = time.time()
+    pipeline.run(names)
+    print("Fits = %d, cached = %d: %.2f (s)" % (pipeline.getFitNumber(), pipeline.getHitNumber(), time.time() - t))
+    print(pipeline.getSummaryTable())
+    print(pipeline.getBestDistribution("earthquakes/earthquakes-1965-2016-clean", "Magnitude"))
@@ -0,0 +1,169 @@
+#
+# Generate large synthetic datasets by chunks.
+#
+# The sample is generated by chunks of chunkSize rows. The chunk k is
+# generated after the OpenTURNS random generator is seeded with a seed
+# derived from the master seed and k only. Hence the dataset only
+# depends on the master seed and the chunk size: the chunks can be
+# generated in any order, by any number of processes, and the file is
+# the same. Each chunk is written to the file as soon as it is
+# available, in order, so that the memory is bounded by a few chunks.
+#
+# The file is either a CSV file, with the same format as
+# ot.Sample.exportToCSVFile, or a NumPy .npy file, which is faster to
+# write and to read.
+#
+
+import openturns as ot
+import numpy as np
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+def getChunkSeed(seed, chunkIndex):
+    '''
+    Returns the seed of the chunk, derived from the master seed.
+    '''
+    return int(np.random.SeedSequence([seed, chunkIndex]).generate_state(1)[0])
+
+def generateChunk(generator, seed, chunkIndex, chunkSize):
+    '''
+    Returns the rows of the chunk, as an array.
+    '''
+    ot.RandomGenerator.SetSeed(getChunkSeed(seed, chunkIndex))
+    return np.array(generator(chunkSize))
+
+class DistributionGenerator:
+    '''
+    Generate a sample of the distribution.
+    '''
+    def __init__(self, distribution):
+        self.distribution = distribution
+
+    def getDescription(self):
+        return list(self.distribution.getDescription())
+
+    def __call__(self, size):
+        return self.distribution.getSample(size)
+
+class ObservationGenerator:
+    '''
+    Generate noisy observations of the model: the input columns
+    inputIndices of a sample of the input distribution, and the outputs
+    of the model plus a sample of the noise distribution.
+    The model should be vectorized, e.g. an ot.SymbolicFunction.
+    '''
+    def __init__(self, inputDistribution, model, noiseDistribution, inputIndices, description):
+        self.inputDistribution = inputDistribution
+        self.model = model
+        self.noiseDistribution = noiseDistribution
+        self.inputIndices = inputIndices
+        self.description = description
+
+    def getDescription(self):
+        return self.description
+
+    def __call__(self, size):
+        inputSample = self.inputDistribution.getSample(size)
+        observed = np.array(self.model(inputSample)) + np.array(self.noiseDistribution.getSample(size))
+        return np.hstack([np.array(inputSample)[:, self.inputIndices], observed])
+
+def generateSample(generator, size, chunkSize=100000, seed=0):
+    '''
+    Returns the first size rows of the dataset as an ot.Sample, e.g.
+    to draw the first chunk.
+    '''
+    chunkNumber = (size + chunkSize - 1) // chunkSize
+    chunks = [generateChunk(generator, seed, k, min(chunkSize, size - k * chunkSize)) for k in range(chunkNumber)]
+    sample = ot.Sample(np.vstack(chunks))
+    sample.setDescription(generator.getDescription())
+    return sample
+
+def formatChunk(chunk):
+    '''
+    Returns the lines of the chunk, as np.savetxt with the format %.16e,
+    with one format string for the whole chunk.
+    '''
+    rowFormat = ";".join(["%.16e"] * chunk.shape[1]) + "\n"
+    return (rowFormat * chunk.shape[0]) % tuple(chunk.ravel())
+
+def iterateChunks(generator, size, chunkSize, seed, workerNumber):
+    '''
+    Iterate over the chunks, in order. With several workers, at most
+    2*workerNumber chunks are pending.
+    '''
+    chunkNumber = (size + chunkSize - 1) // chunkSize
+    sizes = [min(chunkSize, size - k * chunkSize) for k in range(chunkNumber)]
+    if workerNumber == 1:
+        for k in range(chunkNumber):
+            yield generateChunk(generator, seed, k, sizes[k])
+        return
+    with ProcessPoolExecutor(workerNumber) as executor:
+        pending = []
+        submitted = 0
+        while submitted < chunkNumber or len(pending) > 0:
+            while submitted < chunkNumber and len(pending) < 2 * workerNumber:
+                pending.append(executor.submit(generateChunk, generator, seed, submitted, sizes[submitted]))
+                submitted += 1
+            yield pending.pop(0).result()
+
+def writeSyntheticDataset(filename, generator, size, chunkSize=100000, seed=0, workerNumber=1):
+    '''
+    Generate the dataset by chunks and write it in the file. The format
+    is NumPy if the extension of the file is .npy, CSV otherwise.
+    '''
+    description = generator.getDescription()
+    if filename.endswith(".npy"):
+        data = np.lib.format.open_memmap(filename, mode="w+", dtype=float, shape=(size, len(description)))
+        start = 0
+        for chunk in iterateChunks(generator, size, chunkSize, seed, workerNumber):
+            data[start:start + chunk.shape[0]] = chunk
+            start += chunk.shape[0]
+        data.flush()
+        del data
+        return None
+    temporary = filename + ".tmp"
+    with open(temporary, "w") as f:
+        f.write(";".join(['"%s"' % (name) for name in description]) + "\n")
+        for chunk in iterateChunks(generator, size, chunkSize, seed, workerNumber):
+            f.write(formatChunk(chunk))
+    os.replace(temporary, filename)
+    return None
+
+def parseGeneratorArguments(description, filename, size):
+    '''
+    Returns the options of a generator script. By default, the script
+    generates size rows in the file and draws them.
+    '''
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--size", type=int, default=size, help="number of rows")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="number of rows of each chunk")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes")
+    parser.add_argument("--output", default=filename, help="output file, .csv or .npy")
+    parser.add_argument("--no-plot", dest="plot", action="store_false", help="do not draw the sample")
+    return parser.parse_args()
+
+if __name__=="__main__":
+    import time
+    import tempfile
+    R = ot.CorrelationMatrix(2)
+    R[0, 1] = 0.5
+    distribution = ot.Normal([0.] * 2, [1.] * 2, R)
+    distribution.setDescription(["X0", "X1"])
+    generator = DistributionGenerator(distribution)
+    size = 2 * 10**5
+    directory = tempfile.mkdtemp()
+    results = []
+    for workerNumber in [1, 2]:
+        for extension in [".csv", ".npy"]:
+            filename = os.path.join(directory, "sample-%d%s" % (workerNumber, extension))
+            t = time.time()
+            writeSyntheticDataset(filename, generator, size, 20000, 1, workerNumber)
+            print("Workers = %d, %s: %.2f (s)" % (workerNumber, extension, time.time() - t))
+            results.append(open(filename, "rb").read())
+    print("Identical files whatever the number of workers: %s" % (results[0] == results[2] and results[1] == results[3]))
+    data = np.load(os.path.join(directory, "sample-1.npy"), mmap_mode="r")
+    print("Size = %d, correlation = %.4f" % (data.shape[0], np.corrcoef(data.T)[0, 1]))
+    first = generateSample(generator, 1000, 20000, 1)
+    print("First rows reproduced: %s" % (np.array_equal(np.array(first), data[:1000])))
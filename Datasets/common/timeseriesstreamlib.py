@@ -0,0 +1,291 @@
+#
+# Streaming reader and resampler of the station time series.
+#
+# The file is a text file with one timestamp and one value per line, e.g.
+# "25/02/99 03h00;93" as in Humidite-relative-Bordeaux-1999-2019.csv.
+# It is read by chunks of lines. In each chunk, the timestamps are
+# decoded from the bytes of the fixed width format "dd/mm/yy HHhMM" with
+# array operations, without creating a string or a datetime per line.
+# The values of each chunk are added to the bins of the aggregation
+# (day, month, year or a fixed number of seconds): the memory depends
+# on the chunk size and the number of bins, not on the number of lines.
+# The result is an ot.TimeSeries on a regular grid.
+#
+# Some lines of the file are several lines merged into one, e.g.
+# "02/03/99 06h0002/03/99 09h00;94": the value is the one of the last
+# timestamp, the other timestamps have no value.
+#
+
+import openturns as ot
+import numpy as np
+from itertools import islice
+
+# The length of the timestamp "dd/mm/yy HHhMM"
+timestampLength = 14
+
+# The expected characters of the timestamp, "." is a digit
+timestampPattern = np.frombuffer(b"../../.. ..h..", dtype=np.uint8)
+
+def decodeTimestamps(stamps):
+    '''
+    Decode an array of bytes "dd/mm/yy HHhMM" (dtype S14).
+    Returns the array of datetime64[s] and the boolean array of the
+    valid timestamps. Two-digit years lower than 70 are in 2000-2069.
+    '''
+    size = stamps.shape[0]
+    characters = np.frombuffer(stamps.tobytes(), dtype=np.uint8).reshape(size, timestampLength)
+    isDigit = timestampPattern == ord(".")
+    digits = characters.astype(np.int64) - ord("0")
+    valid = np.all(np.where(isDigit, (digits >= 0) & (digits <= 9), characters == timestampPattern), axis=1)
+    number = lambda j: 10 * digits[:, j] + digits[:, j + 1]
+    day, month, year, hour, minute = number(0), number(3), number(6), number(9), number(12)
+    year = np.where(year < 70, 2000 + year, 1900 + year)
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31) & (hour < 24) & (minute < 60)
+    month = np.where(valid, month, 1)
+    day = np.where(valid, day, 1)
+    months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+    days = months.astype("datetime64[D]") + (day - 1).astype("timedelta64[D]")
+    seconds = days.astype("datetime64[s]") + (3600 * hour + 60 * minute).astype("timedelta64[s]")
+    # The day must exist in the month, e.g. not 31/04
+    valid &= days.astype("datetime64[M]") == months
+    return seconds, valid
+
+def decodeValues(fields):
+    '''
+    Convert an array of bytes to floats. The empty and invalid values are NaN.
+    '''
+    fields = np.char.strip(fields)
+    values = np.full(fields.shape[0], np.nan)
+    present = np.char.str_len(fields) > 0
+    try:
+        values[present] = fields[present].astype(float)
+    except ValueError:
+        for i in np.flatnonzero(present):
+            try:
+                values[i] = float(fields[i])
+            except ValueError:
+                pass
+    return values
+
+class StreamingTimeSeriesReader:
+    '''
+    Iterate over the file by chunks of chunkSize lines. Each chunk is a
+    pair (times, values), with times in datetime64[s].
+    Only the lines in the time window [start, stop) are kept, where
+    start and stop are strings as "2018-01-01" or None. If the file is
+    chronological, the reading stops at the first chunk after stop.
+    '''
+    def __init__(self, filename, separator=b";", chunkSize=2**16, start=None, stop=None, isChronological=True):
+        self.filename = filename
+        self.separator = separator
+        self.chunkSize = chunkSize
+        self.start = None if start is None else np.datetime64(start, "s")
+        self.stop = None if stop is None else np.datetime64(stop, "s")
+        self.isChronological = isChronological
+        self.lineNumber = 0
+        self.rejectedNumber = 0
+
+    def getLineNumber(self):
+        return self.lineNumber
+
+    def getRejectedNumber(self):
+        '''
+        Returns the number of lines without a valid timestamp.
+        '''
+        return self.rejectedNumber
+
+    def decodeChunk(self, lines):
+        lines = np.array(lines)
+        parts = np.char.partition(np.char.rstrip(lines), self.separator)
+        stamps = np.char.strip(parts[:, 0])
+        values = decodeValues(parts[:, 2])
+        lengths = np.char.str_len(stamps)
+        isWellFormed = (lengths > 0) & (lengths % timestampLength == 0)
+        # Merged lines: keep the last timestamp
+        merged = np.flatnonzero(isWellFormed & (lengths > timestampLength))
+        for i in merged:
+            stamps[i] = stamps[i][-timestampLength:]
+        times, valid = decodeTimestamps(stamps.astype("S%d" % (timestampLength)))
+        valid &= isWellFormed
+        self.rejectedNumber += np.count_nonzero(~valid)
+        return times[valid], values[valid]
+
+    def __iter__(self):
+        self.lineNumber = 0
+        self.rejectedNumber = 0
+        with open(self.filename, "rb") as f:
+            # Skip the header
+            f.readline()
+            while True:
+                lines = list(islice(f, self.chunkSize))
+                if len(lines) == 0:
+                    break
+                self.lineNumber += len(lines)
+                times, values = self.decodeChunk(lines)
+                if times.size == 0:
+                    continue
+                if self.isChronological and self.stop is not None and times[0] >= self.stop:
+                    break
+                inside = np.ones(times.size, dtype=bool)
+                if self.start is not None:
+                    inside &= times >= self.start
+                if self.stop is not None:
+                    inside &= times < self.stop
+                if np.any(inside):
+                    yield times[inside], values[inside]
+
+def computeBinIndices(times, period):
+    '''
+    Returns the index of the bin of each time: the number of periods
+    since 1970-01-01. The period is "D" (day), "M" (month), "Y" (year)
+    or a number of seconds.
+    '''
+    if period in ["D", "M", "Y"]:
+        return times.astype("datetime64[%s]" % (period)).astype(np.int64)
+    return times.astype(np.int64) // int(period)
+
+def getBinTime(index, period):
+    '''
+    Returns the time of the start of the bin: the number of days since
+    1970-01-01 for a day or a number of seconds, and the year as a
+    decimal number (e.g. 2018.5 for July 2018) for a month or a year.
+    '''
+    if period == "D":
+        return float(index)
+    if period == "M":
+        return 1970. + index / 12.
+    if period == "Y":
+        return 1970. + index
+    return index * float(period) / 86400.
+
+def getBinStep(period):
+    if period == "D":
+        return 1.
+    if period == "M":
+        return 1. / 12.
+    if period == "Y":
+        return 1.
+    return float(period) / 86400.
+
+class StreamingResampler:
+    '''
+    Aggregate the chunks of values by bins of the period. The statistic
+    is "mean", "min", "max" or "count". The arrays of the bins grow as
+    the chunks are added.
+    '''
+    def __init__(self, period="D", statistic="mean"):
+        if statistic not in ["mean", "min", "max", "count"]:
+            raise ValueError("Unknown statistic %s" % (statistic))
+        self.period = period
+        self.statistic = statistic
+        self.firstIndex = None
+        self.sums = np.zeros(0)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.minima = np.zeros(0)
+        self.maxima = np.zeros(0)
+
+    def extend(self, firstIndex, lastIndex):
+        '''
+        Extend the bins so that they contain [firstIndex, lastIndex].
+        '''
+        if self.firstIndex is None:
+            self.firstIndex = firstIndex
+        before = max(0, self.firstIndex - firstIndex)
+        after = max(0, lastIndex - self.firstIndex - self.counts.size + 1 + before)
+        if before > 0 or after > 0:
+            self.sums = np.pad(self.sums, (before, after))
+            self.counts = np.pad(self.counts, (before, after))
+            self.minima = np.pad(self.minima, (before, after), constant_values=np.inf)
+            self.maxima = np.pad(self.maxima, (before, after), constant_values=-np.inf)
+            self.firstIndex -= before
+
+    def add(self, times, values):
+        present = ~np.isnan(values)
+        times = times[present]
+        values = values[present]
+        if times.size == 0:
+            return
+        indices = computeBinIndices(times, self.period)
+        self.extend(indices.min(), indices.max())
+        bins = indices - self.firstIndex
+        binNumber = self.counts.size
+        self.sums += np.bincount(bins, weights=values, minlength=binNumber)
+        self.counts += np.bincount(bins, minlength=binNumber)
+        if self.statistic == "min":
+            np.minimum.at(self.minima, bins, values)
+        elif self.statistic == "max":
+            np.maximum.at(self.maxima, bins, values)
+
+    def getValues(self):
+        '''
+        Returns the value of each bin, NaN if the bin is empty.
+        '''
+        isEmpty = self.counts == 0
+        if self.statistic == "count":
+            return self.counts.astype(float)
+        if self.statistic == "mean":
+            values = self.sums / np.maximum(self.counts, 1)
+        elif self.statistic == "min":
+            values = self.minima.copy()
+        else:
+            values = self.maxima.copy()
+        values[isEmpty] = np.nan
+        return values
+
+    def getTimeSeries(self, fill=None):
+        '''
+        Returns the ot.TimeSeries of the bins. If fill is "linear", the
+        empty bins are linearly interpolated, otherwise they are NaN.
+        '''
+        if self.firstIndex is None:
+            raise ValueError("No value has been added")
+        values = self.getValues()
+        if fill == "linear":
+            isEmpty = np.isnan(values)
+            positions = np.arange(values.size)
+            values[isEmpty] = np.interp(positions[isEmpty], positions[~isEmpty], values[~isEmpty])
+        grid = ot.RegularGrid(getBinTime(self.firstIndex, self.period), getBinStep(self.period), values.size)
+        return ot.TimeSeries(grid, ot.Sample(values.reshape(-1, 1)))
+
+def resampleTimeSeries(filename, period="D", statistic="mean", start=None, stop=None, fill=None, chunkSize=2**16):
+    '''
+    Read the file by chunks and returns the ot.TimeSeries of the
+    statistic of the values by period, in the time window [start, stop).
+    '''
+    reader = StreamingTimeSeriesReader(filename, chunkSize=chunkSize, start=start, stop=stop)
+    resampler = StreamingResampler(period, statistic)
+    for times, values in reader:
+        resampler.add(times, values)
+    return resampler.getTimeSeries(fill)
+
+if __name__=="__main__":
+    import time
+    import datetime
+    filename = "../climate-weather/Humidite-relative-Bordeaux-1999-2019.csv"
+    t = time.time()
+    reader = StreamingTimeSeriesReader(filename, chunkSize=10000)
+    resampler = StreamingResampler("D")
+    for times, values in reader:
+        resampler.add(times, values)
+    daily = resampler.getTimeSeries()
+    print("Lines = %d, rejected = %d, days = %d: %.1f (ms)" % (reader.getLineNumber(),
+          reader.getRejectedNumber(), daily.getSize(), 1000. * (time.time() - t)))
+    # Compare with the daily means computed line by line
+    sums = {}
+    with open(filename) as f:
+        f.readline()
+        for line in f:
+            stamp, value = line.strip().split(";")
+            day = datetime.datetime.strptime(stamp[-timestampLength:], "%d/%m/%y %Hh%M").date()
+            sums.setdefault(day, []).append(float(value))
+    streamed = np.array(daily.getValues()).flatten()
+    start = datetime.date(1970, 1, 1) + datetime.timedelta(days=int(daily.getTimeGrid().getStart()))
+    error = max([abs(streamed[(day - start).days] - np.mean(values)) for day, values in sums.items()])
+    print("Maximum difference of the daily means = %.2e" % (error))
+    # The 2018 subset is the window [2018-01-01, 2019-01-01)
+    values2018 = np.concatenate([values for times, values in
+                                 StreamingTimeSeriesReader(filename, start="2018-01-01", stop="2019-01-01")])
+    subset = np.loadtxt("../climate-weather/Humidite-relative-Bordeaux-2018.csv", skiprows=1)
+    print("2018: %d values, identical to the subset: %s" % (values2018.size, np.array_equal(values2018, subset)))
+    monthly = resampleTimeSeries(filename, "M", "max", start="2010-01-01", fill="linear")
+    print("Monthly maxima from %.3f, %d months" % (monthly.getTimeGrid().getStart(), monthly.getSize()))
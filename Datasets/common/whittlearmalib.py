@@ -0,0 +1,198 @@
+#
+# Fit ARMA models with the Whittle approximation of the likelihood.
+#
+# The periodogram I of the centered series is computed once with the
+# FFT at the Fourier frequencies lambda_j = 2 pi j / n. The spectral
+# density of the ARMA(p, q) process
+#
+#     X_t - phi_1 X_{t-1} - ... - phi_p X_{t-p} = e_t + theta_1 e_{t-1} + ... + theta_q e_{t-q}
+#
+# is f = sigma^2 / (2 pi) * g, with g = |theta(exp(-i lambda))|^2 / |phi(exp(-i lambda))|^2.
+# The variance sigma^2 = 2 pi mean(I / g) is profiled out, so that the
+# criterion log(mean(I / g)) + mean(log(g)) only depends on the
+# coefficients. Each evaluation is O(m (p + q)), where m = n / 2 is the
+# number of frequencies, instead of O(n) recursions of the exact
+# likelihood. The coefficients are parametrized by the partial
+# autocorrelations in (-1, 1), so that the fitted process is stationary
+# and invertible.
+#
+# The orders (p, q) of a grid are fitted by a pool of processes and
+# ranked by the AIC or the BIC. The result is an ot.ARMA, with the
+# convention of OpenTURNS: X_t + a_1 X_{t-1} + ... = e_t + b_1 e_{t-1} + ...,
+# i.e. a_i = -phi_i and b_j = theta_j.
+#
+# Reference
+# P. Whittle, "Hypothesis testing in time series analysis", 1951
+# J. F. Monahan, "A note on enforcing stationarity in autoregressive-moving
+# average models", Biometrika, 1984
+#
+
+import openturns as ot
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+def computePeriodogram(x):
+    '''
+    Returns the Fourier frequencies in (0, pi) and the periodogram of
+    the centered series.
+    '''
+    x = np.asarray(x, dtype=float)
+    x = x - x.mean()
+    size = x.size
+    m = (size - 1) // 2
+    frequencies = 2. * np.pi * np.arange(1, m + 1) / size
+    periodogram = np.abs(np.fft.rfft(x)[1:m + 1])**2 / (2. * np.pi * size)
+    return frequencies, periodogram
+
+def convertPartialAutocorrelations(r):
+    '''
+    Returns the coefficients phi of the stationary AR polynomial
+    1 - phi_1 z - ... - phi_p z^p with the partial autocorrelations r
+    (Durbin-Levinson recursion).
+    '''
+    phi = np.zeros(0)
+    for k in range(len(r)):
+        phi = np.concatenate([phi - r[k] * phi[::-1], [r[k]]])
+    return phi
+
+def splitParameters(parameters, p, q):
+    '''
+    Returns phi and theta of the unconstrained parameters: the partial
+    autocorrelations are tanh(parameters).
+    '''
+    r = np.tanh(np.asarray(parameters, dtype=float))
+    phi = convertPartialAutocorrelations(r[:p])
+    # 1 + theta_1 z + ... is invertible if -theta is stationary
+    theta = -convertPartialAutocorrelations(r[p:])
+    return phi, theta
+
+class WhittleCriterion:
+    '''
+    The profiled Whittle criterion of the ARMA(p, q) model, as a
+    function of the unconstrained parameters.
+    '''
+    def __init__(self, frequencies, periodogram, p, q):
+        self.periodogram = periodogram
+        self.p = p
+        self.q = q
+        # exp(-i k lambda_j), for k = 1, ..., max(p, q)
+        self.powers = np.exp(-1j * np.outer(frequencies, np.arange(1, max(p, q) + 1)))
+
+    def computeSpectralShape(self, phi, theta):
+        ar = 1. - self.powers[:, :self.p] @ phi
+        ma = 1. + self.powers[:, :self.q] @ theta
+        return np.abs(ma)**2 / np.abs(ar)**2
+
+    def computeVariance(self, phi, theta):
+        return 2. * np.pi * np.mean(self.periodogram / self.computeSpectralShape(phi, theta))
+
+    def __call__(self, parameters):
+        phi, theta = splitParameters(parameters, self.p, self.q)
+        g = self.computeSpectralShape(phi, theta)
+        return [np.log(np.mean(self.periodogram / g)) + np.mean(np.log(g))]
+
+def fitWhittleOrder(frequencies, periodogram, size, p, q):
+    '''
+    Returns (p, q, phi, theta, sigma2, logLikelihood) of the Whittle
+    estimator of the ARMA(p, q) model.
+    '''
+    criterion = WhittleCriterion(frequencies, periodogram, p, q)
+    parameterNumber = p + q
+    parameters = np.zeros(0)
+    if parameterNumber > 0:
+        function = ot.PythonFunction(parameterNumber, 1, criterion)
+        problem = ot.OptimizationProblem(function)
+        # tanh(6) = 0.99999
+        problem.setBounds(ot.Interval([-6.] * parameterNumber, [6.] * parameterNumber))
+        algorithm = ot.TNC(problem)
+        algorithm.setStartingPoint([0.] * parameterNumber)
+        algorithm.setMaximumEvaluationNumber(1000)
+        algorithm.run()
+        parameters = np.array(algorithm.getResult().getOptimalPoint())
+    phi, theta = splitParameters(parameters, p, q)
+    sigma2 = criterion.computeVariance(phi, theta)
+    # The Whittle log-likelihood, with the sum of log(g) equal to zero
+    logLikelihood = -0.5 * size * (np.log(2. * np.pi * sigma2) + 1.)
+    return p, q, phi, theta, sigma2, logLikelihood
+
+def createARMA(phi, theta, sigma2, timeGrid):
+    '''
+    Returns the ot.ARMA of the coefficients, with gaussian white noise.
+    '''
+    whiteNoise = ot.WhiteNoise(ot.Normal(0., np.sqrt(sigma2)), timeGrid)
+    return ot.ARMA(ot.ARMACoefficients((-phi).tolist()), ot.ARMACoefficients(theta.tolist()), whiteNoise)
+
+class WhittleARMASelection:
+    '''
+    Fit the ARMA(p, q) models for p <= maximumP and q <= maximumQ with
+    the Whittle estimator and rank them by the criterion ("AIC" or "BIC").
+    '''
+    def __init__(self, maximumP, maximumQ, criterion="BIC", workerNumber=1):
+        if criterion not in ["AIC", "BIC"]:
+            raise ValueError("Unknown criterion %s" % (criterion))
+        self.maximumP = maximumP
+        self.maximumQ = maximumQ
+        self.criterion = criterion
+        self.workerNumber = workerNumber
+        self.results = []
+
+    def computeCriterion(self, result, size):
+        p, q, phi, theta, sigma2, logLikelihood = result
+        parameterNumber = p + q + 1
+        if self.criterion == "AIC":
+            return -2. * logLikelihood + 2. * parameterNumber
+        return -2. * logLikelihood + np.log(size) * parameterNumber
+
+    def build(self, timeSeries):
+        '''
+        Returns the best ot.ARMA. The mean of the series is removed.
+        '''
+        x = np.array(timeSeries.getValues()).flatten()
+        size = x.size
+        frequencies, periodogram = computePeriodogram(x)
+        orders = [(p, q) for p in range(self.maximumP + 1) for q in range(self.maximumQ + 1)]
+        arguments = [[frequencies] * len(orders), [periodogram] * len(orders), [size] * len(orders),
+                     [p for p, q in orders], [q for p, q in orders]]
+        if self.workerNumber == 1:
+            results = list(map(fitWhittleOrder, *arguments))
+        else:
+            with ProcessPoolExecutor(self.workerNumber) as executor:
+                results = list(executor.map(fitWhittleOrder, *arguments))
+        self.results = sorted([(self.computeCriterion(result, size), result) for result in results],
+                              key=lambda item: item[0])
+        p, q, phi, theta, sigma2, logLikelihood = self.results[0][1]
+        return createARMA(phi, theta, sigma2, timeSeries.getTimeGrid())
+
+    def getRanking(self):
+        '''
+        Returns the list of (p, q, criterion), sorted by increasing criterion.
+        '''
+        return [(result[0], result[1], value) for value, result in self.results]
+
+if __name__=="__main__":
+    import sys
+    import time
+    sys.path.append("../common")
+    from timeseriesstreamlib import resampleTimeSeries
+    # Validation on a realization of a known ARMA(2, 1)
+    ot.RandomGenerator.SetSeed(0)
+    grid = ot.RegularGrid(0., 1., 50000)
+    reference = ot.ARMA(ot.ARMACoefficients([-0.5, 0.3]), ot.ARMACoefficients([0.4]),
+                        ot.WhiteNoise(ot.Normal(0., 2.), grid))
+    timeSeries = reference.getRealization()
+    algo = WhittleARMASelection(3, 3, "BIC", workerNumber=2)
+    t = time.time()
+    arma = algo.build(timeSeries)
+    print("Synthetic, 16 orders: %.2f (s)" % (time.time() - t))
+    print("    Reference = %s" % (reference))
+    print("    Fitted    = %s" % (arma))
+    print("    Ranking = %s" % ([(p, q) for p, q, value in algo.getRanking()[:3]]))
+    # The 3-hourly relative humidity in Bordeaux, 1999-2019
+    filename = "../climate-weather/Humidite-relative-Bordeaux-1999-2019.csv"
+    humidity = resampleTimeSeries(filename, 3 * 3600, fill="linear")
+    algo = WhittleARMASelection(3, 3, "BIC", workerNumber=2)
+    t = time.time()
+    arma = algo.build(humidity)
+    print("Humidity, %d points, 16 orders: %.2f (s)" % (humidity.getSize(), time.time() - t))
+    print("    Best = %s" % (arma))
+    print("    Ranking = %s" % (["(%d, %d): %.6g" % item for item in algo.getRanking()[:3]]))
@@ -1,35 +1,52 @@
 # -*- coding: utf-8 -*-
 """
 Generate a 2D sample made of a mixture of two bivariate gaussian variables. 
+
+The options set the size of the sample, the master seed, the number of
+processes and the output file (.csv or .npy), e.g. 10^7 rows:
+
+    python gauss-mixture-2D-generate.py --size 10000000 --workers 4 --no-plot
 """
 import openturns as ot
 from openturns import (Graph, Cloud)
 from openturns.viewer import View
+import sys
+sys.path.append("../common")
+from syntheticgeneratorlib import (DistributionGenerator, writeSyntheticDataset, 
+                                   generateSample, parseGeneratorArguments)
+
+def createMixture():
+    # Create a Funky distribution
+    corr = ot.CorrelationMatrix(2)
+    corr[0, 1] = 0.2
+    copula = ot.NormalCopula(corr)
+    x1 = ot.Normal(-1., 1)
+    x2 = ot.Normal(2, 1)
+    x_funk = ot.ComposedDistribution([x1, x2], copula)
+
+    # Create a Punk distribution
+    x1 = ot.Normal(1.,1)
+    x2 = ot.Normal(-2,1)
+    x_punk = ot.ComposedDistribution([x1, x2], copula)
+
+    # Merge the distributions
+    mixture = ot.Mixture([x_funk, x_punk], [0.5,1.])
+    mixture.setDescription(["X0", "X1"])
+    return mixture
+
+if __name__=="__main__":
+    arguments = parseGeneratorArguments(__doc__, "gauss-mixture-2D.csv", 1000)
+    generator = DistributionGenerator(createMixture())
+
+    # Sample from the mixture, by chunks
+    writeSyntheticDataset(arguments.output, generator, arguments.size, 
+                          arguments.chunk_size, arguments.seed, arguments.workers)
 
-# Create a Funky distribution
-corr = ot.CorrelationMatrix(2)
-corr[0, 1] = 0.2
-copula = ot.NormalCopula(corr)
-x1 = ot.Normal(-1., 1)
-x2 = ot.Normal(2, 1)
-x_funk = ot.ComposedDistribution([x1, x2], copula)
-
-# Create a Punk distribution
-x1 = ot.Normal(1.,1)
-x2 = ot.Normal(-2,1)
-x_punk = ot.ComposedDistribution([x1, x2], copula)
-
-# Merge the distributions
-mixture = ot.Mixture([x_funk, x_punk], [0.5,1.])
-
-# Sample from the mixture
-ns = 1000
-sample = mixture.getSample(ns)
-
-# Draw a scatter plot
-graph = Graph("Data", "X1", "X2", True, '')
-cloud = Cloud(sample, 'blue', 'fsquare', 'My Cloud')
-graph.add(cloud)
-View(graph).show()
-
-sample.exportToCSVFile("gauss-mixture-2D.csv")
+    # Draw a scatter plot of the first rows
+    if arguments.plot:
+        ns = min(arguments.size, 10000)
+        sample = generateSample(generator, ns, arguments.chunk_size, arguments.seed)
+        graph = Graph("Data", "X1", "X2", True, '')
+        cloud = Cloud(sample, 'blue', 'fsquare', 'My Cloud')
+        graph.add(cloud)
+        View(graph).show()
@@ -5,37 +5,54 @@ Created on Fri Mar  8 10:19:19 2019
 @author: c61372
 
 Génère un échantillon en dimension 3
+
+Les options fixent la taille de l'échantillon, la graine, le nombre de
+processus et le fichier (.csv ou .npy), par exemple 10^7 lignes :
+
+    python gauss-mixture-3D-generate.py --size 10000000 --workers 4 --no-plot
 """
 
 import openturns as ot
 from openturns.viewer import View
-
-# Create a Funky distribution
-corr = ot.CorrelationMatrix(3)
-corr[0, 1] = 0.2
-corr[1, 2] = -0.3
-copula = ot.NormalCopula(corr)
-x1 = ot.Normal(-1., 1)
-x2 = ot.Normal(2, 1)
-x3 = ot.Normal(-2, 1)
-x_funk = ot.ComposedDistribution([x1, x2, x3], copula)
-
-# Create a Punk distribution
-x1 = ot.Normal(1.,1)
-x2 = ot.Normal(-2,1)
-x3 = ot.Normal(3,1)
-x_punk = ot.ComposedDistribution([x1, x2, x3], copula)
-
-# Merge the distributions
-distribution = ot.Mixture([x_funk, x_punk], [0.5,1.])
-
-# Sample from the mixture
-n = 500
-sample = distribution.getSample(n)
-
-myGraph = ot.Graph('Sample n=%d' % (n), ' ', ' ', True, '')
-myPairs = ot.Pairs(sample, 'Pairs', sample.getDescription(), 'blue', 'bullet')
-myGraph.add(myPairs)
-View(myGraph)
-
-sample.exportToCSVFile("gauss-mixture-3D.csv")
+import sys
+sys.path.append("../common")
+from syntheticgeneratorlib import (DistributionGenerator, writeSyntheticDataset, 
+                                   generateSample, parseGeneratorArguments)
+
+def createMixture():
+    # Create a Funky distribution
+    corr = ot.CorrelationMatrix(3)
+    corr[0, 1] = 0.2
+    corr[1, 2] = -0.3
+    copula = ot.NormalCopula(corr)
+    x1 = ot.Normal(-1., 1)
+    x2 = ot.Normal(2, 1)
+    x3 = ot.Normal(-2, 1)
+    x_funk = ot.ComposedDistribution([x1, x2, x3], copula)
+
+    # Create a Punk distribution
+    x1 = ot.Normal(1.,1)
+    x2 = ot.Normal(-2,1)
+    x3 = ot.Normal(3,1)
+    x_punk = ot.ComposedDistribution([x1, x2, x3], copula)
+
+    # Merge the distributions
+    distribution = ot.Mixture([x_funk, x_punk], [0.5,1.])
+    distribution.setDescription(["X0", "X1", "X2"])
+    return distribution
+
+if __name__=="__main__":
+    arguments = parseGeneratorArguments(__doc__, "gauss-mixture-3D.csv", 500)
+    generator = DistributionGenerator(createMixture())
+
+    # Sample from the mixture, by chunks
+    writeSyntheticDataset(arguments.output, generator, arguments.size, 
+                          arguments.chunk_size, arguments.seed, arguments.workers)
+
+    if arguments.plot:
+        n = min(arguments.size, 10000)
+        sample = generateSample(generator, n, arguments.chunk_size, arguments.seed)
+        myGraph = ot.Graph('Sample n=%d' % (n), ' ', ' ', True, '')
+        myPairs = ot.Pairs(sample, 'Pairs', sample.getDescription(), 'blue', 'bullet')
+        myGraph.add(myPairs)
+        View(myGraph).show()
@@ -0,0 +1,24 @@
+#!/bin/sh
+
+test_python_script()
+{
+  # test_python_script datasetloaderlib.py
+  pythonscript=$1
+  cp $pythonscript /tmp
+  python /tmp/$pythonscript
+}
+
+set -xe
+# Run tests
+cd ..
+# common
+cd common
+test_python_script datasetloaderlib.py
+test_python_script datasetcataloglib.py
+test_python_script timeseriesstreamlib.py
+test_python_script syntheticgeneratorlib.py
+test_python_script marginalfittinglib.py
+test_python_script gaussianmixturelib.py
+test_python_script extremevaluelib.py
+test_python_script whittlearmalib.py
+cd ..
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Objectif :
+Comparer le coût et la précision des méthodes de fiabilité
+(Monte-Carlo, LHS, tirages d'importance, FORM, Subset) sur les
+cas-tests dont la probabilité est connue.
+Les résultats sont sauvegardés dans un fichier CSV, afin de suivre
+le coût par chiffre correct d'une version d'OpenTURNS à l'autre.
+"""
+
+import openturns as ot
+from reliabilitybenchmarklib import (
+        getAllCases, getAllMethods,
+        runBenchmark, exportBenchmark
+)
+
+ot.RandomGenerator.SetSeed(0)
+
+maximumOuterSampling = 1000 # Nombre maximal de blocs
+blockSize = 100 # Taille d'un bloc
+cv = 0.05 # Coefficient de variation cible
+
+rows = []
+for case in getAllCases():
+    for method in getAllMethods():
+        row = runBenchmark(case, method, maximumOuterSampling, blockSize, cv)
+        print("%s, %s: Pf=%.3e (ref.=%.3e), relative error=%.2e, calls=%d, time=%.3f (s)" % (
+            row["case"], row["method"], row["pf"], row["reference"],
+            row["relativeError"], row["calls"], row["time"]))
+        rows.append(row)
+
+exportBenchmark(rows, "reliability-benchmark.csv")
@@ -0,0 +1,213 @@
+#
+# A reliability benchmark based on the use-cases with a known probability.
+#
+# Each case is made of a limit state function, the distribution of its
+# inputs, an event and a reference failure probability (exact or
+# computed with a large Monte-Carlo sample).
+# Each method is run on the event and the number of calls to the
+# limit state function, the wall time and the relative error with
+# respect to the reference probability are recorded.
+#
+
+import openturns as ot
+from math import sqrt, pi, log10
+import time
+import csv
+
+# 1. The cases
+
+def caseRS():
+    # R-S case, see fiabilite-RS/cas-RS.py
+    R = ot.Normal(4., 1.)
+    R.setDescription(["R"])
+    S = ot.Normal(2., 1.)
+    S.setDescription(["S"])
+    g = ot.SymbolicFunction(["R","S"],["R-S"])
+    distribution = ot.ComposedDistribution([R,S])
+    # R-S is normal : the probability is exact
+    muG = R.getMean()[0] - S.getMean()[0]
+    sigmaG = sqrt(R.getStandardDeviation()[0]**2 + S.getStandardDeviation()[0]**2)
+    pfExact = ot.DistFunc.pNormal(-muG/sigmaG)
+    return ["RS", g, distribution, ot.Less(), 0., pfExact]
+
+def caseAxialStressedBeam():
+    # Axial stressed beam, see axial-stressed-beam/axial_stressed_beam.ipynb
+    g = ot.SymbolicFunction(['R', 'F'], ['R-F/(1.e-4 * pi_)'])
+    R = ot.LogNormalMuSigma(3.e6, 3.e5, 0.0).getDistribution()
+    R.setDescription(["R"])
+    F = ot.Normal(750., 50.)
+    F.setDescription(["F"])
+    distribution = ot.ComposedDistribution([R, F])
+    # G is a random mixture : its CDF is exact
+    D = 0.02
+    G = R-F/(D**2/4 * pi)
+    pfExact = G.computeCDF(0.)
+    return ["axial-stressed-beam", g, distribution, ot.Less(), 0., pfExact]
+
+def caseCantileverBeam():
+    # Cantilever beam, see cantilever-beam/cantilever_beam.ipynb
+    def function_beam(X):
+        E, F, L, I = X
+        Y = F* L**3 /  (3 * E * I)
+        return [Y]
+    g = ot.PythonFunction(4, 1, function_beam)
+    dist_E = ot.Beta(0.9, 3.1, 2.8e7, 4.8e7)
+    dist_E.setDescription(["E"])
+    dist_F = ot.ParametrizedDistribution(ot.LogNormalMuSigma(3.0e4, 9.0e3, 15.0e3))
+    dist_F.setDescription(["F"])
+    dist_L = ot.Uniform(250., 260.)
+    dist_L.setDescription(["L"])
+    dist_I = ot.Beta(2.5, 4, 310., 450.)
+    dist_I.setDescription(["I"])
+    distribution = ot.ComposedDistribution([dist_E, dist_F, dist_L, dist_I])
+    # Reference computed by Monte-Carlo with N=10^8
+    pfReference = 1.101e-2
+    return ["cantilever-beam", g, distribution, ot.Greater(), 30., pfReference]
+
+def caseCrue():
+    # Flooding overflow, see crue-propagation/crue-propagation.py
+    def functionCrue(X) :
+        Hd = 3.0
+        Zb = 55.5
+        L = 5.0e3
+        B = 300.0
+        Zd = Zb + Hd
+        Q, Ks, Zv, Zm = X
+        alpha = (Zm - Zv)/L
+        H = (Q/(Ks*B*sqrt(alpha)))**(3.0/5.0)
+        Zc = H + Zv
+        S = Zc - Zd
+        return [S]
+    g = ot.PythonFunction(4, 1, functionCrue)
+    myParam = ot.GumbelAB(1013., 558.)
+    Q = ot.ParametrizedDistribution(myParam)
+    otLOW = ot.TruncatedDistribution.LOWER
+    Q = ot.TruncatedDistribution(Q, 0, otLOW)
+    Ks = ot.Normal(30.0, 7.5)
+    Ks = ot.TruncatedDistribution(Ks, 0, otLOW)
+    Zv = ot.Uniform(49.0, 51.0)
+    Zm = ot.Uniform(54.0, 56.0)
+    distribution = ot.ComposedDistribution([Q, Ks, Zv, Zm])
+    # Reference computed by Monte-Carlo with N=10^8
+    pfReference = 6.39e-4
+    return ["crue", g, distribution, ot.GreaterOrEqual(), 0., pfReference]
+
+def getAllCases():
+    return [caseRS(), caseAxialStressedBeam(), caseCantileverBeam(), caseCrue()]
+
+# 2. The methods
+
+# Number of blocks at each step of the subset algorithm
+subsetOuterSampling = 10
+
+def createEvent(g, distribution, operator, threshold):
+    inputRV = ot.RandomVector(distribution)
+    outputRV = ot.CompositeRandomVector(g, inputRV)
+    event = ot.Event(outputRV, operator, threshold)
+    return event
+
+def runSimulation(event, experiment, maximumOuterSampling, blockSize, cv):
+    algo = ot.ProbabilitySimulationAlgorithm(event, experiment)
+    algo.setMaximumOuterSampling(maximumOuterSampling)
+    algo.setBlockSize(blockSize)
+    algo.setMaximumCoefficientOfVariation(cv)
+    algo.run()
+    pf = algo.getResult().getProbabilityEstimate()
+    return pf
+
+def runMonteCarlo(event, distribution, maximumOuterSampling, blockSize, cv):
+    experiment = ot.MonteCarloExperiment()
+    return runSimulation(event, experiment, maximumOuterSampling, blockSize, cv)
+
+def runLHS(event, distribution, maximumOuterSampling, blockSize, cv):
+    experiment = ot.LHSExperiment()
+    experiment.setAlwaysShuffle(True)
+    return runSimulation(event, experiment, maximumOuterSampling, blockSize, cv)
+
+def computeFORM(event, distribution):
+    solver = ot.Cobyla()
+    algo = ot.FORM(solver, event, distribution.getMean())
+    algo.run()
+    return algo.getResult()
+
+def runFORM(event, distribution, maximumOuterSampling, blockSize, cv):
+    result = computeFORM(event, distribution)
+    pf = result.getEventProbability()
+    return pf
+
+def runImportanceSampling(event, distribution, maximumOuterSampling, blockSize, cv):
+    # Center the importance distribution on the FORM design point,
+    # in the standard space
+    result = computeFORM(event, distribution)
+    designPoint = result.getStandardSpaceDesignPoint()
+    dimension = distribution.getDimension()
+    importanceDistribution = ot.Normal(designPoint, ot.CovarianceMatrix(dimension))
+    experiment = ot.ImportanceSamplingExperiment(importanceDistribution)
+    standardEvent = ot.StandardEvent(event)
+    return runSimulation(standardEvent, experiment, maximumOuterSampling, blockSize, cv)
+
+def runSubset(event, distribution, maximumOuterSampling, blockSize, cv):
+    # The outer sampling is the number of blocks at each step of the
+    # algorithm, not in total
+    algo = ot.SubsetSampling(event)
+    algo.setMaximumOuterSampling(subsetOuterSampling)
+    algo.setBlockSize(blockSize)
+    algo.run()
+    pf = algo.getResult().getProbabilityEstimate()
+    return pf
+
+def getAllMethods():
+    return [["MonteCarlo", runMonteCarlo],
+            ["LHS", runLHS],
+            ["ImportanceSampling", runImportanceSampling],
+            ["FORM", runFORM],
+            ["Subset", runSubset]]
+
+# 3. The benchmark
+
+def runBenchmark(case, method, maximumOuterSampling=1000, blockSize=100, cv=0.05):
+    '''
+    Run a method on a case.
+    Returns a dictionary with the case and method names, the probability,
+    the reference probability, the relative error, the number of calls,
+    the wall time (s) and the number of correct digits.
+    '''
+    caseName, g, distribution, operator, threshold, pfReference = case
+    methodName, runMethod = method
+    event = createEvent(g, distribution, operator, threshold)
+    initialNumberOfCall = g.getEvaluationCallsNumber()
+    t0 = time.time()
+    pf = runMethod(event, distribution, maximumOuterSampling, blockSize, cv)
+    elapsed = time.time() - t0
+    calls = g.getEvaluationCallsNumber() - initialNumberOfCall
+    relativeError = abs(pf - pfReference) / pfReference
+    # Number of correct digits, bounded by the double precision
+    digits = -log10(max(relativeError, 1.e-16))
+    row = {"case": caseName, "method": methodName,
+           "pf": pf, "reference": pfReference,
+           "relativeError": relativeError, "calls": calls,
+           "time": elapsed, "digits": digits,
+           "version": ot.__version__}
+    return row
+
+def exportBenchmark(rows, filename):
+    '''
+    Export the benchmark rows to a CSV file.
+    '''
+    fieldnames = ["case", "method", "pf", "reference", "relativeError",
+                  "calls", "time", "digits", "version"]
+    with open(filename, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    return None
+
+if __name__=="__main__":
+    ot.RandomGenerator.SetSeed(0)
+    case = caseRS()
+    print("Exact Pf = %.6f" % (case[5]))
+    for method in getAllMethods():
+        row = runBenchmark(case, method)
+        print("%s: Pf=%.6f, relative error=%.2e, calls=%d" % (
+            row["method"], row["pf"], row["relativeError"], row["calls"]))
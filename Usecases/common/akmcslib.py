@@ -0,0 +1,210 @@
+#
+# Active learning reliability with kriging and Monte-Carlo (AK-MCS).
+#
+# A gaussian process is fitted on a small design of experiments. Then
+# the failure probability is estimated by Monte-Carlo on a large
+# population of candidate points, with the kriging mean instead of the
+# model. At each iteration, the model is evaluated at the candidate
+# point whose sign is the most uncertain, i.e. which minimizes the
+# learning function
+#
+#     U(x) = |mu(x) - threshold| / sigma(x),
+#
+# where mu and sigma are the kriging mean and standard deviation. The
+# learning stops when min U >= 2, i.e. when the probability of a wrong
+# classification is lower than Phi(-2) for all the candidates. Then, if
+# the coefficient of variation of the Monte-Carlo estimator is too
+# large, the population is enlarged and the learning goes on.
+# The kriging predictions on the population are computed by blocks, so
+# that the memory does not depend on the population size.
+#
+# Reference
+# B. Echard, N. Gayton, M. Lemaire, "AK-MCS: An active learning
+# reliability method combining Kriging and Monte Carlo Simulation",
+# Structural Safety, 2011
+#
+
+import openturns as ot
+import numpy as np
+
+class AKMCSResult:
+    '''
+    The result of the AK-MCS algorithm.
+    '''
+    def __init__(self, probabilityEstimate, candidateSize, callsNumber, krigingResult, inputSample, outputSample):
+        self.probabilityEstimate = probabilityEstimate
+        self.candidateSize = candidateSize
+        self.callsNumber = callsNumber
+        self.krigingResult = krigingResult
+        self.inputSample = inputSample
+        self.outputSample = outputSample
+
+    def getProbabilityEstimate(self):
+        return self.probabilityEstimate
+
+    def getVarianceEstimate(self):
+        pf = self.probabilityEstimate
+        return pf * (1. - pf) / self.candidateSize
+
+    def getCoefficientOfVariation(self):
+        if self.probabilityEstimate == 0.:
+            return np.inf
+        return np.sqrt(self.getVarianceEstimate()) / self.probabilityEstimate
+
+    def getConfidenceLength(self, level=0.95):
+        '''
+        Length of the confidence interval of the Monte-Carlo estimator
+        on the population, assuming that the kriging classification of
+        the candidates is exact.
+        '''
+        quantile = ot.Normal().computeQuantile(0.5 + level / 2.)[0]
+        return 2. * quantile * np.sqrt(self.getVarianceEstimate())
+
+    def getCandidateSize(self):
+        return self.candidateSize
+
+    def getCallsNumber(self):
+        return self.callsNumber
+
+    def getKrigingResult(self):
+        return self.krigingResult
+
+    def getInputSample(self):
+        return self.inputSample
+
+    def getOutputSample(self):
+        return self.outputSample
+
+class AKMCS:
+    '''
+    Estimate the probability of the event model(X) operator threshold,
+    e.g. P(g(X) >= 0) with operator = ot.GreaterOrEqual().
+    The model must have a scalar output.
+    '''
+    def __init__(self, model, distribution, operator, threshold):
+        self.model = model
+        self.distribution = distribution
+        self.operator = operator
+        self.threshold = threshold
+        self.initialDesignSize = 20
+        self.candidateSize = 10**5
+        self.maximumCandidateSize = 10**6
+        self.maximumCallsNumber = 200
+        self.learningThreshold = 2.
+        self.coefficientOfVariation = 0.1
+        self.blockSize = 10**4
+        self.result = None
+
+    def setInitialDesignSize(self, initialDesignSize):
+        self.initialDesignSize = initialDesignSize
+
+    def setCandidateSize(self, candidateSize):
+        '''
+        Set the initial size of the Monte-Carlo population.
+        '''
+        self.candidateSize = candidateSize
+
+    def setMaximumCandidateSize(self, maximumCandidateSize):
+        self.maximumCandidateSize = maximumCandidateSize
+
+    def setMaximumCallsNumber(self, maximumCallsNumber):
+        self.maximumCallsNumber = maximumCallsNumber
+
+    def setLearningThreshold(self, learningThreshold):
+        '''
+        Set the minimum value of U which stops the learning.
+        '''
+        self.learningThreshold = learningThreshold
+
+    def setCoefficientOfVariation(self, coefficientOfVariation):
+        '''
+        Set the maximum coefficient of variation of the Monte-Carlo
+        estimator, which stops the enlargement of the population.
+        '''
+        self.coefficientOfVariation = coefficientOfVariation
+
+    def setBlockSize(self, blockSize):
+        '''
+        Set the number of candidates predicted at once by the kriging.
+        '''
+        self.blockSize = blockSize
+
+    def getResult(self):
+        return self.result
+
+    def buildKriging(self, inputSample, outputSample):
+        dimension = self.distribution.getDimension()
+        scale = list(self.distribution.getStandardDeviation())
+        covarianceModel = ot.SquaredExponential(scale, [1.])
+        basis = ot.ConstantBasisFactory(dimension).build()
+        algo = ot.KrigingAlgorithm(inputSample, outputSample, covarianceModel, basis)
+        algo.run()
+        return algo.getResult()
+
+    def scoreCandidates(self, krigingResult, candidates):
+        '''
+        Returns the kriging mean, minus the threshold, and the learning
+        function U on the candidates, computed by blocks.
+        '''
+        size = candidates.getSize()
+        margin = np.zeros(size)
+        U = np.zeros(size)
+        for start in range(0, size, self.blockSize):
+            block = candidates[start:min(start + self.blockSize, size)]
+            mean = np.array(krigingResult.getConditionalMean(block)).flatten()
+            variance = np.array(krigingResult.getConditionalMarginalVariance(block)).flatten()
+            sigma = np.sqrt(np.maximum(variance, 1.e-300))
+            margin[start:start + block.getSize()] = mean - self.threshold
+            U[start:start + block.getSize()] = np.abs(mean - self.threshold) / sigma
+        return margin, U
+
+    def isFailure(self, margin):
+        # The side of the threshold where the event occurs
+        if self.operator(1., 0.):
+            failure = margin > 0.
+        else:
+            failure = margin < 0.
+        if self.operator(0., 0.):
+            failure = failure | (margin == 0.)
+        return failure
+
+    def run(self):
+        inputSample = ot.LHSExperiment(self.distribution, self.initialDesignSize).generate()
+        outputSample = self.model(inputSample)
+        candidates = self.distribution.getSample(self.candidateSize)
+        while True:
+            krigingResult = self.buildKriging(inputSample, outputSample)
+            margin, U = self.scoreCandidates(krigingResult, candidates)
+            callsNumber = inputSample.getSize()
+            if U.min() < self.learningThreshold and callsNumber < self.maximumCallsNumber:
+                # Learn the most uncertain candidate
+                best = int(np.argmin(U))
+                inputSample.add(candidates[best])
+                outputSample.add(self.model(candidates[best]))
+                continue
+            pf = np.mean(self.isFailure(margin))
+            size = candidates.getSize()
+            cov = np.sqrt((1. - pf) / (pf * size)) if pf > 0. else np.inf
+            if cov <= self.coefficientOfVariation or size >= self.maximumCandidateSize or callsNumber >= self.maximumCallsNumber:
+                break
+            # Enlarge the population
+            newSize = min(self.candidateSize, self.maximumCandidateSize - size)
+            candidates.add(self.distribution.getSample(newSize))
+        self.result = AKMCSResult(pf, candidates.getSize(), inputSample.getSize(), krigingResult, inputSample, outputSample)
+        return None
+
+if __name__=="__main__":
+    # R-S reliability case: exact probability is P(R-S<0)
+    ot.RandomGenerator.SetSeed(0)
+    R = ot.Normal(4., 1.)
+    S = ot.Normal(2., 1.)
+    distribution = ot.ComposedDistribution([R, S])
+    model = ot.SymbolicFunction(["R", "S"], ["R-S"])
+    exact = ot.Normal(2., np.sqrt(2.)).computeCDF(0.)
+    algo = AKMCS(model, distribution, ot.Less(), 0.)
+    algo.setCandidateSize(10**4)
+    algo.run()
+    result = algo.getResult()
+    print("Pf = %.4e, exact = %.4e" % (result.getProbabilityEstimate(), exact))
+    print("Coefficient of variation = %.3f" % (result.getCoefficientOfVariation()))
+    print("Calls = %d, candidates = %d" % (result.getCallsNumber(), result.getCandidateSize()))
@@ -0,0 +1,169 @@
+#
+# Vectorized bootstrap of the pick-freeze estimators of the Sobol' indices.
+#
+# A bootstrap replicate resamples the N rows of the pick-freeze design
+# [A, B, E_1, ..., E_d] with replacement. The estimators only depend on
+# sums over the rows, e.g. sum(yA), sum(yB * yE_i) or
+# sum((yA - yE_i)^2). The sum over the resampled rows is the sum over
+# the rows weighted by the number of times each row has been drawn.
+# Hence, if W is the (R, N) matrix of these counts for R replicates and
+# Z is the (N, K) matrix of the terms of the sums, the R replicates of
+# the K sums are the matrix product W @ Z. The indices of all the
+# replicates are then computed with array operations.
+# The replicates are made by blocks, so that W fits in memory.
+#
+# The estimators are, with V = var(yA):
+# - Saltelli: V_i = cov(yB, yE_i), VT_i = V - cov(yA, yE_i), where the
+#   covariances are centered by the mean of yA,
+# - Jansen: V_i = V - mean((yB - yE_i)^2) / 2, VT_i = mean((yA - yE_i)^2) / 2,
+# - Martinez: S_i = corr(yB, yE_i), ST_i = 1 - corr(yA, yE_i).
+# Martinez is the estimator of ot.MartinezSensitivityAlgorithm. The
+# normalizations of ot.SaltelliSensitivityAlgorithm and
+# ot.JansenSensitivityAlgorithm are slightly different: the estimates
+# differ by O(1/N).
+#
+# The output of the model must be scalar.
+#
+
+import openturns as ot
+import numpy as np
+
+estimatorNames = ["Saltelli", "Jansen", "Martinez"]
+
+def computeIndicesFromSums(sums, size, dimension, estimator):
+    '''
+    Returns the first and total order indices of the (R, K) array of the
+    sums of the terms of getSumTerms, for R replicates.
+    '''
+    d = dimension
+    n = float(size)
+    sumA, sumB, sumA2, sumB2 = sums[:, 0], sums[:, 1], sums[:, 2], sums[:, 3]
+    muA = sumA / n
+    varianceA = (sumA2 - n * muA**2) / (n - 1.)
+    if estimator == "Jansen":
+        sumBE2 = sums[:, 4:4 + d]
+        sumAE2 = sums[:, 4 + d:4 + 2 * d]
+        V = varianceA[:, None]
+        first = (V - sumBE2 / (2. * n)) / V
+        total = sumAE2 / (2. * n) / V
+        return first, total
+    sumE = sums[:, 4:4 + d]
+    sumBE = sums[:, 4 + d:4 + 2 * d]
+    sumAE = sums[:, 4 + 2 * d:4 + 3 * d]
+    if estimator == "Saltelli":
+        m = muA[:, None]
+        V = varianceA[:, None]
+        covarianceBE = (sumBE - m * (sumB[:, None] + sumE) + n * m**2) / (n - 1.)
+        covarianceAE = (sumAE - m * (sumA[:, None] + sumE) + n * m**2) / (n - 1.)
+        return covarianceBE / V, (V - covarianceAE) / V
+    # Martinez
+    sumE2 = sums[:, 4 + 3 * d:4 + 4 * d]
+    muB = sumB / n
+    muE = sumE / n
+    varianceB = sumB2 / n - muB**2
+    varianceE = sumE2 / n - muE**2
+    correlationBE = (sumBE / n - muB[:, None] * muE) / np.sqrt(varianceB[:, None] * varianceE)
+    correlationAE = (sumAE / n - muA[:, None] * muE) / np.sqrt((sumA2 / n - muA**2)[:, None] * varianceE)
+    return correlationBE, 1. - correlationAE
+
+def getSumTerms(outputDesign, size, dimension, estimator):
+    '''
+    Returns the (N, K) matrix of the terms of the sums of the estimator.
+    '''
+    if estimator not in estimatorNames:
+        raise ValueError("Unknown estimator %s" % (estimator))
+    Y = np.array(outputDesign, dtype=float)
+    if Y.ndim == 2 and Y.shape[1] != 1:
+        raise ValueError("The output must be scalar")
+    Y = Y.reshape(dimension + 2, size)
+    yA = Y[0]
+    yB = Y[1]
+    yE = Y[2:].T
+    columns = [yA[:, None], yB[:, None], yA[:, None]**2, yB[:, None]**2]
+    if estimator == "Jansen":
+        columns += [(yB[:, None] - yE)**2, (yA[:, None] - yE)**2]
+    else:
+        columns += [yE, yB[:, None] * yE, yA[:, None] * yE]
+        if estimator == "Martinez":
+            columns.append(yE**2)
+    return np.hstack(columns)
+
+def computeIndices(outputDesign, size, dimension, estimator="Saltelli"):
+    '''
+    Returns the first and total order indices of the output of the
+    pick-freeze design, as arrays.
+    '''
+    Z = getSumTerms(outputDesign, size, dimension, estimator)
+    first, total = computeIndicesFromSums(Z.sum(axis=0)[None, :], size, dimension, estimator)
+    return first[0], total[0]
+
+def computeBootstrapIndices(outputDesign, size, dimension, estimator="Saltelli", bootstrapSize=1000,
+                            seed=0, blockSize=None):
+    '''
+    Returns the (bootstrapSize, d) arrays of the first and total order
+    indices of the bootstrap replicates. The counts of blockSize
+    replicates are in memory at the same time: by default, the block
+    is such that the counts have about 10^7 elements.
+    '''
+    Z = getSumTerms(outputDesign, size, dimension, estimator)
+    if blockSize is None:
+        blockSize = max(1, min(bootstrapSize, 10**7 // size))
+    rng = np.random.default_rng(seed)
+    first = np.empty((bootstrapSize, dimension))
+    total = np.empty((bootstrapSize, dimension))
+    for start in range(0, bootstrapSize, blockSize):
+        replicateNumber = min(blockSize, bootstrapSize - start)
+        indices = rng.integers(size, size=(replicateNumber, size))
+        # The number of times each row is drawn, for each replicate
+        offsets = np.arange(replicateNumber)[:, None] * size
+        W = np.bincount((indices + offsets).ravel(), minlength=replicateNumber * size)
+        W = W.reshape(replicateNumber, size).astype(float)
+        first[start:start + replicateNumber], total[start:start + replicateNumber] = \
+            computeIndicesFromSums(W @ Z, size, dimension, estimator)
+    return first, total
+
+def computeBootstrapIntervals(outputDesign, size, dimension, estimator="Saltelli", bootstrapSize=1000,
+                              level=0.95, seed=0):
+    '''
+    Returns the ot.Interval of the first and total order indices, with
+    the percentiles of the bootstrap replicates, as the
+    getFirstOrderIndicesInterval and getTotalOrderIndicesInterval
+    methods of the sensitivity algorithms.
+    '''
+    first, total = computeBootstrapIndices(outputDesign, size, dimension, estimator, bootstrapSize, seed)
+    intervals = []
+    for replicates in [first, total]:
+        lower = np.percentile(replicates, 100. * (1. - level) / 2., axis=0)
+        upper = np.percentile(replicates, 100. * (1. + level) / 2., axis=0)
+        intervals.append(ot.Interval(lower, upper))
+    return intervals
+
+if __name__=="__main__":
+    import time
+    # The Ishigami function
+    from math import pi
+    ot.RandomGenerator.SetSeed(0)
+    fla = "sin(X1) + 7*sin(X2)^2 + 0.1*X3^4*sin (X1)"
+    g = ot.SymbolicFunction(["X1", "X2", "X3"], [fla])
+    X = ot.ComposedDistribution([ot.Uniform(-pi, pi)] * 3)
+    size = 2000
+    inputDesign = ot.SobolIndicesExperiment(X, size).generate()
+    outputDesign = g(inputDesign)
+    algorithms = {"Saltelli": ot.SaltelliSensitivityAlgorithm, "Jansen": ot.JansenSensitivityAlgorithm,
+                  "Martinez": ot.MartinezSensitivityAlgorithm}
+    for estimator in estimatorNames:
+        algo = algorithms[estimator](inputDesign, outputDesign, size)
+        algo.setBootstrapSize(1000)
+        t = time.time()
+        foInterval = algo.getFirstOrderIndicesInterval()
+        toInterval = algo.getTotalOrderIndicesInterval()
+        otTime = time.time() - t
+        t = time.time()
+        foBootstrap, toBootstrap = computeBootstrapIntervals(outputDesign, size, 3, estimator, 1000)
+        bootstrapTime = time.time() - t
+        first, total = computeIndices(outputDesign, size, 3, estimator)
+        print("%s: OpenTURNS %.2f (s), vectorized %.3f (s)" % (estimator, otTime, bootstrapTime))
+        print("    First order = %s, difference with OpenTURNS = %.1e" % (np.round(first, 4),
+              np.max(np.abs(first - np.array(algo.getFirstOrderIndices())))))
+        print("    First order interval = %s, OpenTURNS = %s" % (foBootstrap, foInterval))
+        print("    Total order interval = %s, OpenTURNS = %s" % (toBootstrap, toInterval))
@@ -0,0 +1,110 @@
+#
+# Sobol' indices from a sparse polynomial chaos expansion.
+#
+# The chaos is fitted on a small design by least squares, with the
+# selection of the polynomials by LARS and the corrected leave-one-out
+# error, as in chute-verticale.py. Since the basis is orthonormal, the
+# variance of the output is the sum of the squared coefficients, except
+# the constant one. The part of the variance of a group of inputs is the
+# sum of the squared coefficients of the polynomials which depend on
+# these inputs. Hence all the indices are read from the coefficients,
+# without any new call to the model.
+#
+# Reference
+# B. Sudret, "Global sensitivity analysis using polynomial chaos
+# expansions", Reliability Engineering & System Safety, 2008
+#
+
+import openturns as ot
+import numpy as np
+
+def fitSparseChaos(distribution, inputSample, outputSample, totalDegree):
+    '''
+    Fit a sparse polynomial chaos of given total degree, with LARS.
+    Returns the ot.FunctionalChaosResult.
+    '''
+    dimension = distribution.getDimension()
+    basis = ot.OrthogonalProductPolynomialFactory([ot.StandardDistributionPolynomialFactory(distribution.getMarginal(i)) for i in range(dimension)])
+    basisSize = basis.getEnumerateFunction().getStrataCumulatedCardinal(totalDegree)
+    adaptiveStrategy = ot.FixedStrategy(basis, basisSize)
+    projectionStrategy = ot.LeastSquaresStrategy(ot.LeastSquaresMetaModelSelectionFactory(ot.LARS(), ot.CorrectedLeaveOneOut()))
+    algo = ot.FunctionalChaosAlgorithm(inputSample, outputSample, distribution, adaptiveStrategy, projectionStrategy)
+    algo.run()
+    return algo.getResult()
+
+def getChaosMultiIndices(chaosResult):
+    '''
+    Returns the array of the multi-indices (the degree of each input)
+    of the selected polynomials, with one row per coefficient.
+    '''
+    enumerateFunction = chaosResult.getOrthogonalBasis().getEnumerateFunction()
+    return np.array([list(enumerateFunction(int(k))) for k in chaosResult.getIndices()], dtype=int)
+
+def computeChaosIndices(chaosResult, marginalIndex=0):
+    '''
+    Returns the first order indices, the total order indices and the
+    matrix of the second order interaction indices (S_ij, without the
+    first order parts) of one output of the chaos.
+    '''
+    multiIndices = getChaosMultiIndices(chaosResult)
+    coefficients = np.array(chaosResult.getCoefficients())[:, marginalIndex]
+    dimension = multiIndices.shape[1]
+    squares = coefficients**2
+    depends = multiIndices > 0
+    interactionOrder = depends.sum(axis=1)
+    variance = squares[interactionOrder > 0].sum()
+    firstOrder = np.zeros(dimension)
+    totalOrder = np.zeros(dimension)
+    secondOrder = np.zeros((dimension, dimension))
+    for i in range(dimension):
+        firstOrder[i] = squares[depends[:, i] & (interactionOrder == 1)].sum() / variance
+        totalOrder[i] = squares[depends[:, i]].sum() / variance
+        for j in range(i + 1, dimension):
+            pair = depends[:, i] & depends[:, j] & (interactionOrder == 2)
+            secondOrder[i, j] = squares[pair].sum() / variance
+            secondOrder[j, i] = secondOrder[i, j]
+    return firstOrder, totalOrder, secondOrder
+
+def computeChaosIndicesConvergence(model, distribution, sampleSizes, totalDegree):
+    '''
+    Fit the chaos on Monte-Carlo designs of increasing sizes, i.e. for
+    an increasing number of calls to the model.
+    Returns the lists of the first order, total order and second order
+    indices, one for each size.
+    '''
+    firstOrderList = []
+    totalOrderList = []
+    secondOrderList = []
+    for size in sampleSizes:
+        inputSample = distribution.getSample(int(size))
+        outputSample = model(inputSample)
+        chaosResult = fitSparseChaos(distribution, inputSample, outputSample, totalDegree)
+        firstOrder, totalOrder, secondOrder = computeChaosIndices(chaosResult)
+        firstOrderList.append(firstOrder)
+        totalOrderList.append(totalOrder)
+        secondOrderList.append(secondOrder)
+    return firstOrderList, totalOrderList, secondOrderList
+
+if __name__=="__main__":
+    # The Ishigami function
+    from math import pi
+    ot.RandomGenerator.SetSeed(0)
+    a = 7.
+    b = 0.1
+    fla = "sin(X1) + 7*sin(X2)^2 + 0.1*X3^4*sin (X1)"
+    g = ot.SymbolicFunction(["X1", "X2", "X3"], [fla])
+    X = ot.ComposedDistribution([ot.Uniform(-pi, pi)] * 3)
+    # Exact indices
+    V1 = 0.5 * (1. + b * pi**4 / 5.)**2
+    V2 = a**2 / 8.
+    V13 = b**2 * pi**8 * (1. / 18. - 1. / 50.)
+    V = V1 + V2 + V13
+    exactFirst = np.array([V1, V2, 0.]) / V
+    exactTotal = np.array([V1 + V13, V2, V13]) / V
+    sampleSizes = [100, 200, 500, 1000]
+    firstOrderList, totalOrderList, secondOrderList = computeChaosIndicesConvergence(g, X, sampleSizes, 10)
+    for k in range(len(sampleSizes)):
+        print("Calls=%d, error first=%.2e, total=%.2e, S13=%.4f (exact %.4f)" % (sampleSizes[k], 
+              np.max(np.abs(firstOrderList[k] - exactFirst)), 
+              np.max(np.abs(totalOrderList[k] - exactTotal)), 
+              secondOrderList[k][0, 2], V13 / V))
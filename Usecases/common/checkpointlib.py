@@ -0,0 +1,201 @@
+#
+# Checkpoint and resume of long simulation loops.
+#
+# The state of the loop (the index of the next iteration, the
+# accumulated sums or samples, and the state of the random generator
+# of OpenTURNS) is saved periodically into a file. If the loop is
+# interrupted, running it again resumes from the last checkpoint: the
+# random generator is restored, so that the remaining iterations use
+# the same random numbers and the result is the same, bit for bit, as
+# without interruption. A checkpoint is only resumed by the same study:
+# the loop is identified by a key, e.g. its parameters, and by the state
+# of the random generator at the start of the loop.
+# The file is written in a temporary file, then renamed, so that an
+# interruption during the write does not corrupt the checkpoint.
+#
+
+import openturns as ot
+import numpy as np
+import hashlib
+import os
+import pickle
+
+def getRandomState():
+    state = ot.RandomGenerator.GetState()
+    return [list(state.getBuffer()), state.getIndex()]
+
+def hashObject(value):
+    '''
+    Returns the SHA-256 hash of the representation of the object.
+    '''
+    return hashlib.sha256(repr(value).encode()).hexdigest()
+
+def setRandomState(randomState):
+    buffer, index = randomState
+    ot.RandomGenerator.SetState(ot.RandomGeneratorState(ot.Indices(buffer), index))
+
+def saveCheckpoint(filename, checkpoint):
+    temporary = filename + ".tmp"
+    with open(temporary, "wb") as f:
+        pickle.dump(checkpoint, f)
+    os.replace(temporary, filename)
+
+def loadCheckpoint(filename, key):
+    '''
+    Returns the checkpoint of the file, or None if there is no file or
+    if the checkpoint was saved by a loop with a different key.
+    '''
+    if not os.path.exists(filename):
+        return None
+    with open(filename, "rb") as f:
+        checkpoint = pickle.load(f)
+    if checkpoint["key"] != key:
+        return None
+    return checkpoint
+
+def runCheckpointedLoop(filename, iterationNumber, state, step, checkpointPeriod=10, key=None):
+    '''
+    Run state = step(i, state) for i = 0, ..., iterationNumber-1, with a
+    checkpoint every checkpointPeriod iterations.
+    The state must be picklable, e.g. a dictionary of arrays.
+    The key identifies the parameters of the loop: a checkpoint with
+    another key, or saved by a loop which started with another state of
+    the random generator, is ignored. The checkpoint file is removed at
+    the end.
+    '''
+    if key is None:
+        key = iterationNumber
+    key = [key, hashObject(getRandomState())]
+    start = 0
+    checkpoint = loadCheckpoint(filename, key)
+    if checkpoint is not None:
+        start = checkpoint["iteration"]
+        state = checkpoint["state"]
+        setRandomState(checkpoint["random"])
+    for i in range(start, iterationNumber):
+        state = step(i, state)
+        if (i + 1) % checkpointPeriod == 0 and i + 1 < iterationNumber:
+            saveCheckpoint(filename, {"key": key, "iteration": i + 1, "state": state, "random": getRandomState()})
+    if os.path.exists(filename):
+        os.remove(filename)
+    return state
+
+class CheckpointedMonteCarlo:
+    '''
+    Monte-Carlo estimate of the probability of the event
+    model(X) operator threshold, by blocks, with checkpoints.
+    The accumulated state is the number of simulations and the number
+    of points in the event.
+    '''
+    def __init__(self, model, distribution, operator, threshold, filename):
+        self.model = model
+        self.distribution = distribution
+        self.operator = operator
+        self.threshold = threshold
+        self.filename = filename
+        self.blockSize = 10000
+        self.checkpointPeriod = 10
+        self.state = None
+
+    def setBlockSize(self, blockSize):
+        self.blockSize = blockSize
+
+    def setCheckpointPeriod(self, checkpointPeriod):
+        '''
+        Set the number of blocks between two checkpoints.
+        '''
+        self.checkpointPeriod = checkpointPeriod
+
+    def simulateBlock(self, i, state):
+        Y = np.array(self.model(self.distribution.getSample(self.blockSize)))[:, 0]
+        # The side of the threshold where the event occurs
+        if self.operator(1., 0.):
+            inEvent = Y > self.threshold
+        else:
+            inEvent = Y < self.threshold
+        if self.operator(0., 0.):
+            inEvent = inEvent | (Y == self.threshold)
+        return {"size": state["size"] + self.blockSize, "count": state["count"] + int(np.sum(inEvent))}
+
+    def run(self, sampleSize):
+        '''
+        Simulate sampleSize points, rounded up to a multiple of the
+        block size.
+        '''
+        blockNumber = -(-sampleSize // self.blockSize)
+        # The identity of the study
+        key = [blockNumber, self.blockSize, self.threshold, hashObject(self.model), 
+               hashObject(self.distribution), self.operator.getClassName()]
+        self.state = runCheckpointedLoop(self.filename, blockNumber, {"size": 0, "count": 0}, self.simulateBlock,
+                                         self.checkpointPeriod, key)
+        return None
+
+    def getProbabilityEstimate(self):
+        return self.state["count"] / self.state["size"]
+
+    def getVarianceEstimate(self):
+        pf = self.getProbabilityEstimate()
+        return pf * (1. - pf) / self.state["size"]
+
+    def getConfidenceLength(self, level=0.95):
+        quantile = ot.Normal().computeQuantile(0.5 + level / 2.)[0]
+        return 2. * quantile * np.sqrt(self.getVarianceEstimate())
+
+class Interruption(Exception):
+    pass
+
+class InterruptedMonteCarlo(CheckpointedMonteCarlo):
+    # Simulate an interruption of the run before the block stopBlock
+    def __init__(self, model, distribution, operator, threshold, filename, stopBlock):
+        super(InterruptedMonteCarlo, self).__init__(model, distribution, operator, threshold, filename)
+        self.stopBlock = stopBlock
+
+    def simulateBlock(self, i, state):
+        if i == self.stopBlock:
+            raise Interruption("Interrupted before the block %d" % (i))
+        return super(InterruptedMonteCarlo, self).simulateBlock(i, state)
+
+if __name__=="__main__":
+    # An interrupted and resumed run gives the same result as a single run
+    import tempfile
+    filename = os.path.join(tempfile.mkdtemp(), "montecarlo.checkpoint")
+    distribution = ot.ComposedDistribution([ot.Normal(4., 1.), ot.Normal(2., 1.)])
+    model = ot.SymbolicFunction(["R", "S"], ["R-S"])
+    ot.RandomGenerator.SetSeed(0)
+    algo = CheckpointedMonteCarlo(model, distribution, ot.Less(), 0., filename)
+    algo.setBlockSize(1000)
+    algo.setCheckpointPeriod(5)
+    algo.run(100000)
+    pfSingle = algo.getProbabilityEstimate()
+    ot.RandomGenerator.SetSeed(0)
+    interrupted = InterruptedMonteCarlo(model, distribution, ot.Less(), 0., filename, 37)
+    interrupted.setBlockSize(1000)
+    interrupted.setCheckpointPeriod(5)
+    try:
+        interrupted.run(100000)
+    except Interruption as exception:
+        print("%s, checkpoint saved = %s" % (exception, os.path.exists(filename)))
+    # A new process, with the same seed: the run is resumed
+    ot.RandomGenerator.SetSeed(0)
+    algo.run(100000)
+    pfResumed = algo.getProbabilityEstimate()
+    print("Pf single run = %.10e, resumed run = %.10e, identical = %s" % (pfSingle, pfResumed, pfSingle == pfResumed))
+    # Another study does not resume the checkpoint: another model, or
+    # another seed
+    for otherModel, seed in [(ot.SymbolicFunction(["R", "S"], ["R-2*S"]), 0), (model, 1234)]:
+        ot.RandomGenerator.SetSeed(0)
+        try:
+            interrupted.run(100000)
+        except Interruption:
+            pass
+        ot.RandomGenerator.SetSeed(seed)
+        otherAlgo = CheckpointedMonteCarlo(otherModel, distribution, ot.Less(), 0., filename)
+        otherAlgo.setBlockSize(1000)
+        otherAlgo.setCheckpointPeriod(5)
+        otherAlgo.run(100000)
+        ot.RandomGenerator.SetSeed(seed)
+        reference = CheckpointedMonteCarlo(otherModel, distribution, ot.Less(), 0., filename + ".reference")
+        reference.setBlockSize(1000)
+        reference.run(100000)
+        print("Other study: Pf = %.10e, without checkpoint = %.10e, identical = %s" % (otherAlgo.getProbabilityEstimate(),
+              reference.getProbabilityEstimate(), otherAlgo.getProbabilityEstimate() == reference.getProbabilityEstimate()))
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for an external flood solver, on the command line.
+
+    python crue-solver.py input.txt output.txt [--delay 0.1] [--fail-first]
+
+Each line of the input file is a point Q Ks Zv Zm. Each line of the
+output file is the height H and the overflow S of the river, with
+Hd = 3, Zb = 55.5, L = 5000 and B = 300, as in crue-propagation.py.
+The delay (s) emulates the computation time of the solver. With
+--fail-first, the first run on a given output file fails, so that
+the retry of the failed runs can be checked.
+"""
+
+import sys
+import os
+import time
+from math import sqrt
+
+def solve(Q, Ks, Zv, Zm):
+    Hd = 3.0
+    Zb = 55.5
+    L = 5.0e3
+    B = 300.0
+    alpha = (Zm - Zv)/L
+    H = (Q/(Ks*B*sqrt(alpha)))**(3.0/5.0)
+    S = H + Zv - (Zb + Hd)
+    return H, S
+
+if __name__=="__main__":
+    arguments = sys.argv[1:]
+    if len(arguments) < 2:
+        print(__doc__)
+        sys.exit(0)
+    inputFile, outputFile = arguments[0], arguments[1]
+    delay = 0.
+    if "--delay" in arguments:
+        delay = float(arguments[arguments.index("--delay") + 1])
+    if "--fail-first" in arguments:
+        marker = outputFile + ".tried"
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            sys.stderr.write("Simulated failure of the solver\n")
+            sys.exit(1)
+    time.sleep(delay)
+    lines = []
+    with open(inputFile) as f:
+        for line in f:
+            if line.strip() == "":
+                continue
+            Q, Ks, Zv, Zm = [float(value) for value in line.split()]
+            H, S = solve(Q, Ks, Zv, Zm)
+            lines.append("%.17g %.17g\n" % (H, S))
+    with open(outputFile, "w") as f:
+        f.writelines(lines)
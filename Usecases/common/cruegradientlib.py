@@ -0,0 +1,124 @@
+#
+# Closed form gradients of the flood models.
+#
+# The height of the river is
+#
+#     H = (Q / (Ks B sqrt(alpha)))^(3/5), with alpha = (Zm - Zv) / L,
+#
+# hence the partial derivatives of H are proportional to H:
+#
+#     dH/dQ = 3/5 H/Q, dH/dKs = -3/5 H/Ks, dH/dB = -3/5 H/B,
+#     dH/dZv = 3/10 H/(Zm-Zv), dH/dZm = -3/10 H/(Zm-Zv), dH/dL = 3/10 H/L.
+#
+# The overflow is S = H + Zv - Zb - Hd. The cost C = CS + CH of the
+# 8 inputs model is piecewise:
+#
+#     CS = 2 - exp(-1000/S^4) if S < 0, else 1,
+#     CH = 8/20 if Hd < 8, else Hd/20,
+#
+# and its gradient is the one of the branch which contains the point,
+# as in the evaluation of the model.
+# The gradients are returned as in ot.PythonFunction, i.e. a matrix
+# with one row for each input and one column for each output.
+#
+
+import openturns as ot
+from math import sqrt, exp, expm1
+
+def functionCrue8I3O(X) :
+    Q, Ks, Zv, Zm, Hd, Zb, L, B = X
+    alpha = (Zm - Zv)/L
+    H = (Q/(Ks*B*sqrt(alpha)))**(3.0/5.0)
+    Zc = H + Zv
+    Zd = Zb + Hd
+    S = Zc - Zd
+    if (S<0):
+        CS = 0.2+0.8-expm1(-1000/S**4)
+    else:
+        CS = 1
+    if (Hd<8):
+        CH = 8./20.
+    else:
+        CH = Hd/20.
+    C=CS+CH
+    return [H,S,C]
+
+def computeHeightGradient(Q, Ks, Zv, Zm, L, B):
+    '''
+    Returns H and its derivatives with respect to Q, Ks, Zv, Zm, L, B.
+    '''
+    alpha = (Zm - Zv)/L
+    H = (Q/(Ks*B*sqrt(alpha)))**(3.0/5.0)
+    dH = [0.6*H/Q, -0.6*H/Ks, 0.3*H/(Zm-Zv), -0.3*H/(Zm-Zv), 0.3*H/L, -0.6*H/B]
+    return H, dH
+
+def gradientCrue8I3O(X) :
+    Q, Ks, Zv, Zm, Hd, Zb, L, B = X
+    H, [dHdQ, dHdKs, dHdZv, dHdZm, dHdL, dHdB] = computeHeightGradient(Q, Ks, Zv, Zm, L, B)
+    S = H + Zv - Zb - Hd
+    # Inputs : Q, Ks, Zv, Zm, Hd, Zb, L, B
+    dH = [dHdQ, dHdKs, dHdZv, dHdZm, 0., 0., dHdL, dHdB]
+    dS = [dHdQ, dHdKs, dHdZv + 1., dHdZm, -1., -1., dHdL, dHdB]
+    if (S<0):
+        dCSdS = -4000./S**5*exp(-1000/S**4)
+    else:
+        dCSdS = 0.
+    dC = [dCSdS*dSi for dSi in dS]
+    if (Hd>=8):
+        dC[4] += 1./20.
+    return [[dH[i], dS[i], dC[i]] for i in range(8)]
+
+def functionCrueH(X) :
+    # The height, with L = 5000 and B = 300, as in crue-4vars-genere-data.py
+    Q, Ks, Zv, Zm = X
+    H, dH = computeHeightGradient(Q, Ks, Zv, Zm, 5.0e3, 300.0)
+    return [H]
+
+def gradientCrueH(X) :
+    Q, Ks, Zv, Zm = X
+    H, dH = computeHeightGradient(Q, Ks, Zv, Zm, 5.0e3, 300.0)
+    return [[dH[i]] for i in range(4)]
+
+def functionCrueS(X) :
+    # The overflow, with Hd = 3, Zb = 55.5, L = 5000 and B = 300,
+    # as in crue-propagation.py
+    Q, Ks, Zv, Zm = X
+    H, dH = computeHeightGradient(Q, Ks, Zv, Zm, 5.0e3, 300.0)
+    S = H + Zv - (55.5 + 3.0)
+    return [S]
+
+def gradientCrueS(X) :
+    Q, Ks, Zv, Zm = X
+    H, dH = computeHeightGradient(Q, Ks, Zv, Zm, 5.0e3, 300.0)
+    return [[dH[0]], [dH[1]], [dH[2] + 1.], [dH[3]]]
+
+def computeGradientError(function, point, step=1.e-5):
+    '''
+    Returns the maximum relative difference between the gradient of
+    the function and the centered finite difference gradient at the
+    point. The step is relative to the absolute value of the inputs.
+    '''
+    evaluation = function.getEvaluation()
+    steps = [step * max(abs(x), 1.) for x in point]
+    finiteDifference = ot.CenteredFiniteDifferenceGradient(steps, evaluation)
+    exact = function.gradient(point)
+    approximate = finiteDifference.gradient(point)
+    error = 0.
+    for i in range(exact.getNbRows()):
+        for j in range(exact.getNbColumns()):
+            scale = max(abs(exact[i, j]), 1.e-8)
+            error = max(error, abs(exact[i, j] - approximate[i, j]) / scale)
+    return error
+
+if __name__=="__main__":
+    functionH = ot.PythonFunction(4, 1, functionCrueH, gradient=gradientCrueH)
+    functionS = ot.PythonFunction(4, 1, functionCrueS, gradient=gradientCrueS)
+    function8I3O = ot.PythonFunction(8, 3, functionCrue8I3O, gradient=gradientCrue8I3O)
+    print("H, gradient error = %.2e" % (computeGradientError(functionH, [1013., 30., 50., 55.])))
+    print("S, gradient error = %.2e" % (computeGradientError(functionS, [1013., 30., 50., 55.])))
+    # Each branch of CS and CH
+    for point in [[1013., 30., 50., 55., 7.5, 55.5, 5000., 300.],
+                  [1013., 30., 50., 55., 8.5, 55.5, 5000., 300.],
+                  [2500., 20., 50., 55., 3., 55.5, 5000., 300.],
+                  [15000., 15., 50., 55., 3., 55.5, 5000., 300.]]:
+        print("H,S,C at %s = %s, gradient error = %.2e" % (point, function8I3O(point), computeGradientError(function8I3O, point)))
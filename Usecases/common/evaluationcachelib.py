@@ -0,0 +1,216 @@
+#
+# Persistent cache of the evaluations of a model, in a SQLite database.
+#
+# The key of an evaluation is the SHA-256 hash of the identifier of the
+# model and of the binary values of the input point. By default, the
+# identifier is a hash of the source code of the Python functions of the
+# model, so that the evaluations of a modified model are not reused.
+# The output point is stored with its key, in a single database file of
+# the cache directory, by default in the temporary directory. Hence the
+# evaluations are kept from one run of a study to the next, unlike
+# ot.MemoizeFunction.
+# The points of a sample are looked up, then the new outputs are
+# inserted, in one transaction each: only the points which are not in
+# the database are evaluated, in one call to the model.
+# Several processes may use the same database: SQLite locks the file
+# during the writes, and an evaluation which is inserted twice is kept
+# once.
+#
+
+import openturns as ot
+import numpy as np
+import hashlib
+import inspect
+import os
+import sqlite3
+import tempfile
+
+# Maximum number of keys in one SELECT query
+queryBlockSize = 500
+
+databaseName = "evaluations.sqlite"
+
+def getDefaultCacheDirectory():
+    return os.path.join(tempfile.gettempdir(), "otusecases-evaluations")
+
+def computeModelIdentifier(functions):
+    '''
+    Returns the SHA-256 hash of the source code of the Python functions.
+    If the source is not available, e.g. for a function defined in an
+    interactive session, the bytecode and the constants are used.
+    The functions called by the functions are not included: they must be
+    in the list if they may change.
+    '''
+    sha = hashlib.sha256()
+    for function in functions:
+        try:
+            code = inspect.getsource(function).encode()
+        except (OSError, TypeError):
+            code = function.__code__.co_code + repr(function.__code__.co_consts).encode()
+        sha.update(code)
+    return sha.hexdigest()
+
+class PersistentCacheFunction(ot.OpenTURNSPythonFunction):
+    '''
+    A function whose evaluations are stored in a SQLite database.
+    The model identifier must change when the model changes. By default,
+    it is computed from the source code of modelFunction, i.e. the
+    Python function (or the list of functions) of the model, e.g. the
+    function of the ot.PythonFunction. For the other models, e.g. an
+    ot.SymbolicFunction, it is computed from the description of the
+    model, which contains its formulas.
+
+    Create the OpenTURNS function with:
+
+        f = ot.Function(PersistentCacheFunction(model, functionCrue))
+    '''
+    def __init__(self, model, modelFunction=None, modelIdentifier=None, cacheDirectory=None, timeout=60.):
+        super(PersistentCacheFunction, self).__init__(model.getInputDimension(), model.getOutputDimension())
+        self.setInputDescription(list(model.getInputDescription()))
+        self.setOutputDescription(list(model.getOutputDescription()))
+        self.model = model
+        if modelIdentifier is None:
+            if modelFunction is not None:
+                if callable(modelFunction):
+                    modelFunction = [modelFunction]
+                modelIdentifier = computeModelIdentifier(modelFunction)
+            elif model.getEvaluation().getImplementation().getClassName() == "PythonEvaluation":
+                raise ValueError("The Python function of the model is required to identify it")
+            else:
+                modelIdentifier = hashlib.sha256(str(model).encode()).hexdigest()
+        if cacheDirectory is None:
+            cacheDirectory = getDefaultCacheDirectory()
+        os.makedirs(cacheDirectory, exist_ok=True)
+        self.databaseFile = os.path.join(cacheDirectory, databaseName)
+        self.modelIdentifier = modelIdentifier
+        self.timeout = timeout
+        self.hitNumber = 0
+        self.missNumber = 0
+        connection = self.connect()
+        try:
+            with connection:
+                connection.execute("CREATE TABLE IF NOT EXISTS evaluations (key TEXT PRIMARY KEY, output BLOB)")
+        finally:
+            connection.close()
+
+    def connect(self):
+        # A new connection for each transaction, so that the function can
+        # be used after a fork
+        connection = sqlite3.connect(self.databaseFile, timeout=self.timeout)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def getDatabaseFile(self):
+        return self.databaseFile
+
+    def getModelIdentifier(self):
+        return self.modelIdentifier
+
+    def getHitNumber(self):
+        '''
+        Returns the number of points read in the database.
+        '''
+        return self.hitNumber
+
+    def getMissNumber(self):
+        '''
+        Returns the number of points evaluated by the model.
+        '''
+        return self.missNumber
+
+    def computeKeys(self, X):
+        prefix = self.modelIdentifier.encode()
+        return [hashlib.sha256(prefix + x.tobytes()).hexdigest() for x in X]
+
+    def lookup(self, keys):
+        '''
+        Returns a dictionary of the outputs in the database, by key.
+        '''
+        outputs = {}
+        connection = self.connect()
+        try:
+            for start in range(0, len(keys), queryBlockSize):
+                block = keys[start:start + queryBlockSize]
+                query = "SELECT key, output FROM evaluations WHERE key IN (%s)" % (",".join(["?"] * len(block)))
+                for key, output in connection.execute(query, block):
+                    outputs[key] = np.frombuffer(output, dtype=np.float64)
+        finally:
+            connection.close()
+        return outputs
+
+    def insert(self, keys, Y):
+        connection = self.connect()
+        try:
+            with connection:
+                connection.executemany("INSERT OR IGNORE INTO evaluations (key, output) VALUES (?, ?)",
+                                       [(keys[i], Y[i].tobytes()) for i in range(len(keys))])
+        finally:
+            connection.close()
+
+    def _exec(self, X):
+        return self._exec_sample([X])[0]
+
+    def _gradient(self, X):
+        # The gradient is not stored
+        return self.model.gradient(X)
+
+    def _exec_sample(self, X):
+        X = np.ascontiguousarray(np.array(X, dtype=np.float64).reshape(-1, self.getInputDimension()))
+        keys = self.computeKeys(X)
+        outputs = self.lookup(keys)
+        # The new points, each one once
+        newKeys = []
+        newIndices = []
+        seen = set(outputs)
+        for i in range(len(keys)):
+            if keys[i] not in seen:
+                seen.add(keys[i])
+                newKeys.append(keys[i])
+                newIndices.append(i)
+        self.hitNumber += len(keys) - len(newKeys)
+        self.missNumber += len(newKeys)
+        if len(newKeys) > 0:
+            newY = np.array(self.model(X[newIndices]), dtype=np.float64)
+            self.insert(newKeys, newY)
+            for k in range(len(newKeys)):
+                outputs[newKeys[k]] = newY[k]
+        return np.array([outputs[key] for key in keys])
+
+def functionCrueModified(X):
+    # functionCrueS, with a different Hd
+    Q, Ks, Zv, Zm = X
+    H, dH = computeHeightGradient(Q, Ks, Zv, Zm, 5.0e3, 300.0)
+    return [H + Zv - (55.5 + 3.5)]
+
+if __name__=="__main__":
+    # The second evaluation only computes the new points
+    import shutil
+    from cruegradientlib import functionCrueS, computeHeightGradient
+    directory = tempfile.mkdtemp()
+    ot.RandomGenerator.SetSeed(0)
+    distribution = ot.ComposedDistribution([ot.Uniform(500., 3000.), ot.Normal(30., 3.), 
+                                            ot.Uniform(49., 51.), ot.Uniform(54., 56.)])
+    inputSample = distribution.getSample(1000)
+    model = ot.PythonFunction(4, 1, functionCrueS)
+    implementation = PersistentCacheFunction(model, [functionCrueS, computeHeightGradient], cacheDirectory=directory)
+    g = ot.Function(implementation)
+    outputSample = g(inputSample)
+    print("First run: hits = %d, misses = %d" % (implementation.getHitNumber(), implementation.getMissNumber()))
+    # A new process would create a new function on the same database
+    inputSample.add(distribution.getSample(100))
+    implementation = PersistentCacheFunction(model, [functionCrueS, computeHeightGradient], cacheDirectory=directory)
+    g = ot.Function(implementation)
+    outputSample = g(inputSample)
+    print("Second run: hits = %d, misses = %d" % (implementation.getHitNumber(), implementation.getMissNumber()))
+    print("Difference = %s" % ((outputSample - model(inputSample)).computeVariance()[0]))
+    # A modified model has another identifier: its outputs are computed
+    modifiedModel = ot.PythonFunction(4, 1, functionCrueModified)
+    implementation = PersistentCacheFunction(modifiedModel, functionCrueModified, cacheDirectory=directory)
+    outputSample = ot.Function(implementation)(inputSample)
+    print("Modified model: hits = %d, misses = %d" % (implementation.getHitNumber(), implementation.getMissNumber()))
+    print("Difference = %s" % ((outputSample - modifiedModel(inputSample)).computeVariance()[0]))
+    # The identifier of a symbolic model is computed from its formula
+    symbolic = ot.SymbolicFunction(["x"], ["x^2"])
+    implementation = PersistentCacheFunction(symbolic, cacheDirectory=directory)
+    print("Symbolic model: identifier = %s..." % (implementation.getModelIdentifier()[:16]))
+    shutil.rmtree(directory)
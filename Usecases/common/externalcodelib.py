@@ -0,0 +1,216 @@
+#
+# Evaluate an external code, launched as concurrent subprocesses.
+#
+# The input sample is split into batches. Each batch is written into an
+# input file, then the command of the code is launched on this file,
+# and the output file is read. The runs are launched concurrently with
+# asyncio, with at most concurrency runs at the same time, so that the
+# throughput is limited by the code and not by the launch of the
+# processes. A run which fails (non zero exit code, missing or wrong
+# output file) or which exceeds the timeout is launched again, up to
+# retryNumber times.
+#
+# The command is a list of arguments, where "{input}" and "{output}" are
+# replaced by the paths of the files, e.g.
+#
+#     [sys.executable, "crue-solver.py", "{input}", "{output}"]
+#
+
+import openturns as ot
+import numpy as np
+import asyncio
+import tempfile
+import shutil
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+class ExternalCodeFunction(ot.OpenTURNSPythonFunction):
+    '''
+    A function evaluated by an external code.
+    The input file has one point per line, the output file one output
+    point per line, with values separated by spaces.
+
+    Create the OpenTURNS function with:
+
+        f = ot.Function(ExternalCodeFunction(command, inputDimension, outputDimension))
+    '''
+    def __init__(self, command, inputDimension, outputDimension, batchSize=10, concurrency=4, timeout=60., retryNumber=2):
+        super(ExternalCodeFunction, self).__init__(inputDimension, outputDimension)
+        self.command = command
+        self.batchSize = batchSize
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retryNumber = retryNumber
+        self.callsNumber = 0
+        self.runNumber = 0
+        self.failureNumber = 0
+
+    def setBatchSize(self, batchSize):
+        self.batchSize = batchSize
+
+    def setConcurrency(self, concurrency):
+        '''
+        Set the maximum number of runs at the same time.
+        '''
+        self.concurrency = concurrency
+
+    def setTimeout(self, timeout):
+        '''
+        Set the maximum duration (s) of a run.
+        '''
+        self.timeout = timeout
+
+    def setRetryNumber(self, retryNumber):
+        self.retryNumber = retryNumber
+
+    def getCallsNumber(self):
+        '''
+        Returns the number of points evaluated by the code.
+        '''
+        return self.callsNumber
+
+    def getRunNumber(self):
+        '''
+        Returns the number of launched runs, including the failed ones.
+        '''
+        return self.runNumber
+
+    def getFailureNumber(self):
+        return self.failureNumber
+
+    async def runBatch(self, batch, directory, semaphore):
+        inputFile = os.path.join(directory, "input.txt")
+        outputFile = os.path.join(directory, "output.txt")
+        np.savetxt(inputFile, batch, fmt="%.17g")
+        arguments = [argument.replace("{input}", inputFile).replace("{output}", outputFile) for argument in self.command]
+        message = ""
+        for attempt in range(self.retryNumber + 1):
+            async with semaphore:
+                self.runNumber += 1
+                if os.path.exists(outputFile):
+                    os.remove(outputFile)
+                process = await asyncio.create_subprocess_exec(*arguments, stdout=asyncio.subprocess.DEVNULL,
+                                                               stderr=asyncio.subprocess.PIPE, cwd=directory)
+                try:
+                    stdout, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+                except asyncio.TimeoutError:
+                    self.failureNumber += 1
+                    message = "timeout after %s (s)" % (self.timeout)
+                    continue
+                finally:
+                    # After a timeout or if the batch is cancelled
+                    if process.returncode is None:
+                        process.kill()
+                        await process.wait()
+            if process.returncode != 0:
+                self.failureNumber += 1
+                message = "exit code %d: %s" % (process.returncode, stderr.decode().strip())
+                continue
+            try:
+                output = np.loadtxt(outputFile, ndmin=2)
+            except (OSError, ValueError) as exception:
+                self.failureNumber += 1
+                message = "cannot read the output: %s" % (exception)
+                continue
+            if output.shape != (len(batch), self.getOutputDimension()):
+                self.failureNumber += 1
+                message = "wrong output shape %s" % (str(output.shape))
+                continue
+            return output
+        raise RuntimeError("The external code failed %d times on the batch, last error: %s" % (self.retryNumber + 1, message))
+
+    async def runAll(self, X):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        rootDirectory = tempfile.mkdtemp(prefix="externalcode-")
+        tasks = []
+        try:
+            for start in range(0, len(X), self.batchSize):
+                directory = os.path.join(rootDirectory, "batch-%d" % (start // self.batchSize))
+                os.mkdir(directory)
+                tasks.append(asyncio.ensure_future(self.runBatch(X[start:start + self.batchSize], directory, semaphore)))
+            outputs = await asyncio.gather(*tasks)
+        finally:
+            # If a batch has failed, the other batches are cancelled and
+            # their processes are killed before the directories are removed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            shutil.rmtree(rootDirectory, ignore_errors=True)
+        return np.vstack(outputs)
+
+    def _exec(self, X):
+        return self._exec_sample([X])[0]
+
+    def _exec_sample(self, X):
+        X = np.array(X, dtype=float).reshape(-1, self.getInputDimension())
+        try:
+            asyncio.get_running_loop()
+            isLoopRunning = True
+        except RuntimeError:
+            isLoopRunning = False
+        if isLoopRunning:
+            # e.g. in a notebook: run the event loop in another thread
+            with ThreadPoolExecutor(1) as executor:
+                Y = executor.submit(asyncio.run, self.runAll(X)).result()
+        else:
+            Y = asyncio.run(self.runAll(X))
+        self.callsNumber += X.shape[0]
+        return Y
+
+if __name__=="__main__":
+    # The flood solver stand-in, with 0.2 (s) for each run
+    import sys
+    import time
+    from cruegradientlib import functionCrueS
+    solver = os.path.abspath(os.path.join("..", "common", "crue-solver.py"))
+    command = [sys.executable, solver, "{input}", "{output}", "--delay", "0.2"]
+    ot.RandomGenerator.SetSeed(0)
+    distribution = ot.ComposedDistribution([ot.Uniform(500., 3000.), ot.Normal(30., 3.), 
+                                            ot.Uniform(49., 51.), ot.Uniform(54., 56.)])
+    inputSample = distribution.getSample(200)
+    reference = ot.PythonFunction(4, 1, functionCrueS)(inputSample)
+    for concurrency in [1, 8]:
+        implementation = ExternalCodeFunction(command, 4, 2, batchSize=10, concurrency=concurrency)
+        f = ot.Function(implementation)
+        t = time.time()
+        outputSample = f(inputSample)
+        difference = np.max(np.abs(np.array(outputSample[:, 1]) - np.array(reference)))
+        print("Concurrency = %d: %.2f (s), %d runs, difference = %.2e" % (concurrency, time.time() - t, implementation.getRunNumber(), difference))
+    # Each batch fails once, then succeeds
+    implementation = ExternalCodeFunction(command + ["--fail-first"], 4, 2, batchSize=50, concurrency=4, retryNumber=1)
+    outputSample = ot.Function(implementation)(inputSample)
+    print("Retry: %d runs, %d failures, %d calls" % (implementation.getRunNumber(), implementation.getFailureNumber(), implementation.getCallsNumber()))
+    # Timeout
+    implementation = ExternalCodeFunction(command, 4, 2, timeout=0.1, retryNumber=1)
+    try:
+        ot.Function(implementation)(inputSample[:10])
+    except Exception as exception:
+        print("Timeout: %d runs, %d failures" % (implementation.getRunNumber(), implementation.getFailureNumber()))
+    # A batch fails while another one is running: the running process is
+    # killed when the evaluation stops
+    script = os.path.join(tempfile.gettempdir(), "externalcode-slow-%d.py" % (os.getpid()))
+    pidFile = script + ".pid"
+    with open(script, "w") as f:
+        f.write("import os, sys, time\n"
+                "if float(open(sys.argv[1]).read().split()[0]) < 0.:\n"
+                "    while not os.path.exists(sys.argv[2]):\n"
+                "        time.sleep(0.01)\n"
+                "    sys.exit(1)\n"
+                "with open(sys.argv[2] + '.tmp', 'w') as f:\n"
+                "    f.write(str(os.getpid()))\n"
+                "os.replace(sys.argv[2] + '.tmp', sys.argv[2])\n"
+                "time.sleep(30.)\n")
+    implementation = ExternalCodeFunction([sys.executable, script, "{input}", pidFile], 1, 1, batchSize=1, retryNumber=0)
+    t = time.time()
+    try:
+        ot.Function(implementation)(ot.Sample([[1.], [-1.]]))
+    except Exception as exception:
+        pid = int(open(pidFile).read())
+        try:
+            os.kill(pid, 0)
+            isAlive = True
+        except ProcessLookupError:
+            isAlive = False
+        print("Failure after %.2f (s), slow process alive: %s" % (time.time() - t, isAlive))
+    os.remove(script)
+    os.remove(pidFile)
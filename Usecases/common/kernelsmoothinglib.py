@@ -0,0 +1,241 @@
+#
+# Binned kernel smoothing.
+#
+# The sample is linearly binned on a regular grid, then the bins are
+# convolved with the gaussian kernel using the FFT.
+# The cost of the fit is O(n + m log(m)), where n is the sample size and
+# m is the number of grid points. Then the PDF and the CDF are evaluated
+# by interpolation on the grid, whatever the sample size.
+# The fitted density is an ot.PythonDistribution, so that it can be
+# drawn with drawPDF and drawCDF as any OpenTURNS distribution.
+#
+# Reference
+# M.P. Wand, "Fast Computation of Multivariate Kernel Estimators",
+# Journal of Computational and Graphical Statistics, 1994
+#
+
+import openturns as ot
+import numpy as np
+from itertools import product
+
+def linearBinning(data, lower, delta, binNumber):
+    '''
+    Distribute the weight of each point on the 2^d nearest grid nodes.
+    Returns the array of grid counts, with shape (binNumber,)*d.
+    '''
+    sampleSize, dimension = data.shape
+    t = (data - lower) / delta
+    index = np.clip(np.floor(t).astype(int), 0, binNumber - 2)
+    w = t - index
+    shape = (binNumber,) * dimension
+    counts = np.zeros(binNumber ** dimension)
+    for corner in product([0, 1], repeat=dimension):
+        corner = np.array(corner)
+        weight = np.prod(np.where(corner == 1, w, 1. - w), axis=1)
+        flatIndex = np.ravel_multi_index(tuple((index + corner).T), shape)
+        counts += np.bincount(flatIndex, weights=weight, minlength=counts.size)
+    return counts.reshape(shape)
+
+def interpolateOnGrid(values, lower, delta, points):
+    '''
+    Multilinear interpolation of the grid values at the given points.
+    The value is zero outside of the grid.
+    '''
+    binNumber = values.shape[0]
+    sampleSize, dimension = points.shape
+    t = (points - lower) / delta
+    inside = np.all((t >= 0.) & (t <= binNumber - 1), axis=1)
+    index = np.clip(np.floor(t).astype(int), 0, binNumber - 2)
+    w = t - index
+    result = np.zeros(sampleSize)
+    for corner in product([0, 1], repeat=dimension):
+        corner = np.array(corner)
+        weight = np.prod(np.where(corner == 1, w, 1. - w), axis=1)
+        result += weight * values[tuple((index + corner).T)]
+    return np.where(inside, result, 0.)
+
+def cumulativeIntegral(values, delta):
+    '''
+    Cumulative integral of the grid values along each axis, with the
+    trapezoidal rule. The integral is zero on the first node.
+    '''
+    for i in range(values.ndim):
+        trapezoids = 0.5 * (np.take(values, range(1, values.shape[i]), axis=i) +
+                            np.take(values, range(values.shape[i] - 1), axis=i)) * delta[i]
+        zeros = np.zeros_like(np.take(values, [0], axis=i))
+        values = np.concatenate([zeros, np.cumsum(trapezoids, axis=i)], axis=i)
+    return values
+
+class BinnedKernelSmoothing:
+    '''
+    Gaussian kernel smoothing of a sample, computed on a regular grid.
+
+    The bandwidth is the Silverman rule of thumb (see the
+    computeSilvermanBandwidth method of ot.KernelSmoothing), unless it
+    is given to the build method.
+    '''
+    def __init__(self, binNumber=512):
+        self.binNumber = binNumber
+
+    def build(self, sample, bandwidth=None):
+        data = np.array(sample)
+        sampleSize, dimension = data.shape
+        if bandwidth is None:
+            bandwidth = ot.KernelSmoothing().computeSilvermanBandwidth(sample)
+        h = np.array(bandwidth)
+        # The grid extends beyond the data, where the kernel is not negligible
+        lower = data.min(axis=0) - 4. * h
+        upper = data.max(axis=0) + 4. * h
+        delta = (upper - lower) / (self.binNumber - 1)
+        counts = linearBinning(data, lower, delta, self.binNumber)
+        # Tensorized kernel on the grid, truncated at 4 bandwidths
+        support = np.minimum(np.ceil(4. * h / delta).astype(int), self.binNumber - 1)
+        kernel = np.ones([1] * dimension)
+        for i in range(dimension):
+            x = np.arange(-support[i], support[i] + 1) * delta[i]
+            k = np.exp(-0.5 * (x / h[i])**2) / (np.sqrt(2. * np.pi) * h[i])
+            shape = [1] * dimension
+            shape[i] = k.size
+            kernel = kernel * k.reshape(shape)
+        # Linear convolution with the FFT, with zero padding
+        fftShape = [self.binNumber + kernel.shape[i] - 1 for i in range(dimension)]
+        axes = list(range(dimension))
+        countsFFT = np.fft.rfftn(counts, fftShape, axes)
+        kernelFFT = np.fft.rfftn(kernel, fftShape, axes)
+        convolution = np.fft.irfftn(countsFFT * kernelFFT, fftShape, axes)
+        window = tuple(slice(support[i], support[i] + self.binNumber) for i in range(dimension))
+        density = np.maximum(convolution[window], 0.) / sampleSize
+        return BinnedKernelDensity(lower, delta, density, h)
+
+class BinnedKernelDensity(ot.PythonDistribution):
+    '''
+    The density estimated by BinnedKernelSmoothing, tabulated on the grid.
+
+    The computePDF and computeCDF methods take either a point, and
+    return a float, or a sample of points, and return an array: the
+    whole sample is evaluated in one call.
+    '''
+    def __init__(self, lower, delta, density, bandwidth):
+        super(BinnedKernelDensity, self).__init__(density.ndim)
+        self.lower = lower
+        self.delta = delta
+        self.density = density
+        self.bandwidth = bandwidth
+        self.cumulative = cumulativeIntegral(density, delta)
+        self.description = ["X%d" % (i) for i in range(density.ndim)]
+
+    def getDimension(self):
+        return self.density.ndim
+
+    def getRange(self):
+        upper = self.lower + (self.density.shape[0] - 1) * self.delta
+        return ot.Interval(self.lower, upper)
+
+    def getDescription(self):
+        return self.description
+
+    def setDescription(self, description):
+        if isinstance(description, str):
+            description = [description]
+        self.description = list(description)
+
+    def evaluateOnGrid(self, values, points, clip):
+        dimension = self.getDimension()
+        isPoint = np.ndim(points) <= 1 and np.size(points) == dimension
+        points = np.array(points, dtype=float).reshape(-1, dimension)
+        if clip:
+            upper = self.lower + (self.density.shape[0] - 1) * self.delta
+            points = np.clip(points, self.lower, upper)
+        result = interpolateOnGrid(values, self.lower, self.delta, points)
+        if isPoint:
+            return result[0]
+        return result
+
+    def computePDF(self, points):
+        '''
+        Evaluate the PDF at a point or at a sample of points.
+        '''
+        return self.evaluateOnGrid(self.density, points, False)
+
+    def computeCDF(self, points):
+        '''
+        Evaluate the CDF at a point or at a sample of points.
+        '''
+        return self.evaluateOnGrid(self.cumulative, points, True)
+
+    def getDistribution(self):
+        '''
+        Returns the density as an ot.Distribution.
+        '''
+        distribution = ot.Distribution(self)
+        distribution.setDescription(self.description)
+        return distribution
+
+    def drawPDF(self, *args):
+        return self.getDistribution().drawPDF(*args)
+
+    def drawCDF(self, *args):
+        return self.getDistribution().drawCDF(*args)
+
+    def computeBinningError(self, sample, checkSize=20):
+        '''
+        Compare the binned PDF with the exact kernel smoothing on
+        checkSize points of the sample.
+        Returns the maximum absolute error, relative to the maximum
+        of the exact PDF.
+        The cost is O(n) for each point.
+        '''
+        sampleSize = sample.getSize()
+        step = max(1, sampleSize // checkSize)
+        points = sample[0:sampleSize:step]
+        exact = ot.KernelSmoothing(ot.Normal(), False, 0, False).build(sample, self.bandwidth)
+        exactPDF = np.array(exact.computePDF(points)).flatten()
+        binnedPDF = self.computePDF(points)
+        return np.max(np.abs(binnedPDF - exactPDF)) / np.max(exactPDF)
+
+    def computeConditionalPDF(self, x, y):
+        '''
+        Evaluate the PDF of the last component at the values x,
+        conditionally to the first components equal to the point y.
+        This is the vectorized version of the method of ot.Distribution:
+        x is a sequence of values, not a single scalar.
+        '''
+        dimension = self.getDimension()
+        x = np.array(x, dtype=float).flatten()
+        y = np.array(y, dtype=float).flatten()
+        points = np.zeros((x.size, dimension))
+        points[:, :dimension - 1] = y
+        points[:, dimension - 1] = x
+        joint = self.computePDF(points)
+        # Marginal density of the first components, integrating the last one
+        marginal = self.density.sum(axis=dimension - 1) * self.delta[dimension - 1]
+        conditioning = interpolateOnGrid(marginal, self.lower[:dimension - 1],
+                                         self.delta[:dimension - 1], y.reshape(1, -1))[0]
+        if conditioning <= 0.:
+            return np.zeros(x.size)
+        return joint / conditioning
+
+if __name__=="__main__":
+    # Compare with the exact kernel smoothing on a bivariate normal sample
+    ot.RandomGenerator.SetSeed(0)
+    R = ot.CorrelationMatrix(2)
+    R[0, 1] = 0.5
+    distribution = ot.Normal([0.] * 2, [1.] * 2, R)
+    sample = distribution.getSample(10000)
+    bandwidth = ot.KernelSmoothing().computeSilvermanBandwidth(sample)
+    exact = ot.KernelSmoothing().build(sample, bandwidth)
+    fitted = BinnedKernelSmoothing().build(sample)
+    x = np.linspace(-2., 2., 5)
+    conditionalPDF = fitted.computeConditionalPDF(x, [0.5])
+    for j in range(x.size):
+        exactPDF = exact.computeConditionalPDF(x[j], [0.5])
+        print("x=%.2f, exact=%.6f, binned=%.6f" % (x[j], exactPDF, conditionalPDF[j]))
+    print("Binning error = %.2e" % (fitted.computeBinningError(sample)))
+    print("CDF at the mean = %.4f" % (fitted.computeCDF([0., 0.])))
+    # Univariate sample
+    sample = ot.Normal().getSample(100000)
+    fitted = BinnedKernelSmoothing().build(sample)
+    fitted.setDescription(["X"])
+    print("Binning error = %.2e" % (fitted.computeBinningError(sample)))
+    print("CDF at 1.96 = %.4f" % (fitted.computeCDF([1.96])))
+    graph = fitted.drawPDF()
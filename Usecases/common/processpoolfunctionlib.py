@@ -0,0 +1,167 @@
+#
+# Evaluate a Python model on a pool of processes.
+#
+# The model is a Python function of a point, as in ot.PythonFunction,
+# e.g. functionCrue. The sample evaluation is split into chunks of
+# consecutive points, which are evaluated by a persistent pool of
+# processes. The outputs are gathered in the order of the input sample.
+# If the model raises an exception on a point, the exception is raised
+# again by the sample evaluation.
+#
+# Each point is evaluated with its own random stream: the base seed of a
+# sample evaluation is drawn from the generator of the main process, and
+# the point i is evaluated after the OpenTURNS generator is seeded with
+# (base + i) modulo 2^32. Hence a stochastic model does not produce the
+# same values in all the workers, and the outputs only depend on the
+# seed of the main process, not on the number of workers nor on the
+# chunk size. The seeds are consecutive rather than hashed as in
+# randomstreamlib: OpenTURNS seeds have 32 bits, so that hashed seeds
+# would repeat within a sample of 1e5 points or more (birthday bound),
+# whereas consecutive seeds are distinct up to 2^32 points. A single
+# point is evaluated in the main process, with the seed of the first
+# point of a sample: f(x) is the same as f(Sample([x]))[0].
+#
+
+import openturns as ot
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# The model, in each worker process
+workerModel = None
+
+def initializeWorker(model):
+    global workerModel
+    workerModel = model
+
+def evaluatePoint(model, x, seed):
+    ot.RandomGenerator.SetSeed(seed % 2**32)
+    return model(x)
+
+def evaluateChunk(chunk, seed, start):
+    return [evaluatePoint(workerModel, chunk[i], seed + start + i) for i in range(len(chunk))]
+
+class ProcessPoolFunction(ot.OpenTURNSPythonFunction):
+    '''
+    A function whose sample evaluation is distributed to a pool of
+    processes. The model must be picklable, e.g. a function defined at
+    the top level of a module.
+
+    Create the OpenTURNS function with:
+
+        f = ot.Function(ProcessPoolFunction(model, inputDimension, outputDimension))
+
+    The pool is created at the first sample evaluation, and is kept
+    until shutdown() is called.
+    '''
+    def __init__(self, model, inputDimension, outputDimension, workerNumber=None, chunkSize=None):
+        super(ProcessPoolFunction, self).__init__(inputDimension, outputDimension)
+        self.model = model
+        if workerNumber is None:
+            workerNumber = os.cpu_count()
+        self.workerNumber = workerNumber
+        self.chunkSize = chunkSize
+        self.executor = None
+        self.callsNumber = 0
+
+    def setWorkerNumber(self, workerNumber):
+        self.shutdown()
+        self.workerNumber = workerNumber
+
+    def setChunkSize(self, chunkSize):
+        '''
+        Set the number of points of each chunk. If None, the sample is
+        split into one chunk for each worker.
+        '''
+        self.chunkSize = chunkSize
+
+    def getCallsNumber(self):
+        '''
+        Returns the number of points evaluated by the model.
+        '''
+        return self.callsNumber
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def _exec(self, X):
+        # As the first point of a sample: the output is the same as
+        # the output of the sample [X] with the same generator state
+        seed = int(ot.RandomGenerator.IntegerGenerate(1, 2**31)[0])
+        state = ot.RandomGenerator.GetState()
+        try:
+            Y = evaluatePoint(self.model, X, seed)
+        finally:
+            ot.RandomGenerator.SetState(state)
+        self.callsNumber += 1
+        return Y
+
+    def _exec_sample(self, X):
+        size = len(X)
+        X = [list(x) for x in X]
+        chunkSize = self.chunkSize
+        if chunkSize is None:
+            chunkSize = max(1, -(-size // self.workerNumber))
+        chunks = [X[start:start + chunkSize] for start in range(0, size, chunkSize)]
+        seed = int(ot.RandomGenerator.IntegerGenerate(1, 2**31)[0])
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workerNumber, initializer=initializeWorker,
+                                                initargs=(self.model,))
+        futures = [self.executor.submit(evaluateChunk, chunks[k], seed, k * chunkSize)
+                   for k in range(len(chunks))]
+        Y = []
+        for future in futures:
+            Y += future.result()
+        self.callsNumber += size
+        return Y
+
+def functionNoisy(X):
+    # A stochastic model
+    return [X[0] + ot.Normal().getRealization()[0]]
+
+def functionFailure(X):
+    if X[0] < 0.:
+        raise ValueError("Negative input %s" % (X[0]))
+    return X
+
+if __name__=="__main__":
+    from cruegradientlib import functionCrueS
+    # The outputs are identical to the serial evaluation, in the same order
+    ot.RandomGenerator.SetSeed(0)
+    distribution = ot.ComposedDistribution([ot.Uniform(500., 3000.), ot.Normal(30., 3.), 
+                                            ot.Uniform(49., 51.), ot.Uniform(54., 56.)])
+    inputSample = distribution.getSample(1000)
+    serial = ot.PythonFunction(4, 1, functionCrueS)
+    implementation = ProcessPoolFunction(functionCrueS, 4, 1, workerNumber=4, chunkSize=64)
+    parallel = ot.Function(implementation)
+    difference = (serial(inputSample) - parallel(inputSample)).computeVariance()[0]
+    print("Difference = %s" % (difference))
+    print("Calls = %d, OpenTURNS calls = %d" % (implementation.getCallsNumber(), parallel.getEvaluationCallsNumber()))
+    # A stochastic model: the outputs do not depend on the number of
+    # workers nor on the chunk size
+    outputs = []
+    for workerNumber, chunkSize in [(1, None), (2, 7), (4, None)]:
+        ot.RandomGenerator.SetSeed(0)
+        noisyImplementation = ProcessPoolFunction(functionNoisy, 1, 1, workerNumber, chunkSize)
+        outputs.append(ot.Function(noisyImplementation)(ot.Sample(100, 1)))
+        noisyImplementation.shutdown()
+    print("Stochastic model, identical outputs: %s" % (outputs[0] == outputs[1] and outputs[0] == outputs[2]))
+    # A point is evaluated as a sample of size 1
+    noisyImplementation = ProcessPoolFunction(functionNoisy, 1, 1, workerNumber=2)
+    noisy = ot.Function(noisyImplementation)
+    ot.RandomGenerator.SetSeed(0)
+    pointOutput = noisy([1.])
+    ot.RandomGenerator.SetSeed(0)
+    sampleOutput = noisy(ot.Sample([[1.]]))[0]
+    print("Point and sample of size 1, identical outputs: %s" % (pointOutput == sampleOutput))
+    noisyImplementation.shutdown()
+    # The exception of a worker is raised in the main process
+    failingImplementation = ProcessPoolFunction(functionFailure, 1, 1, workerNumber=2)
+    failing = ot.Function(failingImplementation)
+    try:
+        failing(ot.Sample([[1.], [-1.]]))
+    except Exception as exception:
+        print("Exception: %s" % (exception))
+    implementation.shutdown()
+    failingImplementation.shutdown()
@@ -0,0 +1,136 @@
+#
+# Independent random streams derived from a master seed.
+#
+# A stream is identified by a key, a tuple of non-negative integers, e.g.
+# (chunk,) or (replication, chunk). Its seed is derived from the master
+# seed and the key only, with the spawn keys of np.random.SeedSequence,
+# which hashes them so that the streams of different keys are
+# independent. Hence, the random numbers of a chunk or of a replication
+# do not depend on the process which computes it, nor on the order in
+# which the chunks are computed: a parallel study gives the same results
+# whatever the number of workers, as long as the keys are attached to the
+# work (the chunk, the replication) and not to the worker.
+#
+# The streams are used by:
+# - the OpenTURNS distributions: the global ot.RandomGenerator is seeded
+#   with the stream, e.g. by useStream, which restores the previous state
+#   at the end. OpenTURNS seeds have 32 bits: k hashed seeds contain
+#   about k^2 / 2^33 pairs of equal seeds, e.g. 0.01 for 10^4 streams
+#   but about 1 for 10^5 streams. For a large number of streams, e.g.
+#   one per point of a large sample, use consecutive seeds instead, as
+#   in processpoolfunctionlib.
+# - numpy: getGenerator returns a counter-based Philox generator, seeded
+#   with the 128 bits of the stream.
+#
+
+import openturns as ot
+import numpy as np
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+class RandomStreams:
+    '''
+    The random streams of a master seed. The key of a stream is an
+    integer or a tuple of integers.
+    '''
+    def __init__(self, seed=0, spawnKey=()):
+        self.seed = seed
+        self.spawnKey = tuple(spawnKey)
+
+    def getSeedSequence(self, key):
+        if np.isscalar(key):
+            key = (key,)
+        return np.random.SeedSequence(self.seed, spawn_key=self.spawnKey + tuple(int(k) for k in key))
+
+    def getSeed(self, key):
+        '''
+        Returns the OpenTURNS seed of the stream.
+        '''
+        return int(self.getSeedSequence(key).generate_state(1)[0])
+
+    def getGenerator(self, key):
+        '''
+        Returns the numpy generator of the stream.
+        '''
+        return np.random.Generator(np.random.Philox(self.getSeedSequence(key)))
+
+    def spawn(self, key):
+        '''
+        Returns the streams whose keys are prefixed by key, e.g. the
+        streams of the chunks of a replication.
+        '''
+        if np.isscalar(key):
+            key = (key,)
+        return RandomStreams(self.seed, self.spawnKey + tuple(int(k) for k in key))
+
+    def setStream(self, key):
+        '''
+        Seed the OpenTURNS generator with the stream.
+        '''
+        ot.RandomGenerator.SetSeed(self.getSeed(key))
+
+    @contextmanager
+    def useStream(self, key):
+        '''
+        The OpenTURNS generator uses the stream in the block:
+
+            with streams.useStream(k):
+                sample = distribution.getSample(size)
+
+        The state of the generator is restored at the end of the block.
+        '''
+        state = ot.RandomGenerator.GetState()
+        self.setStream(key)
+        try:
+            yield
+        finally:
+            ot.RandomGenerator.SetState(state)
+
+    def getSample(self, distribution, size, key):
+        '''
+        Returns a sample of the distribution, generated with the stream.
+        '''
+        with self.useStream(key):
+            return distribution.getSample(size)
+
+def runReplication(function, streams, replication):
+    streams.setStream(replication)
+    return function(replication)
+
+def runReplications(function, replicationNumber, streams, workerNumber=1):
+    '''
+    Returns the list of function(r) for r = 0, ..., replicationNumber - 1,
+    where the OpenTURNS generator uses the stream r. The function must be
+    picklable if workerNumber > 1. The results do not depend on the
+    number of processes.
+    '''
+    arguments = [[function] * replicationNumber, [streams] * replicationNumber, range(replicationNumber)]
+    if workerNumber == 1:
+        state = ot.RandomGenerator.GetState()
+        results = list(map(runReplication, *arguments))
+        ot.RandomGenerator.SetState(state)
+        return results
+    with ProcessPoolExecutor(workerNumber) as executor:
+        return list(executor.map(runReplication, *arguments))
+
+def estimateMeanCrue(replication):
+    # The Monte-Carlo estimate of the mean overflow
+    from cruegradientlib import functionCrueS
+    distribution = ot.ComposedDistribution([ot.Uniform(500., 3000.), ot.Normal(30., 3.),
+                                            ot.Uniform(49., 51.), ot.Uniform(54., 56.)])
+    sample = distribution.getSample(1000)
+    return ot.PythonFunction(4, 1, functionCrueS)(sample).computeMean()[0]
+
+if __name__=="__main__":
+    streams = RandomStreams(1234)
+    # The same stream gives the same sample, the other streams are different
+    normal = ot.Normal()
+    print("Stream 0 = %s" % (streams.getSample(normal, 3, 0).asPoint()))
+    print("Stream 0 = %s" % (streams.getSample(normal, 3, 0).asPoint()))
+    print("Stream 1 = %s" % (streams.getSample(normal, 3, 1).asPoint()))
+    print("Stream (1, 0) = %s" % (streams.spawn(1).getSample(normal, 3, 0).asPoint()))
+    print("Numpy stream 0 = %s" % (streams.getGenerator(0).normal(size=3)))
+    # A parallel study: the results are identical with 1 and 4 workers
+    results = [runReplications(estimateMeanCrue, 20, streams, workerNumber) for workerNumber in [1, 4]]
+    print("Replications = %s" % (np.round(results[0][:4], 6)))
+    print("Identical with 1 and 4 workers: %s" % (results[0] == results[1]))
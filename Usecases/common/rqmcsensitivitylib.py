@@ -0,0 +1,113 @@
+#
+# Randomized quasi-Monte Carlo pick-freeze design for Sobol' indices.
+#
+# The matrices A and B of the pick-freeze design are the first and last
+# d columns of a Sobol' sequence of dimension 2d. The sequence is
+# randomized by a random digital shift: each point is XOR-ed, bit by
+# bit, with the same uniform random point. This keeps the net properties
+# of the sequence, and each randomized point is uniform on the unit cube.
+# Hence the estimators of the indices converge at a rate close to 1/N on
+# smooth models, instead of 1/sqrt(N).
+#
+# Independent replicates of the design (i.e. independent shifts) give
+# a confidence interval of the indices.
+#
+# Reference
+# Art B. Owen, "Monte Carlo Theory, Methods and Examples", Chapter 17,
+# "Randomized quasi-Monte Carlo", 2013
+#
+
+import openturns as ot
+import numpy as np
+
+# Number of bits of the digital shift
+bitNumber = 52
+
+class RandomizedSobolIndicesExperiment:
+    '''
+    Generate the pick-freeze design [A, B, E_1, ..., E_d], where E_i is A
+    with its column i taken from B, as ot.SobolIndicesExperiment, from a
+    randomly shifted Sobol' sequence.
+    The distribution must have an independent copula.
+    The size should be a power of 2.
+    '''
+    def __init__(self, distribution, size):
+        if not distribution.hasIndependentCopula():
+            raise ValueError("The distribution must have an independent copula")
+        self.distribution = distribution
+        self.size = size
+        dimension = distribution.getDimension()
+        sequence = ot.SobolSequence(2 * dimension)
+        points = np.array(sequence.generate(size))
+        self.integerPoints = np.floor(points * 2.**bitNumber).astype(np.uint64)
+        marginals = [distribution.getMarginal(i) for i in range(dimension)]
+        self.transformation = ot.MarginalTransformationEvaluation(
+            [ot.Uniform(0., 1.)] * (2 * dimension), marginals * 2)
+
+    def generate(self):
+        '''
+        Generate a new replicate of the design, with a new random shift.
+        '''
+        dimension = self.distribution.getDimension()
+        shift = np.array(ot.RandomGenerator.Generate(2 * dimension))
+        integerShift = np.floor(shift * 2.**bitNumber).astype(np.uint64)
+        # Shift to the center of the dyadic cell to avoid 0
+        U = (np.bitwise_xor(self.integerPoints, integerShift) + 0.5) / 2.**bitNumber
+        # Map the uniform points to the marginals
+        X = np.array(self.transformation(U))
+        A = X[:, :dimension]
+        B = X[:, dimension:]
+        blocks = [A, B]
+        for i in range(dimension):
+            E = A.copy()
+            E[:, i] = B[:, i]
+            blocks.append(E)
+        inputDesign = ot.Sample(np.vstack(blocks))
+        inputDesign.setDescription(self.distribution.getDescription())
+        return inputDesign
+
+def computeReplicatedIndices(algorithmClass, distribution, model, size, replicateNumber, level=0.95):
+    '''
+    Estimate the first and total order indices on replicateNumber
+    independent replicates of the randomized design.
+    algorithmClass is one of the pick-freeze estimators, e.g.
+    ot.SaltelliSensitivityAlgorithm, ot.MartinezSensitivityAlgorithm,
+    ot.JansenSensitivityAlgorithm or ot.MauntzKucherenkoSensitivityAlgorithm.
+    Returns the mean of the replicates and the Student confidence interval
+    of this mean, for the first and total order indices.
+    The number of calls to the model is replicateNumber * size * (d+2).
+    '''
+    experiment = RandomizedSobolIndicesExperiment(distribution, size)
+    dimension = distribution.getDimension()
+    firstOrder = ot.Sample(replicateNumber, dimension)
+    totalOrder = ot.Sample(replicateNumber, dimension)
+    for r in range(replicateNumber):
+        inputDesign = experiment.generate()
+        outputDesign = model(inputDesign)
+        algo = algorithmClass(inputDesign, outputDesign, size)
+        firstOrder[r] = algo.getFirstOrderIndices()
+        totalOrder[r] = algo.getTotalOrderIndices()
+    quantile = ot.Student(replicateNumber - 1).computeQuantile(0.5 + level / 2.)[0]
+    results = []
+    for sample in [firstOrder, totalOrder]:
+        data = np.array(sample)
+        mean = data.mean(axis=0)
+        halfLength = data.std(axis=0, ddof=1) * quantile / np.sqrt(replicateNumber)
+        results += [ot.Point(mean), ot.Interval(mean - halfLength, mean + halfLength)]
+    return results
+
+if __name__=="__main__":
+    # The Ishigami function
+    from math import pi
+    ot.RandomGenerator.SetSeed(0)
+    fla = "sin(X1) + 7*sin(X2)^2 + 0.1*X3^4*sin (X1)"
+    g = ot.SymbolicFunction(["X1", "X2", "X3"], [fla])
+    X = ot.ComposedDistribution([ot.Uniform(-pi, pi)] * 3)
+    size = 2**10
+    replicateNumber = 10
+    fo, foInterval, to, toInterval = computeReplicatedIndices(
+        ot.SaltelliSensitivityAlgorithm, X, g, size, replicateNumber)
+    print("First order = %s" % (fo))
+    print("First order interval = %s" % (foInterval))
+    print("Total order = %s" % (to))
+    print("Total order interval = %s" % (toInterval))
@@ -0,0 +1,89 @@
+#
+# Vectorized estimation of the second order Sobol' indices.
+#
+# The design is the one of ot.SobolIndicesExperiment(X, N, True):
+#
+#     [A, B, E_1, ..., E_d, C_1, ..., C_d],
+#
+# where E_i is A with its column i taken from B and C_j is B with its
+# column j taken from A. The points of E_i and C_j share the inputs i
+# and j (and only these ones, if i != j), so that
+#
+#     V_ij^closed = E(Y_Ei Y_Cj) - E(Y)^2
+#
+# is the closed variance of the group {i, j}. All the pairs are reused
+# from the same N(2d+2) outputs: the matrix of all the E(Y_Ei Y_Cj) is
+# a single matrix product, instead of a loop over the d(d-1)/2 pairs.
+# The first order indices are estimated with the Saltelli estimator:
+#
+#     V_i = E(Y_B Y_Ei) - E(Y_A) E(Y_B).
+#
+# Reference
+# A. Saltelli, "Making best use of model evaluations to compute
+# sensitivity indices", Computer Physics Communications, 2002
+#
+
+import numpy as np
+
+def splitSecondOrderDesign(outputDesign, size, dimension):
+    '''
+    Returns the outputs on A, B, E (N x d) and C (N x d) of the design.
+    '''
+    Y = np.array(outputDesign)[:, 0]
+    if dimension == 2 and Y.size == 4 * size:
+        # In dimension 2, C_1 = E_2 and C_2 = E_1 are not repeated
+        blocks = Y.reshape(4, size)
+        return blocks[0], blocks[1], blocks[2:].T, blocks[:1:-1].T
+    if Y.size != size * (2 * dimension + 2):
+        raise ValueError("The output design must have size N(2d+2), got %d" % (Y.size))
+    blocks = Y.reshape(2 * dimension + 2, size)
+    YA = blocks[0]
+    YB = blocks[1]
+    YE = blocks[2:dimension + 2].T
+    YC = blocks[dimension + 2:].T
+    return YA, YB, YE, YC
+
+def computeSecondOrderIndices(outputDesign, size, dimension):
+    '''
+    Estimate the first order indices and the matrix of the second
+    order indices S_ij (the interaction only, without S_i and S_j)
+    from the outputs of ot.SobolIndicesExperiment(X, size, True).
+    The diagonal of the matrix is zero.
+    The cost is O(N d^2) in a single matrix product.
+    '''
+    YA, YB, YE, YC = splitSecondOrderDesign(outputDesign, size, dimension)
+    # Center the outputs, for the accuracy of the products
+    mean = np.mean(np.concatenate([YA, YB]))
+    YA = YA - mean
+    YB = YB - mean
+    YE = YE - mean
+    YC = YC - mean
+    variance = np.mean(np.concatenate([YA, YB])**2)
+    meanProduct = np.mean(YA) * np.mean(YB)
+    firstOrder = (YB @ YE / size - meanProduct) / variance
+    closedSecondOrder = (YE.T @ YC / size - meanProduct) / variance
+    secondOrder = closedSecondOrder - firstOrder[:, np.newaxis] - firstOrder[np.newaxis, :]
+    np.fill_diagonal(secondOrder, 0.)
+    # The matrix is estimated twice, from (E_i, C_j) and (E_j, C_i)
+    secondOrder = 0.5 * (secondOrder + secondOrder.T)
+    return firstOrder, secondOrder
+
+if __name__=="__main__":
+    # The Ishigami function: the only interaction is S13
+    import openturns as ot
+    from math import pi
+    ot.RandomGenerator.SetSeed(0)
+    fla = "sin(X1) + 7*sin(X2)^2 + 0.1*X3^4*sin (X1)"
+    g = ot.SymbolicFunction(["X1", "X2", "X3"], [fla])
+    X = ot.ComposedDistribution([ot.Uniform(-pi, pi)] * 3)
+    size = 10000
+    inputDesign = ot.SobolIndicesExperiment(X, size, True).generate()
+    outputDesign = g(inputDesign)
+    firstOrder, secondOrder = computeSecondOrderIndices(outputDesign, size, 3)
+    b = 0.1
+    V = 0.5 * (1. + b * pi**4 / 5.)**2 + 49. / 8. + b**2 * pi**8 * (1. / 18. - 1. / 50.)
+    print("First order = %s" % (firstOrder))
+    print("S13 = %.4f, exact = %.4f" % (secondOrder[0, 2], b**2 * pi**8 * (1. / 18. - 1. / 50.) / V))
+    print("Second order =\n%s" % (secondOrder))
+    algo = ot.SaltelliSensitivityAlgorithm(inputDesign, outputDesign, size)
+    print("OpenTURNS second order =\n%s" % (algo.getSecondOrderIndices()))
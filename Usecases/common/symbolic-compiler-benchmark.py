@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Objectif :
+Comparer le débit (nombre de points évalués par seconde) des
+SymbolicFunction des cas-tests et de leur version compilée en
+noyaux vectorisés NumPy (ou numexpr, s'il est installé).
+"""
+
+import openturns as ot
+import numpy as np
+import time
+from symboliccompilerlib import (
+        compileSymbolicFunction, computeCompiledError
+)
+
+# Les cas-tests : nom, variables, formule, distribution des entrées
+myParam = ot.GumbelAB(1013., 558.)
+Q = ot.TruncatedDistribution(ot.ParametrizedDistribution(myParam), 0, ot.TruncatedDistribution.LOWER)
+Ks = ot.TruncatedDistribution(ot.Normal(30.0, 7.5), 0, ot.TruncatedDistribution.LOWER)
+crueDistribution = ot.ComposedDistribution([Q, Ks, ot.Uniform(49.0, 51.0), ot.Uniform(54.0, 56.0),
+                                            ot.Uniform(7., 9.), ot.Triangular(55.0, 55.5, 56.0),
+                                            ot.Triangular(4990, 5000., 5010.), ot.Triangular(295., 300., 305.)])
+tubeDistribution = ot.ComposedDistribution([ot.Normal(1,0.1), ot.Normal(1.5,0.01), ot.Uniform(0.7,1.2),
+                                            ot.Triangular(0.75,0.8,0.85), ot.Triangular(0.09,0.1,0.11),
+                                            ot.Normal(200000,2000)])
+cases = [
+    ["crue", ['Q','Ks','Zv','Zm','Hd','Zb','L','B'],
+     '(Q/(Ks*B*sqrt((Zm-Zv)/L)))^(3.0/5.0)+Zv-Zb-Hd', crueDistribution],
+    ["fleche-tube", ["F","L","a","De","di","E"],
+     "-F*a^2*(L-a)^2/(3*E*L*pi_*(De^4-di^4)/32)", tubeDistribution],
+    ["ishigami", ["X1", "X2", "X3"],
+     "sin(X1) + 7*sin(X2)^2 + 0.1*X3^4*sin (X1)", ot.ComposedDistribution([ot.Uniform(-np.pi, np.pi)] * 3)],
+    ["perrin", ["X1","X2","X3"],
+     "X1*(X2-X1)+X3", ot.ComposedDistribution([ot.Normal(0.1,1), ot.Normal(1,2), ot.Normal(2,0.2)])],
+    ["produit", ["X1","X2"],
+     "X1*X2", ot.ComposedDistribution([ot.Normal(0.,10.), ot.Uniform(-1.,1.)])],
+    ["RS", ["R","S"],
+     "R-S", ot.ComposedDistribution([ot.Normal(4., 1.), ot.Normal(2., 1.)])]]
+
+# Tailles d'échantillon : 10^7 et 10^8 points demandent
+# respectivement 0.6 Go et 6 Go de mémoire par échantillon de dimension 8
+sampleSizes = [10**4, 10**5, 10**6]
+# L'échantillon est obtenu en répétant un échantillon de base :
+# le temps d'évaluation ne dépend pas des valeurs
+baseSize = 10**4
+
+for name, inputVariables, formula, distribution in cases:
+    g = ot.SymbolicFunction(inputVariables, [formula])
+    compiled = compileSymbolicFunction(g)
+    baseSample = distribution.getSample(baseSize)
+    error = computeCompiledError(g, compiled, baseSample)
+    print("%s, maximum error = %.2e" % (name, error))
+    for size in sampleSizes:
+        inputSample = ot.Sample(np.tile(np.array(baseSample), (size // baseSize, 1)))
+        t0 = time.time()
+        g(inputSample)
+        timeSymbolic = time.time() - t0
+        t0 = time.time()
+        compiled(inputSample)
+        timeCompiled = time.time() - t0
+        print("    N=%d, symbolic=%.2e (points/s), compiled=%.2e (points/s), speedup=%.1f" % (
+            size, size / timeSymbolic, size / timeCompiled, timeSymbolic / timeCompiled))
@@ -0,0 +1,161 @@
+#
+# Compile the formulas of a SymbolicFunction into vectorized kernels.
+#
+# The formulas are translated into NumPy expressions, which are
+# evaluated on the whole input sample at once. If the numexpr module
+# is available, the expressions are evaluated by numexpr instead: the
+# operations are fused and computed by several threads.
+# The compiled kernel is exposed as an ot.Function, which evaluates
+# samples in one call and keeps the exact gradient and hessian of the
+# SymbolicFunction.
+#
+
+import openturns as ot
+import numpy as np
+import re
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+# Functions of the SymbolicFunction syntax and their NumPy equivalent
+numpyFunctions = {
+    "sin": "sin", "cos": "cos", "tan": "tan",
+    "asin": "arcsin", "acos": "arccos", "atan": "arctan", "atan2": "arctan2",
+    "sinh": "sinh", "cosh": "cosh", "tanh": "tanh",
+    "asinh": "arcsinh", "acosh": "arccosh", "atanh": "arctanh",
+    "exp": "exp", "log": "log", "ln": "log", "log2": "log2", "log10": "log10",
+    "sqrt": "sqrt", "cbrt": "cbrt", "abs": "abs", "sign": "sign",
+    "floor": "floor", "ceil": "ceil", "trunc": "trunc", "round": "rint", "rint": "rint"}
+
+# Functions available in numexpr
+numexprFunctions = ["sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2",
+                    "sinh", "cosh", "tanh", "arcsinh", "arccosh", "arctanh",
+                    "exp", "log", "log10", "sqrt", "abs"]
+
+# Constants of the SymbolicFunction syntax
+constants = {"pi_": np.pi, "e_": np.e}
+
+tokenPattern = re.compile(r"\s*(?:"
+                          r"(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|"
+                          r"(?P<name>[A-Za-z_][A-Za-z0-9_]*)|"
+                          r"(?P<operator>\^|[-+*/(),]))")
+
+def translateFormula(formula, inputVariables):
+    '''
+    Translate a formula into an expression of the variables x0, x1, ...
+    Returns the expression and the list of the functions it uses.
+    Raises a ValueError if the formula uses an unsupported feature
+    (e.g. logical operators, min, max).
+    '''
+    tokens = []
+    position = 0
+    formula = formula.rstrip()
+    while position < len(formula):
+        match = tokenPattern.match(formula, position)
+        if match is None:
+            raise ValueError("Unsupported syntax in formula %s at position %d" % (formula, position))
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    expression = []
+    functions = []
+    for i in range(len(tokens)):
+        kind, value = tokens[i]
+        isCall = i + 1 < len(tokens) and tokens[i + 1][1] == "("
+        if kind == "operator":
+            expression.append("**" if value == "^" else value)
+        elif kind == "number":
+            expression.append(value)
+        elif isCall:
+            if value not in numpyFunctions:
+                raise ValueError("Unsupported function %s in formula %s" % (value, formula))
+            functions.append(numpyFunctions[value])
+            expression.append(numpyFunctions[value])
+        elif value in inputVariables:
+            expression.append("x%d" % (inputVariables.index(value)))
+        elif value in constants:
+            expression.append(value)
+        else:
+            raise ValueError("Unknown variable %s in formula %s" % (value, formula))
+    return " ".join(expression), functions
+
+class CompiledSymbolicKernel:
+    '''
+    Evaluate the translated formulas on a sample.
+    '''
+    def __init__(self, inputVariables, formulas, useNumexpr=None):
+        if useNumexpr is None:
+            useNumexpr = numexpr is not None
+        self.inputDimension = len(inputVariables)
+        self.expressions = []
+        self.numexprFlags = []
+        for formula in formulas:
+            expression, functions = translateFormula(formula, list(inputVariables))
+            self.expressions.append(expression)
+            # Fall back to NumPy if numexpr does not know a function
+            useNumexprHere = useNumexpr and all([f in numexprFunctions for f in functions])
+            self.numexprFlags.append(useNumexprHere)
+        self.numpyNamespace = {name: getattr(np, name) for name in set(numpyFunctions.values())}
+        self.numpyNamespace.update(constants)
+        self.codes = [compile(expression, "<formula>", "eval") for expression in self.expressions]
+
+    def __call__(self, X):
+        X = np.asarray(X, dtype=float)
+        sampleSize = X.shape[0]
+        variables = {"x%d" % (i): X[:, i] for i in range(self.inputDimension)}
+        Y = np.empty((sampleSize, len(self.expressions)))
+        for j in range(len(self.expressions)):
+            if self.numexprFlags[j]:
+                localDict = dict(variables)
+                localDict.update(constants)
+                Y[:, j] = numexpr.evaluate(self.expressions[j], local_dict=localDict)
+            else:
+                namespace = dict(self.numpyNamespace)
+                namespace.update(variables)
+                # Broadcast constant formulas to the sample size
+                Y[:, j] = eval(self.codes[j], {"__builtins__": {}}, namespace)
+        return Y
+
+def compileSymbolicFunction(g, useNumexpr=None):
+    '''
+    Compile a SymbolicFunction into a vectorized ot.Function.
+    The evaluation is the compiled kernel, the gradient and the hessian
+    are the ones of g.
+    '''
+    inputVariables = list(g.getInputDescription())
+    formulas = list(g.getEvaluation().getImplementation().getFormulas())
+    kernel = CompiledSymbolicKernel(inputVariables, formulas, useNumexpr)
+    compiledFunction = ot.PythonFunction(g.getInputDimension(), g.getOutputDimension(), func_sample=kernel)
+    compiledFunction.setInputDescription(g.getInputDescription())
+    compiledFunction.setOutputDescription(g.getOutputDescription())
+    implementation = ot.FunctionImplementation(compiledFunction.getEvaluation(), g.getGradient(), g.getHessian())
+    compiled = ot.Function(implementation)
+    return compiled
+
+def computeCompiledError(g, compiled, inputSample):
+    '''
+    Returns the maximum difference between the outputs of the
+    SymbolicFunction and of the compiled function on the input sample.
+    The difference is relative for outputs larger than 1 in absolute
+    value, and absolute otherwise.
+    '''
+    Y = np.array(g(inputSample))
+    Ycompiled = np.array(compiled(inputSample))
+    scale = np.maximum(np.abs(Y), 1.)
+    relativeError = np.abs(Y - Ycompiled) / scale
+    # Both evaluations must fail at the same points
+    if np.any(np.isnan(Y) != np.isnan(Ycompiled)):
+        return np.inf
+    return np.nanmax(relativeError)
+
+if __name__=="__main__":
+    # The Ishigami function
+    fla = "sin(X1) + 7*sin(X2)^2 + 0.1*X3^4*sin (X1)"
+    g = ot.SymbolicFunction(["X1", "X2", "X3"], [fla])
+    compiled = compileSymbolicFunction(g)
+    X = ot.ComposedDistribution([ot.Uniform(-np.pi, np.pi)] * 3)
+    inputSample = X.getSample(1000)
+    print("Expression = %s" % (translateFormula(fla, ["X1", "X2", "X3"])[0]))
+    print("Maximum relative error = %.2e" % (computeCompiledError(g, compiled, inputSample)))
+    print("Gradient = %s" % (compiled.gradient([1., 2., 3.])))
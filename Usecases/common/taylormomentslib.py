@@ -0,0 +1,81 @@
+#
+# Mean and variance of the output by Taylor expansion at the mean.
+#
+# Let mu and sigma_i^2 be the mean and the variances of the independent
+# inputs, and g_i, H_ij the gradient and the hessian of the model at mu.
+# The first order approximations are
+#
+#     E(Y) = g(mu),  V(Y) = sum_i g_i^2 sigma_i^2.
+#
+# The second order approximations are
+#
+#     E(Y) = g(mu) + 1/2 sum_i H_ii sigma_i^2,
+#     V(Y) = sum_i g_i^2 sigma_i^2 + sum_i g_i H_ii mu3_i
+#            + 1/4 sum_i H_ii^2 (mu4_i - sigma_i^4)
+#            + sum_{i<j} H_ij^2 sigma_i^2 sigma_j^2,
+#
+# where mu3_i and mu4_i are the third and fourth central moments of the
+# inputs. The second order variance is the exact variance of the second
+# order Taylor polynomial.
+# Only one evaluation of the function, its gradient and its hessian are
+# required.
+#
+
+import openturns as ot
+import numpy as np
+
+def getCentralMoments(distribution):
+    '''
+    Returns the mean, the variance, the third and fourth central moments
+    of the marginals of an independent distribution.
+    '''
+    if not distribution.hasIndependentCopula():
+        raise ValueError("The distribution must have an independent copula")
+    dimension = distribution.getDimension()
+    moments = np.zeros((4, dimension))
+    for i in range(dimension):
+        marginal = distribution.getMarginal(i)
+        moments[0, i] = marginal.getMean()[0]
+        for k in [2, 3, 4]:
+            moments[k - 1, i] = marginal.getCentralMoment(k)[0]
+    return moments
+
+def computeTaylorMoments(g, distribution, moments=None):
+    '''
+    Returns the first and second order Taylor approximations of the mean
+    and of the variance of the scalar output of g:
+    [meanFirstOrder, meanSecondOrder, varianceFirstOrder, varianceSecondOrder].
+    The central moments of the inputs may be given, see getCentralMoments.
+    '''
+    if moments is None:
+        moments = getCentralMoments(distribution)
+    mean, variance, mu3, mu4 = moments
+    dimension = mean.size
+    gradient = np.array(g.gradient(mean))[:, 0]
+    hessian = np.array(g.hessian(mean)).reshape(dimension, dimension, -1)[:, :, 0]
+    diagonal = np.diag(hessian)
+    meanFirstOrder = g(mean)[0]
+    meanSecondOrder = meanFirstOrder + 0.5 * np.sum(diagonal * variance)
+    varianceFirstOrder = np.sum(gradient**2 * variance)
+    crossTerms = np.triu(hessian**2 * np.outer(variance, variance), 1).sum()
+    varianceSecondOrder = varianceFirstOrder + np.sum(gradient * diagonal * mu3) \
+        + 0.25 * np.sum(diagonal**2 * (mu4 - variance**2)) + crossTerms
+    return [meanFirstOrder, meanSecondOrder, varianceFirstOrder, varianceSecondOrder]
+
+def computeMonteCarloMoments(g, distribution, sampleSize=10**6):
+    '''
+    Returns the Monte-Carlo estimates of the mean and of the variance of
+    the scalar output of g, as a reference.
+    '''
+    outputSample = g(distribution.getSample(sampleSize))
+    return [outputSample.computeMean()[0], outputSample.computeVariance()[0]]
+
+if __name__=="__main__":
+    # Y = X1 * X2 + X1^2: the second order expansion is exact
+    ot.RandomGenerator.SetSeed(0)
+    g = ot.SymbolicFunction(["X1", "X2"], ["X1 * X2 + X1^2"])
+    distribution = ot.ComposedDistribution([ot.Exponential(1.), ot.Uniform(1., 3.)])
+    meanFirstOrder, meanSecondOrder, varianceFirstOrder, varianceSecondOrder = computeTaylorMoments(g, distribution)
+    meanMC, varianceMC = computeMonteCarloMoments(g, distribution)
+    print("Mean: first order = %.4f, second order = %.4f, Monte-Carlo = %.4f" % (meanFirstOrder, meanSecondOrder, meanMC))
+    print("Variance: first order = %.4f, second order = %.4f, Monte-Carlo = %.4f" % (varianceFirstOrder, varianceSecondOrder, varianceMC))
@@ -1,6 +1,10 @@
 from openturns.viewer import View
 import openturns as ot
 from math import sqrt
+import sys
+sys.path.append("../common")
+from cruegradientlib import gradientCrueH
+from evaluationcachelib import PersistentCacheFunction
 
 # 1. The function G
 def functionCrue(X) :
@@ -12,7 +16,12 @@ def functionCrue(X) :
     return [H]
 
 # Creation of the problem function
-f = ot.PythonFunction(4, 1, functionCrue) 
+f = ot.PythonFunction(4, 1, functionCrue, gradient=gradientCrueH) 
+# The evaluations are kept in a database from one run to the next, in
+# the temporary directory. The model is identified by the code of
+# functionCrue: if it changes, the evaluations are computed again.
+cache = PersistentCacheFunction(f, functionCrue)
+f = ot.Function(cache)
 f = ot.MemoizeFunction(f)
 
 # 2. Random vector definition
@@ -46,6 +55,7 @@ sampleSize = 100
 inputSample = inputRandomVector.getSample(sampleSize)
 #print(inputSample)
 outputH = f(inputSample)
+print("Database: %d hits, %d new evaluations" % (cache.getHitNumber(), cache.getMissNumber()))
 #print(outputH)
 
 # 7. Plot the histogram
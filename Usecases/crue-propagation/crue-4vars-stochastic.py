@@ -77,3 +77,17 @@ histoGraph.setYTitle("Frequence")
 histoGraph.setLegends([""])
 View(histoGraph)
 
+
+# 7. The same sampling, with the model evaluated on a pool of processes
+import sys
+import time
+sys.path.append("../common")
+from processpoolfunctionlib import ProcessPoolFunction
+implementation = ProcessPoolFunction(functionCrue4VarsStochastic, 4, 1, workerNumber=4, chunkSize=25)
+gParallel = ot.Function(implementation)
+outputRandomVector = ot.CompositeRandomVector(gParallel, inputRandomVector)
+t = time.time()
+outputSample=outputRandomVector.getSample(samplesize)
+print("Pool of %d processes: %.2f (s), %d calls" % (4, time.time() - t, implementation.getCallsNumber()))
+print("Mean overflow = %.4f" % (outputSample.computeMean()[0]))
+implementation.shutdown()
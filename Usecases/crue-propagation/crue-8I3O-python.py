@@ -14,6 +14,9 @@ numériques, Bertrand Iooss, 7 Dec 2010
 import openturns as ot
 from math import sqrt, expm1
 from openturns.viewer import View
+import sys
+sys.path.append("../common")
+from cruegradientlib import gradientCrue8I3O
 
 # 1. Define the G function
 def functionCrue(X) :
@@ -34,7 +37,7 @@ def functionCrue(X) :
     C=CS+CH
     return [H,S,C]
 
-myFunction = ot.PythonFunction(8, 3, functionCrue) 
+myFunction = ot.PythonFunction(8, 3, functionCrue, gradient=gradientCrue8I3O) 
 
 # 2. Create the Input and Output random variables
 myParam = ot.GumbelAB(1013., 558.)
@@ -83,3 +86,24 @@ histoGraph.setYTitle("Frequence")
 histoGraph.setLegends([""])
 View(histoGraph)
 
+# 7. FORM on the overflow, with finite differences and with the exact gradient
+callsNumber = [0, 0]
+def functionOverflow(X):
+    callsNumber[0] += 1
+    return [functionCrue(X)[1]]
+
+def gradientOverflow(X):
+    callsNumber[1] += 1
+    return [[row[1]] for row in gradientCrue8I3O(X)]
+
+for gradient in [None, gradientOverflow]:
+    callsNumber[0] = 0
+    callsNumber[1] = 0
+    overflow = ot.PythonFunction(8, 1, functionOverflow, gradient=gradient)
+    S = ot.CompositeRandomVector(overflow, inputRandomVector)
+    eventF = ot.Event(S, ot.GreaterOrEqual(), 0.)
+    algoFORM = ot.FORM(ot.AbdoRackwitz(), eventF, inputDistribution.getMean())
+    algoFORM.run()
+    pf = algoFORM.getResult().getEventProbability()
+    method = "finite differences" if gradient is None else "exact gradient"
+    print("FORM, %s: Pf = %e, function calls = %d, gradient calls = %d" % (method, pf, callsNumber[0], callsNumber[1]))
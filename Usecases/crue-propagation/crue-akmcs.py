@@ -0,0 +1,79 @@
+"""
+Probabilité de surverse P(S >= 0) par la méthode AK-MCS : 
+le modèle est remplacé par un krigeage, enrichi point par point 
+là où le signe de S est le plus incertain.
+Quelques dizaines d'appels au modèle au lieu d'un million 
+pour le Monte-Carlo de crue-propagation.py.
+"""
+import openturns as ot
+from math import sqrt
+import sys
+sys.path.append("../common")
+from akmcslib import AKMCS
+
+# 1. The function G
+def functionCrue(X) :
+    Hd = 3.0
+    Zb = 55.5
+    L = 5.0e3
+    B = 300.0
+    Zd = Zb + Hd
+    Q, Ks, Zv, Zm = X
+    alpha = (Zm - Zv)/L
+    H = (Q/(Ks*B*sqrt(alpha)))**(3.0/5.0)
+    Zc = H + Zv
+    S = Zc - Zd
+    return [S]
+
+# Creation of the problem function
+g = ot.PythonFunction(4, 1, functionCrue) 
+g = ot.MemoizeFunction(g)
+
+# 2. Random vector definition
+myParam = ot.GumbelAB(1013., 558.)
+Q = ot.ParametrizedDistribution(myParam)
+otLOW = ot.TruncatedDistribution.LOWER
+Q = ot.TruncatedDistribution(Q, 0, otLOW)
+Ks = ot.Normal(30.0, 7.5)
+Ks = ot.TruncatedDistribution(Ks, 0, otLOW)
+Zv = ot.Uniform(49.0, 51.0)
+Zm = ot.Uniform(54.0, 56.0)
+inputvector = ot.ComposedDistribution([Q, Ks, Zv, Zm])
+
+# 3. AK-MCS
+# Un coefficient de variation de 0.2 demande environ 4.10^4 candidats :
+# le budget est choisi pour que l'apprentissage converge (min U >= 2)
+# puis que le critère sur le coefficient de variation soit atteint.
+coefficientOfVariation = 0.2
+maximumCallsNumber = 200
+ot.RandomGenerator.SetSeed(0)
+algo = AKMCS(g, inputvector, ot.GreaterOrEqual(), 0.)
+algo.setInitialDesignSize(20)
+algo.setCandidateSize(2 * 10**4)
+algo.setMaximumCandidateSize(10**5)
+algo.setCoefficientOfVariation(coefficientOfVariation)
+algo.setMaximumCallsNumber(maximumCallsNumber)
+algo.run()
+
+# 4. Get the results
+result = algo.getResult()
+neval = g.getEvaluationCallsNumber()
+print("Number of function calls = %d" %(neval))
+print("Number of candidates = %d" %(result.getCandidateSize()))
+pf = result.getProbabilityEstimate()
+print("Failure Probability = %e" % (pf))
+print("Coefficient of variation = %.3f" % (result.getCoefficientOfVariation()))
+level = 0.95
+c95 = result.getConfidenceLength(level)
+pmin=pf-0.5*c95
+pmax=pf+0.5*c95
+print("%.1f %% confidence interval :[%e,%e] " % (level*100,pmin,pmax))
+print("Reference (Monte-Carlo, 10^8 points) = %e" % (6.39e-4))
+
+# 5. Check that the algorithm stopped on its convergence criteria,
+# not on the budget
+isConverged = (result.getCallsNumber() < maximumCallsNumber 
+               and result.getCoefficientOfVariation() <= coefficientOfVariation)
+print("Converged = %s" % (isConverged))
+if not isConverged:
+    raise ValueError("AK-MCS stopped on the budget")
@@ -0,0 +1,40 @@
+"""
+Probabilité de surverse par Monte-Carlo, avec des points de reprise.
+Si le calcul est interrompu, relancer le script reprend le calcul 
+au dernier point de reprise, avec le même résultat que sans 
+interruption.
+"""
+import openturns as ot
+import sys
+sys.path.append("../common")
+from checkpointlib import CheckpointedMonteCarlo
+
+# 1. The function G
+g = ot.SymbolicFunction(["Q", "Ks", "Zv", "Zm"], 
+                        ["(Q/(Ks*300.0*sqrt((Zm-Zv)/5.0e3)))^(3.0/5.0)+Zv-58.5"])
+
+# 2. Random vector definition
+myParam = ot.GumbelAB(1013., 558.)
+Q = ot.ParametrizedDistribution(myParam)
+otLOW = ot.TruncatedDistribution.LOWER
+Q = ot.TruncatedDistribution(Q, 0, otLOW)
+Ks = ot.Normal(30.0, 7.5)
+Ks = ot.TruncatedDistribution(Ks, 0, otLOW)
+Zv = ot.Uniform(49.0, 51.0)
+Zm = ot.Uniform(54.0, 56.0)
+inputvector = ot.ComposedDistribution([Q, Ks, Zv, Zm])
+
+# 3. Monte-Carlo by blocks of 10^4, with a checkpoint every 10 blocks
+algo = CheckpointedMonteCarlo(g, inputvector, ot.GreaterOrEqual(), 0., "crue-propagation.checkpoint")
+algo.setBlockSize(10000)
+algo.setCheckpointPeriod(10)
+algo.run(1000000)
+
+# 4. Get the results
+pf = algo.getProbabilityEstimate()
+print("Failure Probability = %e" % (pf))
+level = 0.95
+c95 = algo.getConfidenceLength(level)
+pmin=pf-0.5*c95
+pmax=pf+0.5*c95
+print("%.1f %% confidence interval :[%e,%e] " % (level*100,pmin,pmax))
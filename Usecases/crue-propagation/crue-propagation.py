@@ -1,6 +1,9 @@
 from openturns.viewer import View
 import openturns as ot
 from math import sqrt
+import sys
+sys.path.append("../common")
+from cruegradientlib import gradientCrueS
 
 # 1. The function G
 def functionCrue(X) :
@@ -17,7 +20,7 @@ def functionCrue(X) :
     return [S]
 
 # Creation of the problem function
-g = ot.PythonFunction(4, 1, functionCrue) 
+g = ot.PythonFunction(4, 1, functionCrue, gradient=gradientCrueS) 
 g = ot.MemoizeFunction(g)
 
 # 2. Random vector definition
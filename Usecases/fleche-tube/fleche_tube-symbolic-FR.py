@@ -45,3 +45,26 @@ histoGraph.setYTitle("Fréquence")
 histoGraph.setLegends([""])
 View(histoGraph)
 
+
+# 8. Tendance centrale par développement de Taylor
+import sys
+import time
+sys.path.append("../common")
+from taylormomentslib import computeTaylorMoments, computeMonteCarloMoments, getCentralMoments
+meanFirstOrder, meanSecondOrder, varianceFirstOrder, varianceSecondOrder = computeTaylorMoments(g, inputDistribution)
+meanMC, varianceMC = computeMonteCarloMoments(g, inputDistribution, 10**6)
+print("Moyenne : ordre 1 = %.6e, ordre 2 = %.6e, Monte-Carlo = %.6e" % (meanFirstOrder, meanSecondOrder, meanMC))
+print("Ecart-type : ordre 1 = %.6e, ordre 2 = %.6e, Monte-Carlo = %.6e" % (varianceFirstOrder**0.5, varianceSecondOrder**0.5, varianceMC**0.5))
+
+# 9. Balayage du diamètre externe : la loi est translatée, 
+#    les moments centrés sont inchangés
+moments = getCentralMoments(inputDistribution)
+diameters = [0.6 + 0.3 * k / 999. for k in range(1000)]
+t = time.time()
+deviations = []
+for De in diameters:
+    moments[0, 3] = De
+    deviations.append(computeTaylorMoments(g, inputDistribution, moments)[3]**0.5)
+elapsed = time.time() - t
+print("Balayage de %d géométries : %.3f (ms) par géométrie" % (len(diameters), 1000. * elapsed / len(diameters)))
+print("Ecart-type de la flèche pour De=%.2f : %.6e, pour De=%.2f : %.6e" % (diameters[0], deviations[0], diameters[-1], deviations[-1]))
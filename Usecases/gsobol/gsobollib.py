@@ -7,7 +7,7 @@
 #
 
 from openturns import ComposedDistribution, Uniform
-from numpy import array, prod, ones, zeros
+from numpy import array, prod, ones, zeros, outer, fill_diagonal
 
 def gsobol(X,a):
     d = len(a)
@@ -37,6 +37,14 @@ def gsobolSAExact(a):
     stexact = 1 - suexact/vexact;
     return [muexact,vexact,sexact,stexact]
 
+def gsobolSecondOrderExact(a):
+    # Second order sensitivity indices: V_ij = V_i V_j
+    vexact = prod(1 + 1.0 /(3*(1+a)**2))-1;
+    vi = 1.0 /(3*(1+a)**2);
+    sijexact = outer(vi,vi)/vexact;
+    fill_diagonal(sijexact,0.)
+    return sijexact
+
 def gsobolDistribution(d):
     distribution = ComposedDistribution([Uniform(0, 1)] * d)
     return distribution
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Estime les indices de sensibilité de la fonction G-Sobol à partir 
+des coefficients d'un chaos polynomial creux (LARS). 
+Compare l'erreur avec celle de l'estimateur de Saltelli, à nombre 
+d'appels à la fonction égal.
+"""
+
+#! /usr/bin/env python
+
+from __future__ import print_function
+import openturns as ot
+import sys
+sys.path.append("../common")
+from chaossensitivitylib import computeChaosIndicesConvergence
+from gsobollib import (
+        gsobolSAExact, 
+        gsobolDistribution, gsobol
+)
+from numpy import zeros, sqrt, array
+from pylab import plot, xlabel, ylabel, xscale, yscale, legend, title
+
+a = array([0,9,99])
+nx = len(a)
+[muexact,vexact,sexact,stexact] = gsobolSAExact(a)
+distribution = gsobolDistribution(nx)
+model = ot.PythonFunction(nx, 1, func_sample=lambda X: gsobol(X,a))
+
+ot.RandomGenerator.SetSeed(0)
+totalDegree = 8
+calls = array([50, 100, 200, 400, 800, 1600])
+nloops = len(calls)
+
+# Chaos polynomial
+firstOrderList, totalOrderList, secondOrderList = computeChaosIndicesConvergence(
+    model, distribution, calls, totalDegree)
+absErrorChaos = zeros((nloops,2))
+for i in range(nloops):
+    absErrorChaos[i,0] = max(abs(firstOrderList[i]-sexact))
+    absErrorChaos[i,1] = max(abs(totalOrderList[i]-stexact))
+
+# Saltelli, avec N(d+2) appels
+absErrorSaltelli = zeros((nloops,2))
+for i in range(nloops):
+    size = int(calls[i] / (nx + 2))
+    inputDesign = ot.SobolIndicesExperiment(distribution, size).generate()
+    outputDesign = model(inputDesign)
+    sensitivity_algorithm = ot.SaltelliSensitivityAlgorithm(
+        inputDesign, outputDesign, size)
+    absErrorSaltelli[i,0] = max(abs(array(sensitivity_algorithm.getFirstOrderIndices())-sexact))
+    absErrorSaltelli[i,1] = max(abs(array(sensitivity_algorithm.getTotalOrderIndices())-stexact))
+
+for i in range(nloops):
+    print("Calls=%d, chaos error first=%.2e, total=%.2e, Saltelli error first=%.2e, total=%.2e" % (
+        calls[i], absErrorChaos[i,0], absErrorChaos[i,1], 
+        absErrorSaltelli[i,0], absErrorSaltelli[i,1]))
+print("Exact first order = %s" % (sexact))
+print("Chaos first order = %s" % (firstOrderList[-1]))
+print("Exact total order = %s" % (stexact))
+print("Chaos total order = %s" % (totalOrderList[-1]))
+print("Chaos S12 = %.6f" % (secondOrderList[-1][0,1]))
+
+title("Gsobol-Chaos")
+plot(calls,1./sqrt(calls),"-", label="1/sqrt(n)")
+plot(calls,absErrorChaos[:,0],"o", label="First order, chaos")
+plot(calls,absErrorChaos[:,1],"s", label="Total order, chaos")
+plot(calls,absErrorSaltelli[:,0],"v", label="First order, Saltelli")
+plot(calls,absErrorSaltelli[:,1],"^", label="Total order, Saltelli")
+xlabel("Number of calls")
+ylabel("Absolute error")
+xscale("log")
+yscale("log")
+legend()
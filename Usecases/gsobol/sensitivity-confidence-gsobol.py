@@ -16,6 +16,11 @@ from gsobollib import (
         gsobolSAExact, 
         gsobolDistribution, gsobol
 )
+import sys
+sys.path.append("../common")
+from checkpointlib import runCheckpointedLoop
+from bootstrapsensitivitylib import computeBootstrapIntervals, estimatorNames
+import time
 import numpy as np
 import pylab as pl
 import openturns.viewer as otv
@@ -35,22 +40,31 @@ sampleSize = 1000
 # Nombre de répétition de l'expérience
 nrepetitions = 500
 
-# Estimations des indices du premier ordre
-sampleFirstMartinez = ot.Sample(nrepetitions,3)
+# Graine du générateur aléatoire
+seed = 0
 
-# Estimations des indices totaux
-sampleTotalMartinez = ot.Sample(nrepetitions,3)
-for i in range(nrepetitions):
+# Estimations des indices du premier ordre et des indices totaux.
+# Les répétitions sont sauvegardées toutes les 50 répétitions : 
+# si le calcul est interrompu, il reprend à la dernière sauvegarde.
+# La sauvegarde n'est reprise que si les paramètres de l'étude 
+# (répétitions, taille, coefficients a, graine) sont inchangés.
+def repetition(i, state):
     inputDesign = ot.SobolIndicesExperiment(distribution, sampleSize).generate()
     outputDesign = gsobol(inputDesign,a)
     sensitivity_algorithm = ot.SaltelliSensitivityAlgorithm(
         inputDesign, outputDesign, sampleSize)
-    fo = sensitivity_algorithm.getFirstOrderIndices()
-    to = sensitivity_algorithm.getTotalOrderIndices()
-    for j in range(d):
-        sampleFirstMartinez[i,j] = fo[j]
-    for j in range(d):
-        sampleTotalMartinez[i,j] = to[j]
+    state["first"][i] = sensitivity_algorithm.getFirstOrderIndices()
+    state["total"][i] = sensitivity_algorithm.getTotalOrderIndices()
+    state["algorithm"] = sensitivity_algorithm
+    return state
+
+ot.RandomGenerator.SetSeed(seed)
+state = {"first": np.zeros((nrepetitions,d)), "total": np.zeros((nrepetitions,d)), "algorithm": None}
+state = runCheckpointedLoop("sensitivity-confidence-gsobol.checkpoint", nrepetitions, 
+                            state, repetition, 50, [nrepetitions, sampleSize, a.tolist(), seed])
+sampleFirstMartinez = ot.Sample(state["first"])
+sampleTotalMartinez = ot.Sample(state["total"])
+sensitivity_algorithm = state["algorithm"]
 
 fig = pl.figure(figsize=(12, 8))
 for j in range(d):
@@ -89,6 +103,26 @@ for j in range(d):
     print("   First, Bootstrap=[%.4f,%.4f], Sample=[%.4f,%.4f]" % (foIntervalMin[j],foIntervalMax[j],foMinj,foMaxj))
     print("   Total, Bootstrap=[%.4f,%.4f], Sample=[%.4f,%.4f]" % (toIntervalMin[j],toIntervalMax[j],toMinj,toMaxj))
 
+# Bootstrap vectorisé : les répliques sont calculées par produits matriciels
+# sur un nouveau plan d'expérience, pour les trois estimateurs
+inputDesign = ot.SobolIndicesExperiment(distribution, sampleSize).generate()
+outputDesign = gsobol(inputDesign,a)
+algorithms = {"Saltelli": ot.SaltelliSensitivityAlgorithm, "Jansen": ot.JansenSensitivityAlgorithm,
+              "Martinez": ot.MartinezSensitivityAlgorithm}
+for estimator in estimatorNames:
+    t0 = time.time()
+    algo = algorithms[estimator](inputDesign, outputDesign, sampleSize)
+    _ = algo.getFirstOrderIndicesInterval()
+    _ = algo.getTotalOrderIndicesInterval()
+    t1 = time.time()
+    foInterval, toInterval = computeBootstrapIntervals(outputDesign, sampleSize, d, estimator,
+                                                       algo.getBootstrapSize(), alpha)
+    t2 = time.time()
+    print("%s, bootstrap OpenTURNS=%.3f (s), vectorise=%.3f (s)" % (estimator, t1 - t0, t2 - t1))
+    for j in range(d):
+        print("   X%d, First=[%.4f,%.4f], Total=[%.4f,%.4f]" % (j, foInterval.getLowerBound()[j],
+              foInterval.getUpperBound()[j], toInterval.getLowerBound()[j], toInterval.getUpperBound()[j]))
+
 fig = pl.figure(figsize=(12, 8))
 for j in range(d):
     # First order
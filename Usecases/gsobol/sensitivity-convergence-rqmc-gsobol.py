@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Compare la convergence des estimateurs des indices de sensibilité 
+pour la fonction G-Sobol, avec un plan Monte-Carlo et avec un plan 
+quasi-Monte-Carlo randomisé (suite de Sobol' avec décalage aléatoire).
+L'erreur est la moyenne de l'erreur absolue sur plusieurs répétitions.
+"""
+
+#! /usr/bin/env python
+
+from __future__ import print_function
+import openturns as ot
+import sys
+sys.path.append("../common")
+from rqmcsensitivitylib import RandomizedSobolIndicesExperiment, computeReplicatedIndices
+from gsobollib import (
+        gsobolSAExact, 
+        gsobolDistribution, gsobol
+)
+from numpy import zeros, sqrt, array
+from pylab import figure, plot, xlabel, ylabel, xscale, yscale, legend, title
+
+def computeAbsoluteError(sensitivity_algorithm,sexact,stexact):
+    fo = array(sensitivity_algorithm.getFirstOrderIndices())
+    to = array(sensitivity_algorithm.getTotalOrderIndices())
+    absErrFirst = max(abs(fo-sexact))
+    absErrTotal = max(abs(to-stexact))
+    return [absErrFirst,absErrTotal]
+
+a = array([0,9,99])
+nx = len(a)
+[muexact,vexact,sexact,stexact] = gsobolSAExact(a)
+distribution = gsobolDistribution(nx)
+model = ot.PythonFunction(nx, 1, func_sample=lambda X: gsobol(X,a))
+
+ot.RandomGenerator.SetSeed(0)
+# Size of simulation: powers of 2
+nloops = 10
+nrepeat = 10
+sampleSize = array([2**(i+4) for i in range(nloops)])
+
+algorithms = [ot.SaltelliSensitivityAlgorithm, ot.MartinezSensitivityAlgorithm, 
+              ot.JansenSensitivityAlgorithm, ot.MauntzKucherenkoSensitivityAlgorithm]
+for algorithmClass in algorithms:
+    algorithmName = algorithmClass.__name__.replace("SensitivityAlgorithm","")
+    absErrorMC = zeros((nloops,2))
+    absErrorRQMC = zeros((nloops,2))
+    for i in range(nloops):
+        size = int(sampleSize[i])
+        rqmcExperiment = RandomizedSobolIndicesExperiment(distribution, size)
+        for k in range(nrepeat):
+            # Monte-Carlo
+            inputDesign = ot.SobolIndicesExperiment(distribution, size).generate()
+            outputDesign = model(inputDesign)
+            sensitivity_algorithm = algorithmClass(inputDesign, outputDesign, size)
+            absErrorMC[i] += computeAbsoluteError(sensitivity_algorithm,sexact,stexact)
+            # Randomized quasi-Monte-Carlo
+            inputDesign = rqmcExperiment.generate()
+            outputDesign = model(inputDesign)
+            sensitivity_algorithm = algorithmClass(inputDesign, outputDesign, size)
+            absErrorRQMC[i] += computeAbsoluteError(sensitivity_algorithm,sexact,stexact)
+    absErrorMC /= nrepeat
+    absErrorRQMC /= nrepeat
+    print("%s, N=%d, MC error=%.2e, RQMC error=%.2e" % (algorithmName, 
+          sampleSize[-1], absErrorMC[-1,0], absErrorRQMC[-1,0]))
+    figure()
+    title("Gsobol-%s" % (algorithmName))
+    plot(sampleSize,1./sqrt(sampleSize),"-", label="1/sqrt(n)")
+    plot(sampleSize,1./sampleSize,"--", label="1/n")
+    plot(sampleSize,absErrorMC[:,0],"o", label="First order, MC")
+    plot(sampleSize,absErrorRQMC[:,0],"s", label="First order, RQMC")
+    plot(sampleSize,absErrorMC[:,1],"v", label="Total order, MC")
+    plot(sampleSize,absErrorRQMC[:,1],"^", label="Total order, RQMC")
+    xlabel("N")
+    ylabel("Absolute error")
+    xscale("log")
+    yscale("log")
+    legend()
+
+# Intervalles de confiance par répétition du plan randomisé
+size = 2**10
+nrepeat = 20
+fo, foInterval, to, toInterval = computeReplicatedIndices(
+    ot.SaltelliSensitivityAlgorithm, distribution, model, size, nrepeat)
+print("Exact first order = %s" % (sexact))
+print("RQMC first order = %s" % (fo))
+print("First order 95%% interval = %s" % (foInterval))
+print("Exact total order = %s" % (stexact))
+print("RQMC total order = %s" % (to))
+print("Total order 95%% interval = %s" % (toInterval))
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Estime tous les indices du second ordre de la fonction G-Sobol 
+en grande dimension, en réutilisant les blocs du plan 
+ot.SobolIndicesExperiment(X, N, True) pour toutes les paires, 
+par un seul produit matriciel.
+"""
+
+#! /usr/bin/env python
+
+from __future__ import print_function
+import openturns as ot
+import sys
+import time
+sys.path.append("../common")
+from secondordersensitivitylib import computeSecondOrderIndices
+from gsobollib import (
+        gsobolSAExact, gsobolSecondOrderExact, 
+        gsobolDistribution, gsobol
+)
+from numpy import arange, array, abs, max, unravel_index, argmax
+
+# Dimension 20 : les premières variables sont les plus influentes
+nx = 20
+a = arange(nx) / 2.
+[muexact,vexact,sexact,stexact] = gsobolSAExact(a)
+sijexact = gsobolSecondOrderExact(a)
+distribution = gsobolDistribution(nx)
+
+ot.RandomGenerator.SetSeed(0)
+size = 10000
+inputDesign = ot.SobolIndicesExperiment(distribution, size, True).generate()
+outputDesign = gsobol(inputDesign,a)
+print("Number of calls = %d" % (outputDesign.shape[0]))
+
+t = time.time()
+firstOrder, secondOrder = computeSecondOrderIndices(outputDesign, size, nx)
+print("Vectorized second order: %.3f (s)" % (time.time() - t))
+print("Max absolute error on first order = %.4f" % (max(abs(firstOrder - sexact))))
+print("Max absolute error on second order = %.4f" % (max(abs(secondOrder - sijexact))))
+i, j = unravel_index(argmax(sijexact), sijexact.shape)
+print("S_%d%d = %.4f, exact = %.4f" % (i + 1, j + 1, secondOrder[i, j], sijexact[i, j]))
+
+t = time.time()
+sensitivity_algorithm = ot.SaltelliSensitivityAlgorithm(inputDesign, outputDesign, size)
+secondOrderOT = array(sensitivity_algorithm.getSecondOrderIndices())
+print("SaltelliSensitivityAlgorithm second order: %.3f (s)" % (time.time() - t))
+print("Max absolute error on second order = %.4f" % (max(abs(secondOrderOT - sijexact))))
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Objectif :
+Estimer les indices de Sobol' de la fonction Ishigami avec l'algorithme
+itératif de ishigami-AS.py, en évaluant les blocs de plusieurs
+itérations en même temps sur un ensemble de processus.
+La règle d'arrêt (alpha, epsilon) est la même : le résultat ne dépend
+pas du nombre de processus.
+"""
+
+import openturns as ot
+from math import pi
+from multiprocessing import cpu_count
+import time
+from sobolsimulationlib import ParallelSobolSimulationAlgorithm
+
+if __name__=="__main__":
+    dim = 3
+    fla = "sin(X1) + 7*sin(X2)^2 + 0.1*X3^4*sin (X1)"
+    g = ot.SymbolicFunction ([ "X1", "X2", "X3"], [fla ])
+    X = ot.ComposedDistribution ([ ot.Uniform (-pi , pi)] * dim )
+
+    alpha = 0.05 # i.e. 95% confidence interval
+    epsilon = 0.2 # Confidence interval length
+    blocksize = 50 # size of Sobol experiment at each iteration
+    workernumber = cpu_count() # number of iterations evaluated simultaneously
+
+    estimator = ot.SaltelliSensitivityAlgorithm()
+    estimator.setUseAsymptoticDistribution(True)
+    algo = ParallelSobolSimulationAlgorithm(X, g, estimator)
+    algo.setMaximumOuterSampling(100) # number of iterations
+    algo.setBlockSize(blocksize)
+    algo.setIndexQuantileLevel(alpha) # alpha
+    algo.setIndexQuantileEpsilon(epsilon) # epsilon
+    algo.setWorkerNumber(workernumber)
+    t0 = time.time()
+    algo.run()
+    elapsed = time.time() - t0
+
+    result = algo.getResult()
+    fo = result.getFirstOrderIndicesEstimate()
+    to = result.getTotalOrderIndicesEstimate()
+    print("Workers = %d, iterations = %d, time = %.2f (s)" % (workernumber, result.getOuterSampling(), elapsed))
+    print("First order = %s" % (fo))
+    print("Total order = %s" % (to))
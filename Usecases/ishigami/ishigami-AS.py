@@ -35,3 +35,17 @@ fo = result.getFirstOrderIndicesEstimate()
 to = result.getTotalOrderIndicesEstimate()
 print("First order = %s" % (fo))
 print("Total order = %s" % (to))
+
+# Plan quasi-Monte-Carlo randomisé : suite de Sobol' avec décalage aléatoire.
+# L'intervalle de confiance est obtenu par répétition du plan.
+import sys
+sys.path.append("../common")
+from rqmcsensitivitylib import computeReplicatedIndices
+size = 2**10
+nrepeat = 10
+fo, foInterval, to, toInterval = computeReplicatedIndices(
+    ot.SaltelliSensitivityAlgorithm, X, g, size, nrepeat)
+print("RQMC first order = %s" % (fo))
+print("RQMC first order interval = %s" % (foInterval))
+print("RQMC total order = %s" % (to))
+print("RQMC total order interval = %s" % (toInterval))
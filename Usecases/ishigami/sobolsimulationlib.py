@@ -0,0 +1,189 @@
+#
+# Adaptive estimation of the Sobol' indices with a pool of workers.
+#
+# This is the algorithm of ot.SobolSimulationAlgorithm: at each outer
+# iteration, a pick-freeze experiment of size blockSize*(d+2) is
+# generated and evaluated, then the indices are estimated on all the
+# points evaluated so far. The algorithm stops when the lengths of the
+# confidence intervals of all first and total order indices are lower
+# than epsilon:
+#
+#     q(1-alpha/2) - q(alpha/2) <= epsilon
+#
+# where q is the quantile function of the asymptotic distribution of
+# the estimator.
+#
+# Here, the blocks of several outer iterations are evaluated at the same
+# time by a pool of processes. The input blocks are generated in order
+# by the main process, and the output blocks are merged in the same
+# order: the stopping rule is checked after each block, exactly as in
+# the sequential algorithm. The blocks which have been evaluated after
+# the convergence are discarded. The block i is generated with the
+# random stream i of a master seed drawn at the start of the run (see
+# randomstreamlib). Hence, the result and the state of the random
+# generator after the run do not depend on the number of workers,
+# even if some blocks have been generated and discarded.
+#
+
+import openturns as ot
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import sys
+sys.path.append("../common")
+from randomstreamlib import RandomStreams
+
+# The model, in each worker process
+workerModel = None
+
+def initializeWorker(model):
+    global workerModel
+    workerModel = model
+
+def evaluateBlock(inputBlock):
+    return np.array(workerModel(inputBlock))
+
+class ParallelSobolSimulationAlgorithm:
+    '''
+    Sobol' indices computation using iterative sampling, with the
+    evaluation of the blocks distributed to a pool of processes.
+    The model must be picklable.
+
+    The estimator must use the asymptotic distribution, e.g.:
+
+        estimator = ot.SaltelliSensitivityAlgorithm()
+        estimator.setUseAsymptoticDistribution(True)
+    '''
+    def __init__(self, distribution, model, estimator):
+        self.distribution = distribution
+        self.model = model
+        self.estimator = estimator
+        self.maximumOuterSampling = 100
+        self.blockSize = 1000
+        self.indexQuantileLevel = 0.05
+        self.indexQuantileEpsilon = 1.e-2
+        self.workerNumber = 1
+        self.result = None
+
+    def setMaximumOuterSampling(self, maximumOuterSampling):
+        self.maximumOuterSampling = maximumOuterSampling
+
+    def setBlockSize(self, blockSize):
+        self.blockSize = blockSize
+
+    def setIndexQuantileLevel(self, indexQuantileLevel):
+        self.indexQuantileLevel = indexQuantileLevel
+
+    def setIndexQuantileEpsilon(self, indexQuantileEpsilon):
+        self.indexQuantileEpsilon = indexQuantileEpsilon
+
+    def setWorkerNumber(self, workerNumber):
+        '''
+        Set the number of processes, i.e. the number of outer iterations
+        evaluated at the same time. If it is 1, the blocks are evaluated
+        in the current process.
+        '''
+        self.workerNumber = workerNumber
+
+    def getResult(self):
+        return self.result
+
+    def generateBlock(self, streams, index):
+        experiment = ot.SobolIndicesExperiment(self.distribution, self.blockSize)
+        with streams.useStream(index):
+            return np.array(experiment.generate())
+
+    def isConverged(self, estimator):
+        alpha = self.indexQuantileLevel
+        for indicesDistribution in [estimator.getFirstOrderIndicesDistribution(),
+                                    estimator.getTotalOrderIndicesDistribution()]:
+            for j in range(indicesDistribution.getDimension()):
+                marginal = indicesDistribution.getMarginal(j)
+                length = marginal.computeQuantile(1. - alpha / 2.)[0] - marginal.computeQuantile(alpha / 2.)[0]
+                if length > self.indexQuantileEpsilon:
+                    return False
+        return True
+
+    def mergeBlock(self, inputBlocks, outputBlocks):
+        '''
+        Estimate the indices on all the blocks evaluated so far.
+        The blocks are stacked so that the pick-freeze structure
+        (A, B, then the mixed matrices) of the whole sample is kept.
+        '''
+        dimension = self.distribution.getDimension()
+        blockNumber = len(inputBlocks)
+        inputDesign = np.concatenate([block.reshape(dimension + 2, self.blockSize, -1)
+                                      for block in inputBlocks], axis=1)
+        outputDesign = np.concatenate([block.reshape(dimension + 2, self.blockSize, -1)
+                                       for block in outputBlocks], axis=1)
+        inputDesign = inputDesign.reshape(-1, inputDesign.shape[2])
+        outputDesign = outputDesign.reshape(-1, outputDesign.shape[2])
+        estimator = ot.SobolIndicesAlgorithm(self.estimator)
+        estimator.setDesign(ot.Sample(inputDesign), ot.Sample(outputDesign), blockNumber * self.blockSize)
+        return estimator
+
+    def run(self):
+        inputBlocks = []
+        outputBlocks = []
+        estimator = None
+        streams = RandomStreams(int(ot.RandomGenerator.IntegerGenerate(1, 2**31)[0]))
+        if self.workerNumber == 1:
+            for i in range(self.maximumOuterSampling):
+                inputBlock = self.generateBlock(streams, i)
+                inputBlocks.append(inputBlock)
+                outputBlocks.append(np.array(self.model(inputBlock)))
+                estimator = self.mergeBlock(inputBlocks, outputBlocks)
+                if self.isConverged(estimator):
+                    break
+        else:
+            with ProcessPoolExecutor(self.workerNumber, initializer=initializeWorker,
+                                     initargs=(self.model,)) as executor:
+                # Submit the first blocks, then keep the pool busy
+                pending = []
+                submitted = 0
+                while submitted < min(self.workerNumber, self.maximumOuterSampling):
+                    inputBlock = self.generateBlock(streams, submitted)
+                    pending.append((inputBlock, executor.submit(evaluateBlock, inputBlock)))
+                    submitted += 1
+                while len(pending) > 0:
+                    inputBlock, future = pending.pop(0)
+                    inputBlocks.append(inputBlock)
+                    outputBlocks.append(future.result())
+                    estimator = self.mergeBlock(inputBlocks, outputBlocks)
+                    if self.isConverged(estimator):
+                        for inputBlock, future in pending:
+                            future.cancel()
+                        break
+                    if submitted < self.maximumOuterSampling:
+                        inputBlock = self.generateBlock(streams, submitted)
+                        pending.append((inputBlock, executor.submit(evaluateBlock, inputBlock)))
+                        submitted += 1
+        result = ot.SobolSimulationResult()
+        result.setFirstOrderIndicesDistribution(estimator.getFirstOrderIndicesDistribution())
+        result.setTotalOrderIndicesDistribution(estimator.getTotalOrderIndicesDistribution())
+        result.setOuterSampling(len(inputBlocks))
+        result.setBlockSize(self.blockSize)
+        self.result = result
+        return None
+
+if __name__=="__main__":
+    # The same study is done with 1 and 4 workers: the results are identical
+    from math import pi
+    fla = "sin(X1) + 7*sin(X2)^2 + 0.1*X3^4*sin (X1)"
+    g = ot.SymbolicFunction(["X1", "X2", "X3"], [fla])
+    X = ot.ComposedDistribution([ot.Uniform(-pi, pi)] * 3)
+    estimator = ot.SaltelliSensitivityAlgorithm()
+    estimator.setUseAsymptoticDistribution(True)
+    for workerNumber in [1, 4]:
+        ot.RandomGenerator.SetSeed(0)
+        algo = ParallelSobolSimulationAlgorithm(X, g, estimator)
+        algo.setMaximumOuterSampling(100)
+        algo.setBlockSize(50)
+        algo.setIndexQuantileLevel(0.05)
+        algo.setIndexQuantileEpsilon(0.2)
+        algo.setWorkerNumber(workerNumber)
+        algo.run()
+        result = algo.getResult()
+        print("Workers = %d, outer sampling = %d" % (workerNumber, result.getOuterSampling()))
+        print("    First order = %s" % (result.getFirstOrderIndicesEstimate()))
+        print("    Total order = %s" % (result.getTotalOrderIndicesEstimate()))
+        print("    Next random number = %.6f" % (ot.RandomGenerator.Generate()))
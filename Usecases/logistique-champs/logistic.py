@@ -1,5 +1,8 @@
 import openturns as ot
 from openturns.viewer import View
+import sys
+sys.path.append("../common")
+from kernelsmoothinglib import BinnedKernelSmoothing
 
 # Here the model is created using the simplified Python interface for FieldToPointFunction
 
@@ -177,9 +180,12 @@ View(graph)
 sampleKsi = KLResult.project(outputSample)
 
 # Chaque marginale est reconstruite par noyau gaussien
-# False, 0, False: pas de binning (non aggergation des donnees dnas des segments), nbre de bins, pas d'effet de bord
+# Le lissage est calculé sur une grille par FFT (voir common/kernelsmoothinglib.py) :
+# la densité est évaluée par interpolation, quelle que soit la taille de l'échantillon
 nbmodes = sampleKsi.getDimension()
-xi_marges = [ot.KernelSmoothing(ot.Normal(), False, 0, False).build(sampleKsi.getMarginal(i)) for i in range(nbmodes)]
+xi_marges = [BinnedKernelSmoothing().build(sampleKsi.getMarginal(i)) for i in range(nbmodes)]
+for i in range(nbmodes):
+    print("Mode %d, binning error = %.2e" % (i, xi_marges[i].computeBinningError(sampleKsi.getMarginal(i))))
 
 # graphes des pdf marginales
 for i in range(len(xi_marges)):
@@ -30,6 +30,11 @@ cd ..
 cd axial-stressed-beam
 test_ipython_notebook axial_stressed_beam.ipynb
 cd ..
+# benchmark-fiabilite
+cd benchmark-fiabilite
+test_python_script reliabilitybenchmarklib.py
+test_python_script reliability-benchmark.py
+cd ..
 # cantilever_beam
 cd cantilever-beam
 test_ipython_notebook cantilever_beam.ipynb
@@ -49,6 +54,24 @@ test_ipython_notebook Chute-verticale.ipynb
 test_python_script chute-verticale.py
 test_python_script chute-verticale-vs-coefficient.py
 cd ..
+# common
+cd common
+test_python_script kernelsmoothinglib.py
+test_python_script symboliccompilerlib.py
+test_python_script symbolic-compiler-benchmark.py
+test_python_script rqmcsensitivitylib.py
+test_python_script chaossensitivitylib.py
+test_python_script akmcslib.py
+test_python_script secondordersensitivitylib.py
+test_python_script taylormomentslib.py
+test_python_script cruegradientlib.py
+test_python_script processpoolfunctionlib.py
+test_python_script externalcodelib.py
+test_python_script evaluationcachelib.py
+test_python_script checkpointlib.py
+test_python_script bootstrapsensitivitylib.py
+test_python_script randomstreamlib.py
+cd ..
 # crue-calage
 cd crue-calage
 test_ipython_notebook Calage-crue.ipynb
@@ -62,6 +85,8 @@ test_python_script crue-4vars-stochastic.py
 test_python_script crue-8I3O-python.py
 test_python_script crue-8vars-symbolic.py
 test_python_script crue-propagation.py
+test_python_script crue-akmcs.py
+test_python_script crue-propagation-checkpoint.py
 cd ..
 # fiabilite-RS
 cd fiabilite-RS
@@ -77,10 +102,15 @@ cd gsobol
 test_python_script gsobollib.py
 test_python_script sensitivity-confidence-gsobol.py
 test_python_script sensitivity-convergence-gsobol.py
+test_python_script sensitivity-convergence-rqmc-gsobol.py
+test_python_script sensitivity-chaos-gsobol.py
+test_python_script sensitivity-second-order-gsobol.py
 cd ..
 # ishigami
 cd ishigami
 test_python_script ishigami-AS.py
+test_python_script sobolsimulationlib.py
+test_python_script ishigami-AS-parallel.py
 test_ipython_notebook La_fonction_Ishigami.ipynb
 cd ..
 # logistique-calage